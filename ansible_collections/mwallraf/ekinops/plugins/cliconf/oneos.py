@@ -14,11 +14,34 @@ from ansible.module_utils.common._collections_compat import Mapping
 from ansible.errors import AnsibleConnectionFailure
 
 from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.commands import (  # noqa: E501
+    READ_ONLY_COMMANDS,
     OneosCommand,
 )
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.cache import (  # noqa: E501
+    DeviceCache,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.diff import (  # noqa: E501
+    RunningConfigIndex,
+    config_digest,
+    normalized_config_digest,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.utils import (  # noqa: E501
+    count_prompts,
+    filter_config,
+    is_terminal_error,
+    oneos_major_version,
+    parse_oneos_full_version,
+)
+from ansible_collections.mwallraf.ekinops.plugins.terminal.oneos import (
+    TerminalModule,
+)
 
+from contextlib import contextmanager
 import json
+import os
 import re
+import tempfile
+import time
 
 __metaclass__ = type
 
@@ -32,6 +55,98 @@ description:
   - This plugin provides low level abstraction APIs for sending CLI
     commands and
     receiving responses from Ekinops OneOS network devices.
+options:
+  oneos_version:
+    type: str
+    description:
+      - The OneOS version of the device, the major version (5 or 6) or
+        the full version (ex. C(6.5.1)) to use the commands of a minor
+        version profile.
+      - When set, the version is not detected with C(show version) when
+        the persistent connection is opened.
+    vars:
+      - name: ansible_oneos_version
+  version_cache_path:
+    type: path
+    description:
+      - Directory where the detected OneOS version is cached per host
+        and serial number.
+      - New persistent connections to a known host reuse the cached
+        version instead of running C(show version).
+    env:
+      - name: ANSIBLE_ONEOS_VERSION_CACHE_PATH
+    vars:
+      - name: ansible_oneos_version_cache_path
+  batch_commands:
+    type: boolean
+    default: false
+    description:
+      - Send consecutive show commands of a single I(run_commands) call
+        to the device in one write instead of waiting for the prompt
+        after every command.
+      - The combined output is split per command using the cli prompt.
+        Commands that need a prompt/answer are always sent one by one.
+    vars:
+      - name: ansible_oneos_batch_commands
+  running_config_cache:
+    type: boolean
+    default: false
+    description:
+      - Keep a snapshot of the running-config for the lifetime of the
+        persistent connection. C(show running-config) and the filtered
+        running-config aliases used by the resource modules are served
+        from the snapshot instead of being fetched from the device again.
+      - The snapshot is discarded as soon as a command that may change
+        the configuration is sent, ex. by I(edit_config) or C(write mem).
+      - Changes made outside of the connection, ex. by another session
+        on the device, are not seen until the snapshot is discarded, only
+        enable this when the play is the only one changing the device.
+    vars:
+      - name: ansible_oneos_running_config_cache
+  acl_facts_source:
+    type: str
+    default: show
+    choices: [show, running-config]
+    description:
+      - Source of the acls facts. With C(show) the access-lists are read
+        with C(show ip access-list) and their remarks from the
+        running-config.
+      - C(running-config) reads the access-lists and their remarks from
+        the C(show running-config ip access-list) section in a single
+        command, only on OneOS versions that support the section filter
+        (OneOS 6). The section only contains the IPv4 access-lists.
+    vars:
+      - name: ansible_oneos_acl_facts_source
+  fact_cache_path:
+    type: path
+    description:
+      - Directory where the output of commands with slowly changing
+        output (product info, hardware, boot images) is cached per host.
+      - While a cached output is younger than the TTL of its fact group
+        the command is not sent to the device. The product info is
+        always read from the device, cached outputs are only served if
+        they were collected from a device with the same serial number.
+    env:
+      - name: ANSIBLE_ONEOS_FACT_CACHE_PATH
+    vars:
+      - name: ansible_oneos_fact_cache_path
+  config_file_proto:
+    type: str
+    default: scp
+    choices: [scp, sftp]
+    description:
+      - Protocol used by I(apply_config_file) to upload the candidate
+        config to the device.
+    vars:
+      - name: ansible_oneos_config_file_proto
+  fact_cache_ttl:
+    type: dict
+    description:
+      - TTL in seconds per fact group, C(device_info) (hardware, default
+        86400) and C(boot) (boot images and configs, default 3600). A TTL
+        of 0 disables caching of the group.
+    vars:
+      - name: ansible_oneos_fact_cache_ttl
 """
 
 
@@ -53,6 +168,16 @@ display = Display()
 
 __supported_oneos_versions__ = [5, 6]
 
+# default TTL in seconds of the fact groups in the on-disk fact cache
+FACT_CACHE_TTL = {"device_info": 86400, "boot": 3600}
+
+# commands that may change the startup-config
+STARTUP_CONFIG_COMMANDS = ("write", "wr", "copy", "erase")
+
+# output does not change while connected, the output collected by
+# get_device_info is reused (ex. by the hardware facts)
+STATIC_COMMANDS = ("show system hardware", "show product-info-area")
+
 
 class Cliconf(CliconfBase):
     ONEOS5_OPERATIONS = {
@@ -91,32 +216,142 @@ class Cliconf(CliconfBase):
         super(Cliconf, self).__init__(*args, **kwargs)
 
         self._device_info = {}
-        self._oneos_version = None  # could be either 5 or 6
+        self._oneos_version = None  # full version, ex. "6.2.2"
+        self._oneos_version_source = None  # option, cache or device
+        self._version_cache = None
+        self._fact_cache = None
+        self._running_config = None  # running-config snapshot
+        self._running_index = None  # RunningConfigIndex used by get_diff
+        self._startup_digests = {}  # startup-config digest per ignore_lines
+        self._command_timing = []  # device latency of the last run_commands
+        self._static_outputs = {}  # output of STATIC_COMMANDS
+        self._serial_number = None  # read live, validates the fact cache
         self.oneos_command_map = None  # translate to oneos v5 or v6 command
 
+    def _get_plugin_option(self, option, default=None):
+        """Returns a cliconf option, or the default if the option is not
+        set or the plugin options were never loaded
+        """
+        try:
+            value = self.get_option(option)
+        except (KeyError, AttributeError):
+            value = None
+        return default if value is None else value
+
     @property
-    def oneos_version(self):
-        """Returns the ekinops OneOS version.
+    def batch_commands(self):
+        """Returns True if read-only commands are sent in one write"""
+        return bool(self._get_plugin_option("batch_commands", False))
 
-        returns 5 or 6
+    def _get_cache_host(self):
+        try:
+            return self._connection.get_option("host")
+        except (KeyError, AttributeError):
+            return self._connection._play_context.remote_addr
 
-        This runs 'show version' and looks for "-V5" or "-6"
+    @property
+    def version_cache(self):
+        """Returns the on-disk version cache for this host or None if
+        no cache path is configured
+        """
+        if self._version_cache is None:
+            path = self._get_plugin_option("version_cache_path")
+            if not path:
+                return None
+            self._version_cache = DeviceCache(path, self._get_cache_host())
+        return self._version_cache
 
-        Examples:
-            #show version  (oneos5)
-            Software version    : ONEOS16-MONO_FT-V5.2R2E7_HA8
-            Software created on : 04/08/20 18:14:48
+    @property
+    def fact_cache(self):
+        """Returns the on-disk fact cache for this host or None if
+        no cache path is configured
+        """
+        if self._fact_cache is None:
+            path = self._get_plugin_option("fact_cache_path")
+            if not path:
+                return None
+            self._fact_cache = DeviceCache(path, self._get_cache_host())
+        return self._fact_cache
+
+    def _get_fact_cache_ttl(self, command):
+        """Returns the TTL of the fact group of a command, or None if
+        the command output can not be cached
+        """
+        if not self.fact_cache:
+            return None
+        if not self.oneos_command_map:
+            self.get_oneos_version()
+        group = self.oneos_command_map.get_fact_group(command)
+        if not group:
+            return None
+        ttl = dict(FACT_CACHE_TTL)
+        ttl.update(self._get_plugin_option("fact_cache_ttl", {}))
+        return int(ttl.get(group) or 0) or None
+
+    def get_cached_fact(self, command):
+        """Returns the cached output of a command or None if it is not
+        cached or expired
+        """
+        ttl = self._get_fact_cache_ttl(command)
+        if not ttl:
+            return None
+        serial_number = self.get_serial_number()
+        if not serial_number:
+            return None
+        return self.fact_cache.get(
+            "output:%s" % command,
+            serial_number=serial_number,
+            max_age=ttl,
+        )
 
-            #show version (oneos6)
-            Software version    : OneOS-pCPE-ARM_pi1-6.3.1m1
-            Software created on : 2019-10-04 10:21:52
+    def _cache_fact(self, command, output):
+        if self._get_fact_cache_ttl(command) and self.get_serial_number():
+            self.fact_cache.set(
+                "output:%s" % command,
+                to_text(output, errors="surrogate_or_strict"),
+                serial_number=self.get_serial_number(),
+            )
+
+    def get_serial_number(self):
+        """Returns the serial number of the device
 
+        show product-info-area is never served from the fact cache, so
+        the cached facts can be checked against the device they are
+        served to.
         """
-        if self._oneos_version:
-            return int(self._oneos_version)
+        if self._serial_number is None:
+            data = self.get_command_output("show product-info-area")
+            match = re.search(
+                r"\W*[sS]erial [Nn]umber\W+(\S+)\s*$", data, re.M
+            )
+            self._serial_number = match.group(1) if match else ""
+        return self._serial_number
 
-        version = None
+    def _load_oneos_version(self):
+        """Returns the OneOS version without a device round-trip, either
+        from the ansible_oneos_version variable or from the on-disk cache
+        """
+        version = self._get_plugin_option("oneos_version")
+        if version:
+            self._oneos_version_source = "option"
+            return version
+
+        if self.version_cache:
+            version = self.version_cache.get("oneos_version")
+            if version:
+                self._oneos_version_source = "cache"
+                return version
+
+        return None
+
+    def get_known_oneos_version(self):
+        """Returns the OneOS version if it is known without sending a
+        command, or None
+        """
+        return self._oneos_version or self._load_oneos_version()
 
+    def _detect_oneos_version(self):
+        """Runs 'show version' and looks for "-V5" or "-6" """
         kwargs = {
             "command": to_bytes("show version"),
             "sendonly": False,
@@ -125,51 +360,202 @@ class Cliconf(CliconfBase):
             "check_all": False,
             # "strip_prompt": True,
         }
-        # output = self.get_command_output("show version")
-        # output = self.send_command("show version")
         output = self._connection.send(**kwargs)
+        version = parse_oneos_full_version(to_text(output))
+
+        self._oneos_version_source = "device"
+        return version
 
-        if "-V5" in output:
-            version = int(5)
-        elif "-6" in output:
-            version = int(6)
+    @property
+    def oneos_version(self):
+        """Returns the ekinops OneOS major version.
+
+        returns 5 or 6, the full version is kept in oneos_full_version
 
-        if version and version in __supported_oneos_versions__:
-            self._oneos_version = version
-            return int(self._oneos_version)
+        The version is detected only once per persistent connection, it is
+        taken from the ansible_oneos_version variable or from the on-disk
+        version cache if available, otherwise this runs 'show version'
+        and looks for "-V5" or "-6"
+
+        Examples:
+            #show version  (oneos5)
+            Software version    : ONEOS16-MONO_FT-V5.2R2E7_HA8
+            Software created on : 04/08/20 18:14:48
+
+            #show version (oneos6)
+            Software version    : OneOS-pCPE-ARM_pi1-6.3.1m1
+            Software created on : 2019-10-04 10:21:52
+
+        """
+        if self._oneos_version:
+            return oneos_major_version(self._oneos_version)
+
+        version = self._load_oneos_version()
+        if not version:
+            version = self._detect_oneos_version()
+
+        try:
+            major_version = oneos_major_version(version)
+        except (TypeError, ValueError):
+            major_version = None
+
+        if version and major_version in __supported_oneos_versions__:
+            self._oneos_version = str(version)
+            if self._oneos_version_source == "device" and self.version_cache:
+                self.version_cache.set("oneos_version", self._oneos_version)
+            return major_version
 
         raise ValueError(
             f"ekinops os version is not supported or not found ({version})"
         )
 
+    @property
+    def oneos_full_version(self):
+        """Returns the OneOS version as configured or detected, ex. "6.2.2",
+        the command profile is selected with the full version
+        """
+        self.get_oneos_version()
+        return self._oneos_version
+
+    def _verify_oneos_version(self, serial_number):
+        """Makes sure that a version taken from the on-disk cache belongs
+        to the device we are connected to, the version is detected again
+        if the serial number has changed since it was cached
+        """
+        cache = self.version_cache
+        if not cache or not serial_number:
+            return
+        if self._oneos_version_source == "option":
+            return
+
+        if (
+            self._oneos_version_source == "cache"
+            and cache.get("oneos_version", serial_number=serial_number)
+            is None
+        ):
+            cache.delete("oneos_version")
+            self._oneos_version = None
+            self.oneos_command_map = None
+            self.get_oneos_version()
+
+        entry = cache.get_entry("oneos_version") or {}
+        if (
+            entry.get("value") != self._oneos_version
+            or entry.get("serial_number") != serial_number
+        ):
+            cache.set(
+                "oneos_version",
+                self._oneos_version,
+                serial_number=serial_number,
+            )
+
     def send_command(self, *args, **kwargs):
         """Override the original Cliconf function to check if we need to
         translate commands to OS specific commands
+
+        The running-config and the running-config aliases are served from
+        the running-config snapshot if possible.
         """
-        print(f"{args}")
-        print(f"{kwargs}")
-        if not self.oneos_command_map:
-            self.get_oneos_version()
+        command = kwargs.get("command") or (args[0] if args else None)
+        if command and not any(
+            kwargs.get(k) for k in ("prompt", "answer", "sendonly")
+        ):
+            cached = self.get_cached_config(command)
+            if cached is None:
+                cached = self._static_outputs.get(command)
+            if cached is None:
+                cached = self.get_cached_fact(command)
+            if cached is not None:
+                return cached
 
         # translate the command
         if kwargs.get("command"):
-            new_command = self.oneos_command_map.get(kwargs.get("command"))
-            if new_command:
-                kwargs["command"] = new_command
+            kwargs["command"] = self.translate_command(kwargs["command"])
         else:
             if len(args) > 0:
-                new_command = self.oneos_command_map.get(args[0])
-                if new_command:
-                    args[0] = new_command
+                args = (self.translate_command(args[0]),) + args[1:]
         # TODO: *args could be a list of commands
 
         res = super(Cliconf, self).send_command(*args, **kwargs)
+
+        if command in STATIC_COMMANDS:
+            self._static_outputs[command] = res
+        if command and not kwargs.get("sendonly"):
+            self._cache_fact(command, res)
+
+        if command and not self._is_read_only(self.translate_command(command)):
+            self.invalidate_config_cache()
+            if command.strip().startswith(STARTUP_CONFIG_COMMANDS):
+                self._startup_digests = {}
+
         return res
 
+    def _is_read_only(self, command):
+        """Returns True if the command can not change the configuration"""
+        command = command.strip()
+        return command.startswith(READ_ONLY_COMMANDS) or command == "hostname"
+
+    @property
+    def running_config_snapshot(self):
+        """Returns the running-config, it is fetched from the device only
+        once until the snapshot is invalidated
+        """
+        if self._running_config is None:
+            self._running_config = super(Cliconf, self).send_command(
+                command="show running-config"
+            )
+        return self._running_config
+
+    def invalidate_config_cache(self):
+        """Discards the running-config snapshot and the device info, the
+        hostname may have been changed
+        """
+        self._running_config = None
+        self._device_info = {}
+
+    def _get_config_slice(self, command):
+        """Returns the (sections, include) filter to apply on the
+        running-config snapshot for a command or None if the command
+        can not be served from the snapshot
+        """
+        if not self._get_plugin_option("running_config_cache", False):
+            return None
+
+        if command.strip() == "show running-config":
+            return (None, None)
+
+        if not self.oneos_command_map:
+            self.get_oneos_version()
+        return self.oneos_command_map.get_config_slice(command)
+
+    def get_cached_config(self, command):
+        """Returns the output of a running-config command or alias based on
+        the running-config snapshot, or None if the command can not be
+        served from the snapshot
+        """
+        config_slice = self._get_config_slice(command)
+        if not config_slice:
+            return None
+
+        sections, include = config_slice
+        if not (sections or include):
+            return self.running_config_snapshot
+        return filter_config(
+            to_text(self.running_config_snapshot), sections, include
+        )
+
+    def translate_command(self, command):
+        """Returns the OneOS version specific command for an alias,
+        other commands are returned unchanged
+        """
+        if not self.oneos_command_map:
+            self.get_oneos_version()
+        return self.oneos_command_map.get(command) or command
+
     def get_oneos_version(self):
         version = self.oneos_version
         if not self.oneos_command_map:
-            self.oneos_command_map = OneosCommand(version)
+            self.oneos_command_map = OneosCommand(self._oneos_version)
         return version
 
     def get_diff(
@@ -212,10 +598,15 @@ class Cliconf(CliconfBase):
         candidate_obj.load(candidate)
 
         if running and diff_match != "none":
-            # running configuration
-            running_obj = NetworkConfig(
-                indent=1, contents=running, ignore_lines=diff_ignore_lines
+            # running configuration, indexed per section for the line
+            # match and parsed only once for the same running-config
+            running_index = self._get_running_index(
+                running, diff_ignore_lines
             )
+            if diff_match == "line":
+                running_obj = running_index
+            else:
+                running_obj = running_index.config
             configdiffobjs = candidate_obj.difference(
                 running_obj, path=path, match=diff_match, replace=diff_replace
             )
@@ -248,6 +639,18 @@ class Cliconf(CliconfBase):
 
         return diff
 
+    def _get_running_index(self, running, diff_ignore_lines=None):
+        """Returns the RunningConfigIndex of the running-config, the index
+        is kept for the lifetime of the connection as long as the same
+        running-config is used
+        """
+        digest = config_digest(running, diff_ignore_lines)
+        index = self._running_index
+        if index is None or index.digest != digest:
+            index = RunningConfigIndex(running, diff_ignore_lines)
+            self._running_index = index
+        return index
+
     # @enable_mode
     def get_device_info(self):
         """Gets basic device info:
@@ -261,13 +664,17 @@ class Cliconf(CliconfBase):
         network_os_hostname  =  configured hostname
         network_os_serial_number  =  serial number
 
+        The result is kept for the lifetime of the persistent connection
+        and is reset when the configuration is changed.
         """
+        if self._device_info:
+            return self._device_info
+
         device_info = {}
 
         device_info["network_os_vendor"] = "ekinops"
         device_info["network_os_vendor_alt"] = "oneaccess"
         device_info["network_os"] = "oneos"
-        device_info["network_os_version"] = str(self.oneos_version)
 
         cmd_product_info_area = "show product-info-area"
         cmd_hostname = "hostname"
@@ -286,9 +693,8 @@ class Cliconf(CliconfBase):
         if match:
             device_info["network_os_commercial_model"] = match.group(1)
 
-        match = re.search(r"\W*[sS]erial [Nn]umber\W+(\S+)\W+$", data, re.M)
-        if match:
-            device_info["network_os_serial_number"] = match.group(1)
+        if self.get_serial_number():
+            device_info["network_os_serial_number"] = self.get_serial_number()
 
         data = self.get_command_output(cmd_hardware)
 
@@ -322,6 +728,12 @@ class Cliconf(CliconfBase):
                 1
             ).strip()
 
+        self._verify_oneos_version(
+            device_info.get("network_os_serial_number")
+        )
+        device_info["network_os_version"] = str(self.oneos_version)
+
+        self._device_info = device_info
         return device_info
 
     @enable_mode
@@ -342,9 +754,7 @@ class Cliconf(CliconfBase):
             specify the format in which configuration is to be retrieved.
         :return: The device configuration as specified by the source argument.
         """
-        acceptable_sources = ["running"]
-        if self.oneos_version > 5:
-            acceptable_sources += ["startup"]
+        acceptable_sources = ["running", "startup"]
 
         if source not in acceptable_sources:
             raise ValueError(
@@ -353,6 +763,10 @@ class Cliconf(CliconfBase):
                 )
             )
 
+        # oneos5 has no show startup-config, the file is read instead
+        if source == "startup":
+            return self.send_command("alias-get-startup-config")
+
         lookup = {
             "running": "running-config",
             "startup": "startup-config",
@@ -370,11 +784,42 @@ class Cliconf(CliconfBase):
 
         return self.send_command(cmd)
 
+    def get_config_digest(self, source="running", diff_ignore_lines=None):
+        """Returns the normalized sha1 digest of the running or startup
+        config after diff_ignore_lines
+
+        The running-config is taken from the running-config snapshot, the
+        startup-config digest is kept until a command that may write the
+        startup-config is sent.
+        """
+        if source != "startup":
+            return normalized_config_digest(
+                to_text(self.get_config(source=source)), diff_ignore_lines
+            )
+
+        key = repr(diff_ignore_lines)
+        if key not in self._startup_digests:
+            self._startup_digests[key] = normalized_config_digest(
+                to_text(self.get_config(source="startup")), diff_ignore_lines
+            )
+        return self._startup_digests[key]
+
     @enable_mode
     def edit_config(
-        self, candidate=None, commit=True, replace=None, comment=None
+        self,
+        candidate=None,
+        commit=True,
+        replace=None,
+        comment=None,
+        chunk_size=None,
     ):
-        """edits the config that is defined in candidate"""
+        """edits the config that is defined in candidate
+
+        With chunk_size > 1 consecutive config lines are sent in chunks of
+        at most chunk_size lines in a single write, the output of every
+        line is checked for errors after the chunk has been sent. Lines
+        that need a prompt/answer are always sent one by one.
+        """
         resp = {}
         results = []
         requests = []
@@ -384,18 +829,28 @@ class Cliconf(CliconfBase):
             operations, candidate, commit, replace, comment
         )
 
+        # the hostname may be changed by the candidate config
+        self.invalidate_config_cache()
+
         if commit:
             for cmd in ["end", "configure terminal"]:
                 self.send_command(cmd)
 
+            lines = list()
             for line in to_list(candidate):
                 if not isinstance(line, Mapping):
                     line = {"command": line}
 
                 cmd = line["command"]
                 if cmd != "end" and cmd[0] != "!":
-                    results.append(self.send_command(**line))
-                    requests.append(cmd)
+                    lines.append(line)
+
+            for chunk in self._get_config_chunks(lines, chunk_size):
+                if len(chunk) > 1:
+                    results.extend(self._run_config_chunk(chunk))
+                else:
+                    results.append(self.send_command(**chunk[0]))
+                requests.extend(line["command"] for line in chunk)
 
             self.send_command("end")
         else:
@@ -405,12 +860,155 @@ class Cliconf(CliconfBase):
         resp["response"] = results
         return resp
 
+    @enable_mode
+    def apply_config_file(self, candidate=None):
+        """Uploads the candidate config as a file to the device and applies
+        it with a single command, the location and the commands are taken
+        from the CONFIG_FILE of the OneOS version profile
+
+        Returns the output of the apply command and the errors per
+        candidate line, see parse_apply_log
+        """
+        lines = [
+            line
+            for line in to_list(candidate)
+            if line.strip() and line != "end" and line[0] != "!"
+        ]
+
+        if not self.oneos_command_map:
+            self.get_oneos_version()
+        config_file = self.oneos_command_map.config_file
+        path = config_file["path"]
+
+        # the hostname may be changed by the candidate config
+        self.invalidate_config_cache()
+
+        fd, source = tempfile.mkstemp(suffix=".cfg")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write("\n".join(["configure terminal"] + lines + ["end"]))
+                f.write("\n")
+            self._connection.copy_file(
+                source=source,
+                destination=path,
+                proto=self._get_plugin_option("config_file_proto", "scp"),
+            )
+        finally:
+            os.remove(source)
+
+        # errors are reported per line by parse_apply_log
+        with self._ignore_terminal_errors():
+            try:
+                output = self.send_command(
+                    config_file["apply"].format(path=path)
+                )
+            finally:
+                remove = dict(config_file["remove"])
+                remove["command"] = remove["command"].format(path=path)
+                self.send_command(**remove)
+
+        output = to_text(output, errors="surrogate_or_strict")
+        return {
+            "request": lines,
+            "response": output,
+            "errors": self.parse_apply_log(output, lines),
+        }
+
+    def parse_apply_log(self, output, lines):
+        """Returns the errors in the output of an applied config file
+
+        Every config line is echoed by the device, errors are reported
+        for the last echoed line. Errors before the first echoed line
+        are reported without a line.
+
+        Example:
+            interface gigabitethernet 0/1
+             ip address 10.0.0.300 255.255.255.0
+            % Syntax error: invalid ip address
+
+            returns [{"line": 2,
+                      "command": " ip address 10.0.0.300 255.255.255.0",
+                      "error": "% Syntax error: invalid ip address"}]
+        """
+        errors = list()
+        current = None
+        position = 0
+        for text in output.splitlines():
+            stripped = text.strip()
+            if not stripped:
+                continue
+            if position < len(lines) and stripped.endswith(
+                lines[position].strip()
+            ):
+                current = position
+                position += 1
+                continue
+            if self._is_terminal_error(stripped):
+                errors.append(
+                    {
+                        "line": None if current is None else current + 1,
+                        "command": None if current is None else lines[current],
+                        "error": stripped,
+                    }
+                )
+        return errors
+
+    def _get_config_chunks(self, lines, chunk_size=None):
+        """Groups consecutive config lines without prompt handling in
+        chunks of at most chunk_size lines, every other line is returned
+        as a chunk of its own
+        """
+        if not chunk_size or chunk_size < 2:
+            return [[line] for line in lines]
+
+        chunks = list()
+        chunk = list()
+        for line in lines:
+            if set(line.keys()) == set(["command"]):
+                chunk.append(line)
+                if len(chunk) == chunk_size:
+                    chunks.append(chunk)
+                    chunk = list()
+                continue
+            if chunk:
+                chunks.append(chunk)
+                chunk = list()
+            chunks.append([line])
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def _run_config_chunk(self, chunk):
+        """Sends a chunk of config lines in a single write and returns the
+        output per line, all lines that returned an error are reported
+        together
+
+        The device keeps processing the lines that follow a failing line
+        in the same chunk.
+        """
+        # the device ignores the indentation, the stripped line is
+        # needed to find the echo of the line in the output
+        commands = [{"command": line["command"].strip()} for line in chunk]
+        outputs, elapsed = self._run_command_batch(commands, check_rc=False)
+
+        errors = list()
+        for cmd, out in zip(commands, outputs):
+            if self._is_terminal_error(out):
+                errors.append("%s: %s" % (cmd["command"], out))
+        if errors:
+            raise AnsibleConnectionFailure(
+                "configuration failed on %s line(s):\n%s"
+                % (len(errors), "\n".join(errors))
+            )
+        return outputs
+
     # @enable_mode
     def run_commands(self, commands=None, check_rc=True):
 
         if commands is None:
             raise ValueError("'commands' value is required")
-        responses = list()
+
+        cmds = list()
         for cmd in to_list(commands):
             if not isinstance(cmd, Mapping):
                 cmd = {"command": cmd}
@@ -423,30 +1021,240 @@ class Cliconf(CliconfBase):
                         output
                     )
                 )
+            cmds.append(cmd)
+
+        responses = list()
+        self._command_timing = list()
+        for batch in self._get_command_batches(cmds):
+            start = time.time()
+            if len(batch) > 1:
+                outputs, elapsed = self._run_command_batch(batch, check_rc)
+            else:
+                outputs = [self._run_command(batch[0], check_rc)]
+                elapsed = [time.time() - start]
+
+            for cmd, seconds in zip(batch, elapsed):
+                self._command_timing.append(
+                    {"command": cmd["command"], "seconds": round(seconds, 4)}
+                )
+
+            for cmd, out in zip(batch, outputs):
+                out = self._decode_command_output(cmd, out)
+                if out is not None:
+                    responses.append(out)
+        return responses
 
+    def _run_command(self, cmd, check_rc=True):
+        """Sends a single command and waits for the prompt"""
+        try:
+            out = self.send_command(**cmd)
+        except AnsibleConnectionFailure as e:
+            if check_rc:
+                raise
+            out = getattr(e, "err", e)
+        return out
+
+    def _decode_command_output(self, cmd, out):
+        if out is None:
+            return out
+
+        try:
+            out = to_text(out, errors="surrogate_or_strict").strip()
+        except UnicodeError:
+            raise ConnectionError(
+                message="Failed to decode output from %s: %s"
+                % (cmd, to_text(out))
+            )
+
+        # OneOS answers in text, only an output that starts like a JSON
+        # object or array can be decoded
+        if out[:1] in ("{", "["):
             try:
-                out = self.send_command(**cmd)
-            except AnsibleConnectionFailure as e:
-                if check_rc:
-                    raise
-                out = getattr(e, "err", e)
-
-            if out is not None:
-                try:
-                    out = to_text(out, errors="surrogate_or_strict").strip()
-                except UnicodeError:
-                    raise ConnectionError(
-                        message="Failed to decode output from %s: %s"
-                        % (cmd, to_text(out))
-                    )
+                out = json.loads(out)
+            except ValueError:
+                pass
 
-                try:
-                    out = json.loads(out)
-                except ValueError:
-                    pass
+        return out
 
-                responses.append(out)
-        return responses
+    def _is_batchable(self, cmd):
+        """Only plain read-only commands without prompt handling
+        can be pipelined
+        """
+        if set(cmd.keys()) != set(["command"]):
+            return False
+        # served from the running-config snapshot, from the static
+        # outputs or from the fact cache by send_command
+        if self._get_config_slice(cmd["command"]):
+            return False
+        if cmd["command"] in self._static_outputs:
+            return False
+        if self._get_fact_cache_ttl(cmd["command"]):
+            return False
+        return self._is_read_only(self.translate_command(cmd["command"]))
+
+    def _get_command_batches(self, cmds):
+        """Groups consecutive batchable commands together, every other
+        command is returned as a batch of its own
+        """
+        if not self.batch_commands:
+            return [[cmd] for cmd in cmds]
+
+        batches = list()
+        batch = list()
+        for cmd in cmds:
+            if self._is_batchable(cmd):
+                batch.append(cmd)
+                continue
+            if batch:
+                batches.append(batch)
+                batch = list()
+            batches.append([cmd])
+        if batch:
+            batches.append(batch)
+        return batches
+
+    @contextmanager
+    def _ignore_terminal_errors(self):
+        """Disables the terminal error detection of the connection,
+        errors in a batch are detected per command after the combined
+        output has been split.
+        """
+        try:
+            terminal_stderr_re = self._connection.get_option(
+                "terminal_stderr_re"
+            )
+        except KeyError:
+            terminal_stderr_re = None
+
+        self._connection.set_option(
+            "terminal_stderr_re", [{"pattern": "(?!)"}]
+        )
+        try:
+            yield
+        finally:
+            self._connection.set_option(
+                "terminal_stderr_re", terminal_stderr_re
+            )
+
+    def _run_command_batch(self, batch, check_rc=True):
+        """Sends a list of commands in a single write and returns the
+        output per command together with the time it took before the
+        output of each command was received
+        """
+        commands = [self.translate_command(cmd["command"]) for cmd in batch]
+
+        start = time.time()
+        with self._ignore_terminal_errors():
+            output = self._connection.send(
+                command=to_bytes("\r".join(commands)),
+                strip_prompt=False,
+            )
+            output = to_text(output, errors="surrogate_or_strict")
+            outputs = self.split_batch_output(output, commands)
+            elapsed = [time.time() - start] * len(outputs)
+
+            # the connection returns as soon as a prompt is found at the
+            # end of the received data, this can be the prompt of one of
+            # the first commands if the device is slow to respond
+            while len(outputs) < len(commands):
+                # every prompt was received but the output can not be
+                # split, waiting for more output would hang until the
+                # command timeout
+                if self._count_prompts(output) >= len(commands):
+                    self._raise_batch_split_error(commands)
+                # the received output ends with a prompt, the next command
+                # is echoed right after it
+                more = self._connection.receive(strip_prompt=False)
+                output += to_text(more, errors="surrogate_or_strict")
+                outputs = self.split_batch_output(output, commands)
+                received = len(outputs) - len(elapsed)
+                if not received:
+                    self._raise_batch_split_error(commands)
+                elapsed += [time.time() - start] * received
+
+        for out in outputs:
+            if check_rc and self._is_terminal_error(out):
+                raise AnsibleConnectionFailure(out)
+        return outputs, elapsed
+
+    def _count_prompts(self, output):
+        return count_prompts(output, self._connection.get_prompt())
+
+    def _raise_batch_split_error(self, commands):
+        raise AnsibleConnectionFailure(
+            "unable to split the output of the batched commands %s, the "
+            "device does not echo the commands as expected, disable the "
+            "batch_commands option for this device" % ", ".join(commands)
+        )
+
+    def _is_terminal_error(self, output):
+        return is_terminal_error(output, TerminalModule.terminal_stderr_re)
+
+    def split_batch_output(self, output, commands):
+        """Splits the combined output of pipelined commands
+
+        Every command is echoed after the prompt of the previous command,
+        the prompt is recognized with TerminalModule.terminal_stdout_re.
+        Only the output of commands that were followed by a prompt is
+        returned, the output of the last command ends at the last line.
+
+        Example:
+            show version
+            Software version    : OneOS-pCPE-ARM_pi1-6.2.2
+            lab-lbb150#show system hardware
+            Local    : 4 ETHERNET
+            lab-lbb150#
+
+            returns ["Software version    : OneOS-pCPE-ARM_pi1-6.2.2",
+                     "Local    : 4 ETHERNET"]
+        """
+
+        def _is_prompt(text):
+            # the prompt has to start at the beginning of the line
+            text = to_bytes(text.strip())
+            for regex in TerminalModule.terminal_stdout_re:
+                match = regex.search(text)
+                if match and match.start() == 0:
+                    return True
+            return False
+
+        outputs = list()
+        lines = output.splitlines()
+
+        # the first command is echoed without prompt
+        if lines and lines[0].strip() == commands[0]:
+            lines = lines[1:]
+
+        current = list()
+        for line in lines:
+            stripped = line.strip()
+            next_command = (
+                commands[len(outputs) + 1]
+                if len(outputs) + 1 < len(commands)
+                else None
+            )
+            if (
+                next_command
+                and stripped.endswith(next_command)
+                and _is_prompt(stripped[: -len(next_command)])
+            ):
+                outputs.append("\n".join(current).strip())
+                current = list()
+            else:
+                current.append(line)
+
+        # the output of the last command ends with the prompt, a line of
+        # the output may look like a prompt as well
+        while current and not current[-1].strip():
+            current.pop()
+        if (
+            len(outputs) + 1 == len(commands)
+            and current
+            and _is_prompt(current[-1])
+        ):
+            outputs.append("\n".join(current[:-1]).strip())
+
+        return outputs
 
     def get_command_output(self, command):
         """Wrapper around get() function"""
@@ -528,8 +1336,18 @@ class Cliconf(CliconfBase):
             # "get_diff",
             "run_commands",
             "get_oneos_version",
+            "get_command_timing",
+            "apply_config_file",
+            "get_config_digest",
         ]
 
+    def get_command_timing(self):
+        """Returns the device latency per command of the last
+        run_commands call, commands of a batch are timed until
+        their output was received
+        """
+        return self._command_timing
+
     def get_option_values(self):
         return {
             "format": ["text"],
@@ -541,6 +1359,11 @@ class Cliconf(CliconfBase):
     def get_capabilities(self):
         result = super(Cliconf, self).get_capabilities()
         result["device_operations"] = self.get_device_operations()
+        result["oneos_version"] = self.oneos_version
+        result["oneos_full_version"] = self.oneos_full_version
+        result["acl_facts_source"] = self._get_plugin_option(
+            "acl_facts_source", "show"
+        )
         result["rpc"] = result["rpc"] + self.get_rpc()
         result.update(self.get_option_values())
         return json.dumps(result)
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022, 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+author: Maarten Wallraf
+name: oneos_fanout
+short_description: Run read-only commands on many OneOS devices at once
+description:
+  - Opens an SSH session to every host from the controller and runs the
+    commands with a bounded pool of worker threads, this avoids a
+    persistent connection and an ansible fork per host for large
+    read-only sweeps.
+  - Command aliases (ex. C(alias-get-hostname)) are translated for the
+    OneOS version of each host, only show/ls/cat commands are allowed.
+  - The result of every host is displayed (with -v) and optionally
+    written to I(output_file) as soon as the host is done.
+  - Requires paramiko.
+options:
+  _terms:
+    description: The hostnames or ip addresses of the devices.
+    required: true
+  commands:
+    description: The commands or aliases to run on every host.
+    type: list
+    elements: str
+    required: true
+  username:
+    description: The SSH username.
+    type: str
+  password:
+    description: The SSH password, keys are used if not set.
+    type: str
+  ssh_keyfile:
+    description: Private key file used for authentication.
+    type: path
+  port:
+    description: The SSH port.
+    type: int
+    default: 22
+  oneos_version:
+    description:
+      - The OneOS major version of all hosts (5 or 6), detected per
+        host with C(show version) if not set.
+    type: int
+  concurrency:
+    description: Maximum number of simultaneous SSH sessions.
+    type: int
+    default: 20
+  timeout:
+    description:
+      - Maximum time in seconds for a single host, including the login.
+    type: int
+    default: 30
+  host_key_checking:
+    description: Verify the SSH host keys against the known hosts.
+    type: bool
+    default: true
+  output_file:
+    description:
+      - Append the result of each host as a JSON line to this file as
+        soon as the host is done.
+    type: path
+"""
+
+EXAMPLES = """
+- name: get the hostname and acls of all CPEs
+  ansible.builtin.set_fact:
+    acls: "{{ lookup('mwallraf.ekinops.oneos_fanout', *groups['cpe'],
+              commands=['alias-get-hostname', 'show ip access-list'],
+              username=cpe_user, password=cpe_password,
+              concurrency=100, timeout=60, wantlist=True) }}"
+  run_once: true
+  delegate_to: localhost
+"""
+
+RETURN = """
+_list:
+  description: One result per host, in the order the hosts finished.
+  type: list
+  elements: dict
+  contains:
+    host:
+      description: The host.
+      type: str
+    failed:
+      description: True if the host could not be reached or a command
+                   failed.
+      type: bool
+    msg:
+      description: The error if the host failed.
+      type: str
+    stdout:
+      description: The output of every command.
+      type: list
+    oneos_version:
+      description: The OneOS major version of the host.
+      type: int
+    elapsed:
+      description: The time spent on the host in seconds.
+      type: float
+"""
+
+import json  # noqa:E402
+
+from ansible.errors import AnsibleError  # noqa:E402
+from ansible.plugins.lookup import LookupBase  # noqa:E402
+from ansible.utils.display import Display  # noqa:E402
+from ansible_collections.mwallraf.ekinops.plugins.plugin_utils.fanout import (  # noqa:E402,E501
+    HAS_PARAMIKO,
+    fan_out,
+)
+
+display = Display()
+
+
+class LookupModule(LookupBase):
+    def run(self, terms, variables=None, **kwargs):
+        if not HAS_PARAMIKO:
+            raise AnsibleError("paramiko is required for oneos_fanout")
+
+        self.set_options(var_options=variables, direct=kwargs)
+
+        output_file = self.get_option("output_file")
+        results = list()
+        for result in fan_out(
+            terms,
+            self.get_option("commands"),
+            concurrency=self.get_option("concurrency"),
+            port=self.get_option("port"),
+            username=self.get_option("username"),
+            password=self.get_option("password"),
+            key_filename=self.get_option("ssh_keyfile"),
+            timeout=self.get_option("timeout"),
+            oneos_version=self.get_option("oneos_version"),
+            host_key_checking=self.get_option("host_key_checking"),
+        ):
+            display.v(
+                "oneos_fanout: %s %s in %ss"
+                % (
+                    result["host"],
+                    "failed" if result["failed"] else "ok",
+                    result["elapsed"],
+                )
+            )
+            if output_file:
+                with open(output_file, "a") as f:
+                    f.write(json.dumps(result) + "\n")
+            results.append(result)
+        return results
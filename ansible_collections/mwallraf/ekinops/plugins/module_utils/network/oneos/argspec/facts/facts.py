@@ -25,7 +25,10 @@ class FactsArgs(object):  # pylint: disable=R0903
     ]
 
     argument_spec = {
-        'gather_subset': dict(default=['!config'], type='list'),
+        'gather_subset': dict(default=['!config', '!acl_counters'],
+                              type='list'),
         'gather_network_resources': dict(choices=choices,
                                          type='list'),
+        'gather_timing': dict(default=False, type='bool'),
+        'interfaces_filter': dict(type='list', elements='str'),
     }
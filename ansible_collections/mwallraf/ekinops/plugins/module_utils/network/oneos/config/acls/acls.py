@@ -18,11 +18,9 @@ created.
 """
 
 from copy import deepcopy
+from itertools import groupby
 
 from ansible.module_utils.six import iteritems
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
-    dict_merge,
-)
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.rm_base.resource_module import (
     ResourceModule,
 )
@@ -31,6 +29,10 @@ from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.fac
 )
 from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.rm_templates.acls import (
     AclsTemplate,
+    render_access_list_entries,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.network_template import (  # noqa: E501
+    merge_parsed,
 )
 
 
@@ -73,9 +75,10 @@ class Acls(ResourceModule):
         if self.want:
             wantd = self.list_to_dict(self.want)
 
-        # if state is merged, merge want onto have and then compare
+        # if state is merged, merge want onto have and then compare,
+        # have is copied once instead of on every level by dict_merge
         if self.state == "merged":
-            wantd = dict_merge(haved, wantd)
+            wantd = merge_parsed(deepcopy(haved), wantd)
 
         # if state is deleted, empty out wantd and set haved to want
         if self.state == "deleted":
@@ -160,6 +163,10 @@ class Acls(ResourceModule):
             if hentry:
                 hentry = self.sanitize_protocol_options(wentry, hentry)
             if hentry != wentry:
+                # all remarks of an acl are a single entry, they are
+                # compared as sets to avoid a quadratic list lookup
+                wremarks = set(wentry.get("remarks") or ())
+                hremarks = set(hentry.get("remarks") or ())
                 if hentry:
                     if self.state == "merged":
                         self._module.fail_json(
@@ -174,32 +181,40 @@ class Acls(ResourceModule):
                             "remarks",
                         ):  # remove remark if not in want
                             for rems in hentry.get("remarks"):
-                                if rems not in wentry.get("remarks", {}):
+                                if rems not in wremarks:
                                     self.addcmd(
                                         {"remarks": rems},
                                         "remarks",
                                         negate=True,
                                     )
                         else:  # remove ace if not in want
-                            self.addcmd(
-                                add_afi(hentry, afi),
-                                "aces",
-                                negate=True,
-                            )
+                            self.addaces([add_afi(hentry, afi)], negate=True)
                 if wentry.get("remarks"):  # add remark if not in have
                     for rems in wentry.get("remarks"):
-                        if rems not in hentry.get("remarks", {}):
+                        if rems not in hremarks:
                             self.addcmd({"remarks": rems}, "remarks")
                 else:  # add ace if not in have
-                    self.addcmd(add_afi(wentry, afi), "aces")
-
-        # remove remaining entries from have aces list
-        for hseq in have.values():
-            if hseq.get("remarks"):  # remove remarks that are extra in have
-                for rems in hseq.get("remarks"):
-                    self.addcmd({"remarks": rems}, "remarks", negate=True)
+                    self.addaces([add_afi(wentry, afi)])
+
+        # remove remaining entries from have aces list, consecutive aces
+        # are rendered at once
+        for is_remark, entries in groupby(
+            have.values(), lambda entry: bool(entry.get("remarks"))
+        ):
+            if is_remark:  # remove remarks that are extra in have
+                for hseq in entries:
+                    for rems in hseq.get("remarks"):
+                        self.addcmd({"remarks": rems}, "remarks", negate=True)
             else:  # remove extra aces
-                self.addcmd(add_afi(hseq, afi), "aces", negate=True)
+                self.addaces(
+                    [add_afi(hseq, afi) for hseq in entries], negate=True
+                )
+
+    def addaces(self, aces, negate=False):
+        """Adds the commands of a list of aces, the same commands as
+        addcmd with the "aces" parser for every ace
+        """
+        self.commands.extend(render_access_list_entries(aces, negate))
 
     def sanitize_protocol_options(self, wace, hace):
         """handles protocol and protocol options as optional attribute"""
@@ -264,7 +279,11 @@ class Acls(ResourceModule):
                                                     ks,
                                                 ),
                                             )
-                                elif acl.get("acl_type") == "extended":
+                                elif acl.get("acl_type") == "extended" and set(
+                                    ace
+                                ) != set(["remarks"]):
+                                    # remark entries are not aces and
+                                    # get no default protocol
                                     proto_options = ace.get(
                                         "protocol_options", {}
                                     )
@@ -27,6 +27,51 @@ from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.rm_
 from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.argspec.acls.acls import (
     AclsArgs,
 )
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.oneos import (  # noqa:E501
+    get_capabilities,
+    get_oneos_version,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.commands import (  # noqa:E501
+    OneosCommand,
+)
+
+# the access-list headers of the remarks output
+REMARK_TAG_RE = re.compile(r"^(ip|ipv6) ", re.MULTILINE)
+
+# the counters that "show ip access-list" adds to the matched entries
+MATCHES_RE = re.compile(r"\([^()]*\)")
+
+# the lines cleaned up (matches) or else removed (interfaces) by
+# sanitize_data, the alternatives are tried in this order
+SANITIZE_RE = re.compile(r"^.*match.*$|^interface.*\n?", re.MULTILINE)
+
+
+def _sanitize_line(match):
+    line = match.group()
+    if "match" in line:
+        return MATCHES_RE.sub("", line)[:-1]
+    return ""
+
+
+def split_acl_remarks(config):
+    """Returns the access-list sections of the running-config in the
+    format of get_acl_data: the access-lists without their remarks,
+    followed by the remarks below an "ip-remark" (or "ipv6-remark")
+    header per access-list
+    """
+    acls = []
+    remarks = []
+    for line in config.splitlines():
+        if not line or line == "exit":
+            continue
+        if not line[0].isspace():
+            acls.append(line)
+            remarks.append(REMARK_TAG_RE.sub(r"\1-remark ", line))
+        elif line.lstrip().startswith("remark"):
+            remarks.append(line)
+        else:
+            acls.append(line)
+    return "\n".join(acls + remarks)
 
 
 class AclsFacts(object):
@@ -37,36 +82,36 @@ class AclsFacts(object):
         self.argument_spec = AclsArgs.argument_spec
 
     def get_acl_data(self, connection):
-        # Get the access-lists from the ios router
-        # Get the remarks on access-lists from the ios router
-        # alternate command 'sh run partition access-list' but has a lot of ordering issues
-        # and incomplete ACLs are not viewed correctly
+        """Returns the access-lists followed by their remarks, the remarks
+        are tagged with an "ip-remark" or "ipv6-remark" header
+
+        The access-lists and remarks are taken from "show ip access-list"
+        and the remarks alias. With the acl_facts_source "running-config"
+        they are taken from a single running-config section instead, if
+        the OneOS version has the "alias-get-acls" alias.
+        """
+        # alternate command 'sh run partition access-list' but has a lot
+        # of ordering issues and incomplete ACLs are not viewed correctly
+        source = get_capabilities(self._module).get("acl_facts_source")
+        version = get_oneos_version(self._module, full=True)
+        if source == "running-config" and (
+            OneosCommand(version).get("alias-get-acls")
+        ):
+            return split_acl_remarks(connection.get("alias-get-acls"))
+
         _acl_data = connection.get("show ip access-list")
         _remarks_data = connection.get(
             "alias-get-acl-remarks",
         )
         if _remarks_data:
-            remarks_config = []
-            # add a tag so we can distinct between "show int" and "show run" output
-            for rem in _remarks_data.split("\n"):
-                rem = re.sub(r"^(ip )", "ip-remark ", rem)
-                rem = re.sub(r"^(ipv6 )", "ipv6-remark ", rem)
-                remarks_config.append(rem)
-            _acl_data += "\n" + "\n".join(remarks_config)
+            # add a tag so we can distinct between "show int" and
+            # "show run" output
+            _acl_data += "\n" + REMARK_TAG_RE.sub(r"\1-remark ", _remarks_data)
         return _acl_data
 
     def sanitize_data(self, data):
         """removes matches or extra config info that is added on acl match"""
-        re_data = ""
-        for da in data.split("\n"):
-            if "match" in da:
-                mod_da = re.sub(r"\([^()]*\)", "", da)
-                re_data += mod_da[:-1] + "\n"
-            elif da.startswith("interface"):
-                continue
-            else:
-                re_data += da + "\n"
-        return re_data
+        return SANITIZE_RE.sub(_sanitize_line, data) + "\n"
 
     def populate_facts(self, connection, ansible_facts, data=None):
         """Populate the facts for Acls network resource
@@ -78,12 +123,21 @@ class AclsFacts(object):
         :rtype: dictionary
         :returns: facts
         """
-        facts = {}
-        objs = []
-
         if not data:
             data = self.get_acl_data(connection)
 
+        facts = {}
+        acls = self.parse_acls(data)
+        if acls:
+            facts["acls"] = acls
+        ansible_facts["ansible_network_resources"].update(facts)
+
+        return ansible_facts
+
+    def parse_acls(self, data):
+        """Returns the acls per afi found in the access-list config or in
+        the output of "show ip access-list", without the match counters
+        """
         if data:
             data = self.sanitize_data(data)
 
@@ -181,15 +235,12 @@ class AclsFacts(object):
         if temp_v6:
             objs.append({"afi": "ipv6", "acls": temp_v6})
 
-        facts = {}
+        acls = []
         if objs:
-            facts["acls"] = []
             params = utils.validate_config(
                 self.argument_spec,
                 {"config": objs},
             )
             for cfg in params["config"]:
-                facts["acls"].append(utils.remove_empties(cfg))
-        ansible_facts["ansible_network_resources"].update(facts)
-
-        return ansible_facts
+                acls.append(utils.remove_empties(cfg))
+        return acls
@@ -9,14 +9,17 @@ this file validates each subset of facts and selectively
 calls the appropriate facts gathering function
 """
 
+from ansible.module_utils.six import iteritems
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.facts.facts import (  # noqa:E501
     FactsBase,
 )
 from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.facts.legacy.base import (  # noqa:E501
+    AclCounters,
     Default,
     Hardware,
     Config,
-    Interfaces,
+    StreamingInterfaces,
+    gather_legacy_facts,
 )
 from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.facts.hostname.hostname import (  # noqa:E501
     HostnameFacts,
@@ -35,7 +38,8 @@ FACT_LEGACY_SUBSETS = dict(
     default=Default,
     hardware=Hardware,
     config=Config,
-    interfaces=Interfaces,
+    interfaces=StreamingInterfaces,
+    acl_counters=AclCounters,
 )
 
 FACT_RESOURCE_SUBSETS = dict(
@@ -54,6 +58,48 @@ class Facts(FactsBase):
     def __init__(self, module):
         super(Facts, self).__init__(module)
 
+    def get_network_legacy_facts(
+        self, fact_legacy_obj_map, legacy_facts_type=None
+    ):
+        """Same as FactsBase.get_network_legacy_facts but the commands
+        of all subsets are sent to the device in one run_commands call
+        """
+        if not legacy_facts_type:
+            legacy_facts_type = self._gather_subset
+
+        runable_subsets = self.gen_runable(
+            legacy_facts_type, frozenset(fact_legacy_obj_map.keys())
+        )
+        if runable_subsets:
+            facts = dict()
+            # default subset should always returned be with legacy facts
+            if "default" not in runable_subsets:
+                runable_subsets.add("default")
+            self.ansible_facts["ansible_net_gather_subset"] = list(
+                runable_subsets
+            )
+
+            instances = dict()
+            for key in runable_subsets:
+                instances[key] = fact_legacy_obj_map[key](self._module)
+
+            timing = None
+            if self._module.params.get("gather_timing"):
+                timing = dict()
+
+            gather_legacy_facts(self._module, instances, timing)
+
+            for inst in instances.values():
+                facts.update(inst.facts)
+                self._warnings.extend(inst.warnings)
+
+            if timing is not None:
+                facts["gather_timing"] = timing
+
+            for key, value in iteritems(facts):
+                key = "ansible_net_%s" % key
+                self.ansible_facts[key] = value
+
     def get_facts(
         self, legacy_facts_type=None, resource_facts_type=None, data=None
     ):
@@ -16,14 +16,20 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 
+import fnmatch
 import platform
 import re
+import time
 
 from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.oneos import (  # noqa:E501
     run_commands,
     get_capabilities,
+    get_command_timing,
     get_oneos_version,
 )
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.facts.acls.acls import (  # noqa:E501
+    AclsFacts,
+)
 from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.commands import (  # noqa:E501
     OneosCommand,
 )
@@ -31,6 +37,123 @@ from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.uti
 from datetime import datetime
 from ansible.module_utils.six import iteritems
 
+# compiled patterns used by the Hardware and Interfaces parsers
+PATTERNS = {
+    # Hardware
+    "boot_image": re.compile(
+        r"""^(?P<BOOTDRIVE>.*):(?P<BOOTIMAGEFOLDER>\/BSA\/binaries)
+        \/(?P<BOOTFILE>\S+)$""",
+        re.M | re.VERBOSE,
+    ),
+    "boot_config": re.compile(
+        r"""^(?P<BOOTDRIVE>.*):(?P<BOOTCONFIGFOLDER>\/BSA\/config)
+        \/(?P<BOOTCONFIG>\S+)$""",
+        re.M | re.VERBOSE,
+    ),
+    "boot_file_V5": re.compile(r"\W+(\S+)\s+([0-9]{2,})$", re.M),
+    "boot_file_V6": re.compile(
+        r"^\S+\s+\d+\s+(\d+)\s+\S+\s+\S+\s+\S+\s+(\S+)", re.M
+    ),
+    "software_bank": re.compile(r"\W+(\w+)\sbank\W+"),
+    "software_bank_version": re.compile(r"Software\sversion\s+:\s+(.*)"),
+    "software_bank_checksum": re.compile(r"Header\schecksum\s+:\s+(.*)"),
+    "software_version": re.compile(
+        r"\W*Software [Vv]ersion\W+(\S+)\W*$", re.M
+    ),
+    "boot_version": re.compile(r"\W*Boot [Vv]ersion\W+(\S+)\W*$", re.M),
+    "recovery_version": re.compile(r"\W*Recovery version\W+(\S+)\W*$", re.M),
+    "license": re.compile(r"\W*License token\W+(\S+)\W*$", re.M),
+    "started_at": re.compile(r"\W*System started\W+(.*)$", re.M),
+    "uptime": re.compile(r"\W*Sys Up time\W+(.*)$", re.M),
+    "uptime_seconds": re.compile(
+        r"""(?:(?P<DAYS>\d+)d\W*)?(?:(?P<HOURS>\d+)h\W*)?
+        (?:(?P<MINUTES>\d+)m\W*)?(?:(?P<SECONDS>\d+)s)?""",
+        re.VERBOSE,
+    ),
+    "system_time": re.compile(r"\W*Current system time\W+(.*)$", re.M),
+    "restart_cause": re.compile(r"\W*Start caused by\W+(.*)$", re.M),
+    "memory": re.compile(
+        r"""System total\W+(?P<TOTAL>[\d+ ]+\d).*\n.*\s+used\W+
+        (?P<USED>[\d+ ]+\d)\W+(?P<USEDPCT>[\S]+)%.*\n.*\s+free
+        \W+(?P<FREE>[\d+ ]+\d)\W+(?P<FREEPCT>[\S]+)%""",
+        re.M | re.VERBOSE,
+    ),
+    "memory_total": re.compile(r"Memory Total\W+(?P<TOTAL>\d+)", re.M),
+    "cpu_V5": re.compile(
+        r"""Core (?P<cpu>\d+).*\nAverage CPU load.*\/\W*
+        (?P<avg_load>[\d\.]+)%""",
+        re.M | re.VERBOSE,
+    ),
+    "cpu_V6": re.compile(
+        r"""^\W+(\d+)\W+(?:control|forwarding)
+        [^%]+%[^%]+%[^%]+%\W+([\d\.]+)\W%""",
+        re.M | re.VERBOSE,
+    ),
+    "filesystems": re.compile(r"\s+(\S+)\s+disk\s+:\s*(\d+)M[Bo]", re.M),
+    "filesystem_name": re.compile(r"^.*devHdr.name:\s+(\S+?)(?:disk)?:"),
+    "filesystem_free": re.compile(
+        r"^.*free space on volume:\s+(\S+?)\sbytes.*"
+    ),
+    "flash_V6": re.compile(
+        r"""^.*user\D+(?P<total_b>\d+)\D+
+        (?P<free_b>\d+)\D+(?P<used_pct>[\d\.]+)%""",
+        re.M | re.VERBOSE,
+    ),
+    # Interfaces
+    "interface_header": re.compile(r"^(\w+\s?\S+) is.*"),
+    "interface_ipv4": re.compile(
+        r"Internet address is (\d+\.\d+\.\d+\.\d+\/\d+).*$", re.M
+    ),
+    "interface_ipv4_secondary": re.compile(
+        r"Secondary address is (\d+\.\d+\.\d+\.\d+\/\d+).*$", re.M
+    ),
+    "interface_ipv6": re.compile(r"IPv6 address is (\S+\/\d+)", re.M),
+    "description": re.compile(r"Description: (.+)$", re.M),
+    "macaddress": re.compile(r"Hardware address is (\S+), ARP.*"),
+    "ipv4": re.compile(r"Internet address is (\S+)"),
+    "mtu": re.compile(r", (?:IPv4 )?MTU (\d+)"),
+    "bandwidth": re.compile(r"bandwidth limit (\d+) kbps"),
+    "duplex": re.compile(r", ((?:\w+-)?duplex(?:[ -]\w+)?)", re.M),
+    "mediatype": re.compile(r"media-type (.+)$", re.M),
+    "type": re.compile(r"Hardware is (.+),", re.M),
+    "lineprotocol": re.compile(r"line protocol is (up|down)(.+)?$", re.M),
+    "operstatus": re.compile(r"^(?:.+) is (.+), line protocol", re.M),
+    "vrf": re.compile(r"associated to VRF (\w+)", re.M),
+    "flags": re.compile(r"Flags:\s\(\S+\)\s(.*),", re.M),
+    "speed": re.compile(r"Line speed (\d+) kbps", re.M),
+    # all the interface fields above except operstatus in a single pass,
+    # only the keyword is consumed so that fields on the same line are
+    # still found, the value is captured in a lookahead
+    "interface_fields": re.compile(
+        r"""Description:\ (?=(?P<description>.+)$)
+        |Hardware\ address\ is\ (?=(?P<macaddress>\S+),\ ARP)
+        |Hardware\ is\ (?=(?P<type>.+),)
+        |,\ (?=(?:IPv4\ )?MTU\ (?P<mtu>\d+))
+        |,\ (?=(?P<duplex>(?:\w+-)?duplex(?:[\ -]\w+)?))
+        |bandwidth\ limit\ (?=(?P<bandwidth>\d+)\ kbps)
+        |media-type\ (?=(?P<mediatype>.+)$)
+        |line\ protocol\ is\ (?=(?P<lineprotocol>up|down))
+        |associated\ to\ VRF\ (?=(?P<vrf>\w+))
+        |Flags:(?=\s\(\S+\)\s(?P<flags>.*),)
+        |Line\ speed\ (?=(?P<speed>\d+)\ kbps)""",
+        re.M | re.VERBOSE,
+    ),
+    # AclCounters: the access-list headers and the entries with their
+    # optional sequence and match counter of "show ip access-list"
+    "acl_counters": re.compile(
+        r"""^(?:ip|ipv6)\ access-list\ (?:(?:standard|extended)\ )?
+        (?P<acl>\S+)
+        |^\s+(?:(?P<sequence>\d+)\s+)?(?:permit|deny)\b.*?
+        (?:\((?P<matches>\d+)\ match(?:es)?\))?[ \t]*$""",
+        re.M | re.VERBOSE,
+    ),
+}
+
+
+def _to_int(value):
+    if value is not None:
+        return int(value)
+
 
 class FactsBase(object):
 
@@ -51,17 +174,66 @@ class FactsBase(object):
         return self._oneos_version
 
     def init(self):
-        self._oneos_command_class = OneosCommand(self.oneos_version)
+        self._oneos_command_class = OneosCommand(
+            get_oneos_version(self.module, full=True)
+        )
 
     def populate(self):
-        self.responses = run_commands(
-            self.module, commands=self.COMMANDS, check_rc=False
-        )
+        # responses may already be collected by gather_legacy_facts
+        if self.responses is None:
+            self.responses = run_commands(
+                self.module, commands=self.COMMANDS, check_rc=False
+            )
 
     def run(self, cmd):
         return run_commands(self.module, commands=cmd, check_rc=False)
 
 
+def gather_legacy_facts(module, instances, timing=None):
+    """Runs the commands of all legacy fact subsets in a single
+    run_commands call and populates each subset with the shared
+    responses, commands needed by more than one subset are sent once
+
+    :module: the ansible module
+    :instances: dict of subset name and FactsBase instance
+    :timing: optional dict, updated with the parse time per subset
+             and the device latency per command
+
+    Example of timing:
+        {
+            "commands_seconds": 0.8421,
+            "commands": [
+                {"command": "show system status", "seconds": 0.1203},
+                ...
+            ],
+            "subsets": {"hardware": 0.0021, "interfaces": 0.0154, ...}
+        }
+    """
+    commands = list()
+    for inst in instances.values():
+        for cmd in inst.COMMANDS:
+            if cmd not in commands:
+                commands.append(cmd)
+
+    start = time.time()
+    responses = list()
+    if commands:
+        responses = run_commands(module, commands=commands, check_rc=False)
+    shared = dict(zip(commands, responses))
+
+    if timing is not None:
+        timing["commands_seconds"] = round(time.time() - start, 4)
+        timing["commands"] = get_command_timing(module) if commands else []
+        timing["subsets"] = dict()
+
+    for name, inst in instances.items():
+        inst.responses = [shared.get(cmd, "") for cmd in inst.COMMANDS]
+        start = time.time()
+        inst.populate()
+        if timing is not None:
+            timing["subsets"][name] = round(time.time() - start, 4)
+
+
 class Default(FactsBase):
     """Gets information from connection get_capabilities info"""
 
@@ -122,7 +294,7 @@ class Hardware(FactsBase):
         if data:
             self.facts["memory"] = self.parse_memory(data)
 
-        eval(f"self.populate_V{self.oneos_version}()")
+        self.VERSION_PARSERS[self.oneos_version](self)
 
         mandatory_keys = [
             "uptime",
@@ -139,6 +311,17 @@ class Hardware(FactsBase):
                     f"Unable to gather {mandatory_key} statistics"
                 )
 
+    def parse_system_status(self, data):
+        """Returns the uptime, software and cpu facts of the output of
+        show system status
+        """
+        cpu_parsers = {5: self.parse_cpu_V5, 6: self.parse_cpu_V6}
+        return dict(
+            uptime=self.parse_system_info(data),
+            software=self.parse_software_info(data),
+            cpu=cpu_parsers[self.oneos_version](data),
+        )
+
     def populate_V5(self):
         data = self.responses[0]
         if data:
@@ -169,30 +352,20 @@ class Hardware(FactsBase):
         facts["supports_alternate_banks"] = False
 
         data = datas[0]
-        match = re.search(
-            r"""^(?P<BOOTDRIVE>.*):(?P<BOOTIMAGEFOLDER>\/BSA\/binaries)
-            \/(?P<BOOTFILE>\S+)$""",
-            data,
-            re.M | re.VERBOSE,
-        )
+        match = PATTERNS["boot_image"].search(data)
         if match:
             facts["image_drive"] = match.group(1)
             facts["image_folder"] = match.group(2)
             facts["image_name"] = match.group(3)
 
-        match = re.search(
-            r"""^(?P<BOOTDRIVE>.*):(?P<BOOTCONFIGFOLDER>\/BSA\/config)
-            \/(?P<BOOTCONFIG>\S+)$""",
-            data,
-            re.M | re.VERBOSE,
-        )
+        match = PATTERNS["boot_config"].search(data)
         if match:
             facts["config_drive"] = match.group(1)
             facts["config_folder"] = match.group(2)
             facts["config_name"] = match.group(3)
 
         data = datas[1]
-        matches = re.finditer(r"\W+(\S+)\s+([0-9]{2,})$", data, re.M)
+        matches = PATTERNS["boot_file_V5"].finditer(data)
         if matches:
             boot_files = []
             for matchNum, match in enumerate(matches, start=1):
@@ -202,7 +375,7 @@ class Hardware(FactsBase):
             facts["available_images"] = boot_files
 
         data = datas[2]
-        matches = re.finditer(r"\W+(\S+)\s+([0-9]{2,})$", data, re.M)
+        matches = PATTERNS["boot_file_V5"].finditer(data)
         if matches:
             boot_files = []
             for matchNum, match in enumerate(matches, start=1):
@@ -223,9 +396,7 @@ class Hardware(FactsBase):
         facts["software_banks"] = dict()
 
         data = datas[0]
-        matches = re.finditer(
-            r"^\S+\s+\d+\s+(\d+)\s+\S+\s+\S+\s+\S+\s+(\S+)", data, re.M
-        )
+        matches = PATTERNS["boot_file_V6"].finditer(data)
         if matches:
             files = []
             for matchNum, match in enumerate(matches, start=1):
@@ -235,9 +406,7 @@ class Hardware(FactsBase):
             facts["available_images"] = files
 
         data = datas[1]
-        matches = re.finditer(
-            r"^\S+\s+\d+\s+(\d+)\s+\S+\s+\S+\s+\S+\s+(\S+)", data, re.M
-        )
+        matches = PATTERNS["boot_file_V6"].finditer(data)
         if matches:
             files = []
             for matchNum, match in enumerate(matches, start=1):
@@ -250,15 +419,15 @@ class Hardware(FactsBase):
         image = None
         checksum = None
         for line in datas[2].split("\n"):
-            m = re.match(r"\W+(\w+)\sbank\W+", line)
+            m = PATTERNS["software_bank"].match(line)
             if m:
                 bank = m.group(1).lower()
 
-            m = re.match(r"Software\sversion\s+:\s+(.*)", line)
+            m = PATTERNS["software_bank_version"].match(line)
             if m:
                 image = m.group(1)
 
-            m = re.match(r"Header\schecksum\s+:\s+(.*)", line)
+            m = PATTERNS["software_bank_checksum"].match(line)
             if m:
                 checksum = m.group(1)
 
@@ -281,22 +450,22 @@ class Hardware(FactsBase):
     def parse_software_info(self, data):
         facts = dict()
 
-        match = re.search(r"\W*Software [Vv]ersion\W+(\S+)\W*$", data, re.M)
+        match = PATTERNS["software_version"].search(data)
         if match:
             facts["software_version"] = match.group(1)
 
-        match = re.search(r"\W*Boot [Vv]ersion\W+(\S+)\W*$", data, re.M)
+        match = PATTERNS["boot_version"].search(data)
         if match:
             facts["boot_version"] = match.group(1)
 
-        match = re.search(r"\W*Recovery version\W+(\S+)\W*$", data, re.M)
+        match = PATTERNS["recovery_version"].search(data)
         if match:
             facts["recovery_version"] = match.group(1)
             facts["supports_alternate_version"] = True
         else:
             facts["supports_alternate_version"] = False
 
-        match = re.search(r"\W*License token\W+(\S+)\W*$", data, re.M)
+        match = PATTERNS["license"].search(data)
         if match and match.group(1) != "None":
             facts["license"] = match.group(1)
 
@@ -318,22 +487,17 @@ class Hardware(FactsBase):
                 return _dt.isoformat()
             return _dt
 
-        match = re.search(r"\W*System started\W+(.*)$", data, re.M)
+        match = PATTERNS["started_at"].search(data)
         if match:
             started_at = _convert_datetime_to_iso(match.group(1))
             facts["started_at"] = started_at
 
-        match = re.search(r"\W*Sys Up time\W+(.*)$", data, re.M)
+        match = PATTERNS["uptime"].search(data)
         if match:
             facts["uptime"] = match.group(1)
 
         if facts.get("uptime"):
-            match = re.search(
-                r"""(?:(?P<DAYS>\d+)d\W*)?(?:(?P<HOURS>\d+)h\W*)?
-                (?:(?P<MINUTES>\d+)m\W*)?(?:(?P<SECONDS>\d+)s)?""",
-                facts["uptime"],
-                re.VERBOSE,
-            )
+            match = PATTERNS["uptime_seconds"].search(facts["uptime"])
             if match:
                 total_seconds = (
                     int(match.groupdict().get("DAYS", 0)) * 86400
@@ -343,12 +507,12 @@ class Hardware(FactsBase):
                 )
                 facts["uptime_seconds"] = int(total_seconds)
 
-        match = re.search(r"\W*Current system time\W+(.*)$", data, re.M)
+        match = PATTERNS["system_time"].search(data)
         if match:
             system_time = _convert_datetime_to_iso(match.group(1))
             facts["system_time"] = system_time
 
-        match = re.search(r"\W*Start caused by\W+(.*)$", data, re.M)
+        match = PATTERNS["restart_cause"].search(data)
         if match:
             facts["restart_cause"] = match.group(1)
 
@@ -357,13 +521,7 @@ class Hardware(FactsBase):
     def parse_memory(self, data):
         facts = dict()
 
-        m = re.search(
-            r"""System total\W+(?P<TOTAL>[\d+ ]+\d).*\n.*\s+used\W+
-            (?P<USED>[\d+ ]+\d)\W+(?P<USEDPCT>[\S]+)%.*\n.*\s+free
-            \W+(?P<FREE>[\d+ ]+\d)\W+(?P<FREEPCT>[\S]+)%""",
-            data,
-            re.M | re.VERBOSE,
-        )
+        m = PATTERNS["memory"].search(data)
         if m:
             mem_total_kb = float(m.groupdict()["TOTAL"].replace(" ", ""))
             mem_used_kb = float(m.groupdict()["USED"].replace(" ", ""))
@@ -377,7 +535,7 @@ class Hardware(FactsBase):
             facts["mem_free_pct"] = float(mem_used_pct)
             facts["mem_used_pct"] = float(mem_free_pct)
 
-        m = re.search(r"Memory Total\W+(?P<TOTAL>\d+)", data, re.M)
+        m = PATTERNS["memory_total"].search(data)
         if m:
             mem_total_b = float(m.groupdict()["TOTAL"])
             facts["mem_total_mb"] = int(mem_total_b / (1024 * 1024))
@@ -387,12 +545,7 @@ class Hardware(FactsBase):
     def parse_cpu_V5(self, data):
         facts = list()
 
-        all_cpu = re.findall(
-            r"""Core (?P<cpu>\d+).*\nAverage CPU load.*\/\W*
-            (?P<avg_load>[\d\.]+)%""",
-            data,
-            re.M | re.VERBOSE,
-        )
+        all_cpu = PATTERNS["cpu_V5"].findall(data)
 
         for cpu in all_cpu:
             facts.append(
@@ -404,12 +557,7 @@ class Hardware(FactsBase):
     def parse_cpu_V6(self, data):
         facts = list()
 
-        all_cpu = re.findall(
-            r"""^\W+(\d+)\W+(?:control|forwarding)
-            [^%]+%[^%]+%[^%]+%\W+([\d\.]+)\W%""",
-            data,
-            re.M | re.VERBOSE,
-        )
+        all_cpu = PATTERNS["cpu_V6"].findall(data)
 
         for cpu in all_cpu:
             facts.append(
@@ -420,7 +568,7 @@ class Hardware(FactsBase):
 
     def parse_filesystems(self, data):
         # example output: [('Ram', '1'), ('Flash', '256')]
-        return re.findall(r"\s+(\S+)\s+disk\s+:\s*(\d+)M[Bo]", data, re.M)
+        return PATTERNS["filesystems"].findall(data)
 
     def parse_filesystems_info_V5(self, data):
         allfs = self.parse_filesystems(data)
@@ -437,7 +585,7 @@ class Hardware(FactsBase):
         fs = None
         for line in data.split("\n"):
             # find the filesystem
-            match = re.match(r"^.*devHdr.name:\s+(\S+?)(?:disk)?:", line)
+            match = PATTERNS["filesystem_name"].match(line)
             if match:
                 fs = match.group(1).lower()
                 if fs and fs in fs_details:
@@ -446,9 +594,7 @@ class Hardware(FactsBase):
                     fs = None
                 continue
             # find the free disk space
-            match = re.match(
-                r"^.*free space on volume:\s+(\S+?)\sbytes.*", line
-            )
+            match = PATTERNS["filesystem_free"].match(line)
             if match and fs:
                 facts[fs]["spacefree_kb"] = (
                     int(match.group(1).replace(",", "")) / 1024
@@ -464,12 +610,7 @@ class Hardware(FactsBase):
     def parse_filesystems_info_V6(self, data):
         facts = dict()
 
-        m = re.search(
-            r"""^.*user\D+(?P<total_b>\d+)\D+
-            (?P<free_b>\d+)\D+(?P<used_pct>[\d\.]+)%""",
-            data,
-            re.M | re.VERBOSE,
-        )
+        m = PATTERNS["flash_V6"].search(data)
         if m:
             flash_total_b = float(m.groupdict()["total_b"])
             flash_free_b = float(m.groupdict()["free_b"])
@@ -486,6 +627,12 @@ class Hardware(FactsBase):
 
         return facts
 
+    # OneOS version specific populate functions
+    VERSION_PARSERS = {
+        5: populate_V5,
+        6: populate_V6,
+    }
+
 
 class Config(FactsBase):
 
@@ -504,6 +651,44 @@ class Config(FactsBase):
             self.facts["config"] = data
 
 
+class AclCounters(FactsBase):
+    """Only the match counters of the access-list entries, without
+    parsing the entries themselves
+
+    The counters are returned as parallel lists, entry i is in access-list
+    acls[i] with sequence sequences[i] (None if not shown) and matched
+    matches[i] times:
+        {
+            "acls": ["BYPASS-LIST", "BYPASS-LIST", "NAT_ACL"],
+            "sequences": [10, 20, None],
+            "matches": [12, 0, 3],
+        }
+    """
+
+    COMMANDS = ["show ip access-list"]
+
+    def populate(self):
+        super(AclCounters, self).populate()
+        self.facts["acl_counters"] = self.parse_acl_counters(
+            self.responses[0] or ""
+        )
+
+    def parse_acl_counters(self, data):
+        acls = list()
+        sequences = list()
+        matches = list()
+        acl = None
+        for match in PATTERNS["acl_counters"].finditer(data):
+            name, sequence, count = match.group("acl", "sequence", "matches")
+            if name:
+                acl = name
+                continue
+            acls.append(acl)
+            sequences.append(_to_int(sequence))
+            matches.append(int(count) if count else 0)
+        return dict(acls=acls, sequences=sequences, matches=matches)
+
+
 class Interfaces(FactsBase):
 
     COMMANDS = [
@@ -514,13 +699,47 @@ class Interfaces(FactsBase):
 
     IGNORE_INTERFACES = ["Null", "null"]
 
+    def __init__(self, module):
+        super(Interfaces, self).__init__(module)
+
+        # interface names or glob patterns, ex. ["Cellular*"]
+        self.interfaces_filter = module.params.get("interfaces_filter") or []
+        if self.interfaces_filter:
+            self.COMMANDS = self.get_filtered_commands(self.interfaces_filter)
+
+    def get_filtered_commands(self, interfaces_filter):
+        """Fetch each interface separately if only interface names are
+        requested, patterns can only be matched on the full output
+        """
+        if any(self._is_pattern(f) for f in interfaces_filter):
+            return ["show interfaces"]
+        return ["show interfaces %s" % f for f in interfaces_filter]
+
+    def _is_pattern(self, name):
+        return any(c in name for c in "*?[")
+
+    def is_requested(self, name):
+        """Returns True if the interface matches the interfaces_filter,
+        names are compared case insensitive
+
+        Only the output of the plain show interfaces command is filtered,
+        the device already returns the requested interfaces for a name
+        which may be abbreviated, ex. "gi 0/0"
+        """
+        if self.COMMANDS != ["show interfaces"] or not self.interfaces_filter:
+            return True
+        return any(
+            fnmatch.fnmatchcase(name.lower(), f.lower())
+            for f in self.interfaces_filter
+        )
+
     def populate(self):
         super(Interfaces, self).populate()
 
         self.facts["all_ipv4_addresses"] = list()
         self.facts["all_ipv6_addresses"] = list()
 
-        data = self.responses[0]
+        data = "\n".join(r for r in self.responses if r)
         if data:
             interfaces = self.parse_interfaces(data)
             self.facts["interfaces"] = self.populate_interfaces(interfaces)
@@ -535,6 +754,12 @@ class Interfaces(FactsBase):
         #     data = self.parse_interfaces(data)
         #     self.populate_ipv6_interfaces(data)
 
+    def parse_interface_facts(self, data):
+        """Returns the interface facts of the output of show interfaces"""
+        self.facts["all_ipv4_addresses"] = list()
+        self.facts["all_ipv6_addresses"] = list()
+        return self.populate_interfaces(self.parse_interfaces(data))
+
     def populate_interfaces(self, interfaces):
         facts = dict()
         for key, value in iteritems(interfaces):
@@ -542,20 +767,7 @@ class Interfaces(FactsBase):
                 if key.startswith(intf):
                     continue
 
-            intf = dict()
-            intf["description"] = self.parse_description(value)
-            intf["macaddress"] = self.parse_macaddress(value)
-
-            intf["mtu"] = self.parse_mtu(value)
-            intf["bandwidth"] = self.parse_bandwidth(value)
-            intf["mediatype"] = self.parse_mediatype(value)
-            intf["duplex"] = self.parse_duplex(value)
-            intf["speed"] = self.parse_speed(value)
-            intf["lineprotocol"] = self.parse_lineprotocol(value)
-            intf["operstatus"] = self.parse_operstatus(value)
-            intf["type"] = self.parse_type(value)
-            intf["vrf"] = self.parse_vrf(value)
-            intf["flags"] = self.parse_flags(value)
+            intf = self.parse_interface_block(value)
 
             intf["ipv4"] = self.populate_ipv4_interfaces(value)
             intf["ipv6"] = self.populate_ipv6_interfaces(value)
@@ -567,14 +779,8 @@ class Interfaces(FactsBase):
         facts = list()
 
         primary_address = addresses = []
-        primary_address = re.findall(
-            r"Internet address is (\d+\.\d+\.\d+\.\d+\/\d+).*$",
-            data,
-            re.M,
-        )
-        addresses = re.findall(
-            r"Secondary address is (\d+\.\d+\.\d+\.\d+\/\d+).*$", data, re.M
-        )
+        primary_address = PATTERNS["interface_ipv4"].findall(data)
+        addresses = PATTERNS["interface_ipv4_secondary"].findall(data)
         if len(primary_address) == 0:
             return facts
         addresses = primary_address + addresses
@@ -593,7 +799,7 @@ class Interfaces(FactsBase):
     def populate_ipv6_interfaces(self, data):
         facts = list()
 
-        addresses = re.findall(r"IPv6 address is (\S+\/\d+)", data, re.M)
+        addresses = PATTERNS["interface_ipv6"].findall(data)
         for address in addresses:
             addr, subnet = address.split("/")
             ipv6 = dict(address=addr.strip(), subnet=subnet.strip())
@@ -608,82 +814,209 @@ class Interfaces(FactsBase):
             self.facts["all_ipv6_addresses"].append(address)
 
     def parse_interfaces(self, data):
-        parsed = dict()
-        key = ""
+        return dict(self.iter_interface_blocks(data))
+
+    def iter_interface_blocks(self, data):
+        """Yields (name, block) for every interface in the output of
+        show interfaces, the lines of a block are collected in a list
+        and joined once the next interface starts
+
+        Interfaces that are not requested by interfaces_filter are
+        skipped without collecting their lines.
+        """
+        key = None
+        lines = None
         for line in data.split("\n"):
             if len(line) == 0:
                 continue
             if line[0] == " ":
-                parsed[key] += "\n%s" % line
+                if lines is not None:
+                    lines.append(line)
             else:
-                match = re.match(r"^(\w+\s?\S+) is.*", line)
+                match = PATTERNS["interface_header"].match(line)
                 if match:
+                    if lines is not None:
+                        yield key, "\n".join(lines)
                     key = match.group(1)
-                    parsed[key] = line
-        return parsed
+                    lines = [line] if self.is_requested(key) else None
+        if lines is not None:
+            yield key, "\n".join(lines)
+
+    def parse_interface_block(self, data):
+        """Returns the same fields as the individual parse_* functions
+        but scans the interface block only once for all of them
+        (operstatus has its own scan, it is anchored at a line start)
+        """
+        fields = dict()
+        for match in PATTERNS["interface_fields"].finditer(data):
+            key = match.lastgroup
+            if key not in fields:
+                fields[key] = match.group(key)
+
+        intf = dict()
+        intf["description"] = fields.get("description")
+        intf["macaddress"] = fields.get("macaddress")
+        intf["mtu"] = _to_int(fields.get("mtu"))
+        intf["bandwidth"] = _to_int(fields.get("bandwidth"))
+        intf["mediatype"] = fields.get("mediatype")
+        intf["duplex"] = fields.get("duplex")
+        intf["speed"] = _to_int(fields.get("speed"))
+        intf["lineprotocol"] = fields.get("lineprotocol")
+        intf["operstatus"] = self.parse_operstatus(data)
+        intf["type"] = fields.get("type")
+        intf["vrf"] = fields.get("vrf")
+        intf["flags"] = (
+            fields["flags"].split(" ") if "flags" in fields else None
+        )
+        return intf
 
     def parse_description(self, data):
-        match = re.search(r"Description: (.+)$", data, re.M)
+        match = PATTERNS["description"].search(data)
         if match:
             return match.group(1)
 
     def parse_macaddress(self, data):
-        match = re.search(r"Hardware address is (\S+), ARP.*", data)
+        match = PATTERNS["macaddress"].search(data)
         if match:
             return match.group(1)
 
     def parse_ipv4(self, data):
-        match = re.search(r"Internet address is (\S+)", data)
+        match = PATTERNS["ipv4"].search(data)
         if match:
             addr, masklen = match.group(1).split("/")
             return dict(address=addr, masklen=int(masklen))
 
     def parse_mtu(self, data):
-        match = re.search(r", (?:IPv4 )?MTU (\d+)", data)
+        match = PATTERNS["mtu"].search(data)
         if match:
             return int(match.group(1))
 
     def parse_bandwidth(self, data):
-        match = re.search(r"bandwidth limit (\d+) kbps", data)
+        match = PATTERNS["bandwidth"].search(data)
         if match:
             return int(match.group(1))
 
     def parse_duplex(self, data):
-        match = re.search(r", ((?:\w+-)?duplex(?:[ -]\w+)?)", data, re.M)
+        match = PATTERNS["duplex"].search(data)
         if match:
             return match.group(1)
 
     def parse_mediatype(self, data):
-        match = re.search(r"media-type (.+)$", data, re.M)
+        match = PATTERNS["mediatype"].search(data)
         if match:
             return match.group(1)
 
     def parse_type(self, data):
-        match = re.search(r"Hardware is (.+),", data, re.M)
+        match = PATTERNS["type"].search(data)
         if match:
             return match.group(1)
 
     def parse_lineprotocol(self, data):
-        match = re.search(r"line protocol is (up|down)(.+)?$", data, re.M)
+        match = PATTERNS["lineprotocol"].search(data)
         if match:
             return match.group(1)
 
     def parse_operstatus(self, data):
-        match = re.search(r"^(?:.+) is (.+), line protocol", data, re.M)
+        match = PATTERNS["operstatus"].search(data)
         if match:
             return match.group(1)
 
     def parse_vrf(self, data):
-        match = re.search(r"associated to VRF (\w+)", data, re.M)
+        match = PATTERNS["vrf"].search(data)
         if match:
             return match.group(1)
 
     def parse_flags(self, data):
-        match = re.search(r"Flags:\s\(\S+\)\s(.*),", data, re.M)
+        match = PATTERNS["flags"].search(data)
         if match:
             return match.group(1).split(" ")
 
     def parse_speed(self, data):
-        match = re.search(r"Line speed (\d+) kbps", data, re.M)
+        match = PATTERNS["speed"].search(data)
         if match:
             return int(match.group(1))
+
+
+class StreamingInterfaces(Interfaces):
+    """Same facts as Interfaces but every interface is parsed as soon as
+    its block has been read from the output, all_ipv4_addresses and
+    all_ipv6_addresses are built while parsing
+    """
+
+    def populate(self):
+        FactsBase.populate(self)
+
+        self.facts["all_ipv4_addresses"] = list()
+        self.facts["all_ipv6_addresses"] = list()
+
+        data = "\n".join(r for r in self.responses if r)
+        if data:
+            self.facts["interfaces"] = dict(self.iter_interfaces(data))
+
+    def iter_interfaces(self, data):
+        """Yields (name, interface facts) one interface at a time"""
+        for key, block in self.iter_interface_blocks(data):
+            intf = self.parse_interface_block(block)
+            intf["ipv4"] = self.populate_ipv4_interfaces(block)
+            intf["ipv6"] = self.populate_ipv6_interfaces(block)
+            yield key, intf
+
+
+# the parsers of the command outputs that oneos_command returns with
+# output: structured, (facts class, parse method) per command
+COMMAND_PARSERS = {
+    "show system status": (Hardware, "parse_system_status"),
+    "show memory": (Hardware, "parse_memory"),
+    "show memory details": (Hardware, "parse_memory"),
+    "show interfaces": (Interfaces, "parse_interface_facts"),
+    "show ip access-list": (AclsFacts, "parse_acls"),
+}
+
+
+class CommandParser(object):
+    """Parses command outputs with the COMMAND_PARSERS, the parser of a
+    command is looked up once and every facts class is instantiated once
+
+    Commands with arguments, ex. "show interfaces gigabitethernet 0/0",
+    use the parser of the longest known prefix. Filtered outputs are not
+    parsed.
+    """
+
+    def __init__(self, module):
+        self.module = module
+        self._parsers = dict()
+        self._instances = dict()
+
+    def get_parser(self, command):
+        """Returns the parse method of a command or None"""
+        try:
+            return self._parsers[command]
+        except KeyError:
+            pass
+
+        parser = None
+        words = [] if "|" in command else command.split()
+        while words:
+            entry = COMMAND_PARSERS.get(" ".join(words))
+            if entry:
+                cls, method = entry
+                if cls not in self._instances:
+                    self._instances[cls] = cls(self.module)
+                parser = getattr(self._instances[cls], method)
+                break
+            words.pop()
+
+        self._parsers[command] = parser
+        return parser
+
+    def parse(self, command, output):
+        """Returns the structured output of a command, None if there is
+        no parser for the command. Outputs that were already decoded
+        from JSON are returned as they are.
+        """
+        if not isinstance(output, str):
+            return output
+        parser = self.get_parser(command)
+        if parser is None:
+            return None
+        return parser(output)
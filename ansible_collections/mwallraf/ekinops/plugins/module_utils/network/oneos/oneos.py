@@ -12,6 +12,7 @@ import json
 
 from ansible.module_utils._text import to_text
 from ansible.module_utils.basic import env_fallback
+from ansible.module_utils.six import string_types
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (  # noqa:E501
     to_list,
 )
@@ -80,15 +81,30 @@ def get_defaults_flag(module):
     return to_text(out, errors="surrogate_then_replace").strip()
 
 
-def get_oneos_version(module):
-    if hasattr(module, "oneos_version"):
-        return module.oneos_version
-    try:
-        oneos_version = Connection(module._socket_path).get_oneos_version()
-    except ConnectionError as exc:
-        module.fail_json(msg=to_text(exc, errors="surrogate_then_replace"))
-    module.oneos_version = oneos_version
+def get_oneos_version(module, full=False):
+    """Returns the OneOS major version, or the full version (ex. "6.2.2")
+    that selects the command profile if full is True
+    """
+    if not hasattr(module, "oneos_version"):
+        # the version is part of the capabilities which are fetched only
+        # once per module, older cliconf plugins require a separate rpc
+        # call and do not know the full version
+        capabilities = get_capabilities(module)
+        module.oneos_version = capabilities.get("oneos_version")
+        module.oneos_full_version = capabilities.get("oneos_full_version")
+        if not module.oneos_version:
+            try:
+                connection = get_connection(module)
+                module.oneos_version = connection.get_oneos_version()
+            except ConnectionError as exc:
+                module.fail_json(
+                    msg=to_text(exc, errors="surrogate_then_replace")
+                )
 
+    # the full version is only known if it came with the capabilities
+    full_version = getattr(module, "oneos_full_version", None)
+    if full and isinstance(full_version, string_types):
+        return full_version
     return module.oneos_version
 
 
@@ -100,6 +116,17 @@ def run_commands(module, commands, check_rc=True):
         module.fail_json(msg=to_text(exc))
 
 
+def get_command_timing(module):
+    """Returns the device latency per command of the last run_commands
+    call, an empty list if the cliconf plugin does not keep track of it
+    """
+    connection = get_connection(module)
+    try:
+        return connection.get_command_timing()
+    except ConnectionError:
+        return []
+
+
 def get_config(module, flags=None):
     flags = to_list(flags)
 
@@ -15,17 +15,20 @@ the given network resource.
 """
 
 import re
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.rm_base.network_template import (  # noqa: E501
-    NetworkTemplate,
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.network_template import (  # noqa: E501
+    OneosNetworkTemplate,
 )
 
 
-class Acl_interfacesTemplate(NetworkTemplate):
+class Acl_interfacesTemplate(OneosNetworkTemplate):
     def __init__(self, lines=None, module=None):
         super(Acl_interfacesTemplate, self).__init__(
             lines=lines, tmplt=self, module=module
         )
 
+    # the config sections parsed by the template
+    SECTIONS = ("interface",)
+
     # fmt:off
     PARSERS = [
         {
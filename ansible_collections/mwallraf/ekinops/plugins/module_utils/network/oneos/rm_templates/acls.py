@@ -15,148 +15,118 @@ the given network resource.
 """
 
 import re
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.rm_base.network_template import (
-    NetworkTemplate,
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.network_template import (  # noqa: E501
+    OneosNetworkTemplate,
 )
 
 
-def _tmplt_access_list_entries(aces):
-    def source_destination_common_config(config_data, command, attr):
-        if config_data[attr].get("address"):
-            command += " {address}".format(**config_data[attr])
-            if config_data[attr].get("wildcard_bits"):
-                command += " {wildcard_bits}".format(**config_data[attr])
-        elif config_data[attr].get("any"):
-            command += " 0.0.0.0 255.255.255.255".format(**config_data[attr])
-        elif config_data[attr].get("host"):
-            command += " {host} 0.0.0.0".format(**config_data[attr])
-        if config_data[attr].get("port_protocol"):
-            if config_data[attr].get("port_protocol").get("range"):
-                command += " {0} {1}".format(
-                    config_data[attr]["port_protocol"]["range"].get("start"),
-                    config_data[attr]["port_protocol"]["range"].get("end"),
-                )
-            else:
-                port_proto_type = list(
-                    config_data[attr]["port_protocol"].keys(),
-                )[0]
-                command += " {1}".format(
-                    config_data[attr]["port_protocol"][port_proto_type],
-                )
-        return command
-
-    command = " "
-    proto_option = None
-
-    if aces:
-        # if aces.get("sequence") and aces.get("afi") == "ipv4":
-        #     command += "{sequence}".format(**aces)
-        # if (
-        #     aces.get("grant")
-        #     # and aces.get("sequence")
-        #     and aces.get("afi") == "ipv4"
-        # ):
-        #     command += "{grant}".format(**aces)
-        # elif (
-        #     aces.get("grant")
-        #     # and aces.get("sequence")
-        #     and aces.get("afi") == "ipv6"
-        # ):
-        #     command += "{grant}".format(**aces)
-        # elif aces.get("grant"):
-        #     command += "{grant}".format(**aces)
-
-        if aces.get("grant"):
-            command += "{grant}".format(**aces)
-
-        if aces.get("protocol_options"):
-            command += " {protocol}".format(**aces["protocol_options"])
+def _render_address(config):
+    """Returns the source or destination part of an ACE command"""
+    if config.get("address"):
+        command = " %s" % (config["address"],)
+        if config.get("wildcard_bits"):
+            command += " %s" % (config["wildcard_bits"],)
+    elif config.get("any"):
+        command = " 0.0.0.0 255.255.255.255"
+    elif config.get("host"):
+        command = " %s 0.0.0.0" % (config["host"],)
+    else:
+        command = ""
+
+    port_protocol = config.get("port_protocol")
+    if port_protocol:
+        port_range = port_protocol.get("range")
+        if port_range:
+            command += " %s %s" % (
+                port_range.get("start"),
+                port_range.get("end"),
+            )
+        else:
+            operator = list(port_protocol)[0]
+            command += " %s %s" % (operator, port_protocol[operator])
+    return command
 
-            if "protocol_number" in aces["protocol_options"]:
-                command += " {protocol_number}".format(
-                    **aces["protocol_options"]
-                )
 
-        # if aces.get("protocol_options"):
-        #     if "protocol_number" in aces["protocol_options"]:
-        #         command += " {protocol_number}".format(
-        #             **aces["protocol_options"]
-        #         )
-        #     else:
-        #         command += " {0}".format(list(aces["protocol_options"])[0])
-        #         proto_option = aces["protocol_options"].get(
-        #             list(aces["protocol_options"])[0],
-        #         )
-        # elif aces.get("protocol"):
-        #     command += " {protocol}".format(**aces)
+def _tmplt_access_list_entries(aces):
+    """Returns the command of a single ACE
 
-        if aces.get("source"):
-            command = source_destination_common_config(aces, command, "source")
+    The command is built from a list of parts that is joined once, every
+    attribute of the ACE is looked up only once.
+    """
+    if not aces:
+        return " "
 
-        if aces.get("destination"):
-            command = source_destination_common_config(
-                aces,
-                command,
-                "destination",
-            )
+    parts = [" "]
+    grant = aces.get("grant")
+    if grant:
+        parts.append("%s" % (grant,))
 
-        if aces.get("protocol_options"):
-            icmp_message_type = aces["protocol_options"].get(
-                "icmp_message_type"
-            )
-            icmp_message_code = aces["protocol_options"].get(
-                "icmp_message_code"
-            )
+    protocol_options = aces.get("protocol_options")
+    if protocol_options:
+        parts.append(" %s" % (protocol_options["protocol"],))
+        if "protocol_number" in protocol_options:
+            parts.append(" %s" % (protocol_options["protocol_number"],))
 
-            if icmp_message_type:
-                command += " {}".format(icmp_message_type)
+    if aces.get("source"):
+        parts.append(_render_address(aces["source"]))
 
-            if icmp_message_code:
-                command += " {}".format(icmp_message_code)
+    if aces.get("destination"):
+        parts.append(_render_address(aces["destination"]))
 
-        if aces.get("dscp"):
-            command += " dscp {dscp}".format(**aces)
+    if protocol_options:
+        if protocol_options.get("icmp_message_type"):
+            parts.append(" %s" % (protocol_options["icmp_message_type"],))
+        if protocol_options.get("icmp_message_code"):
+            parts.append(" %s" % (protocol_options["icmp_message_code"],))
 
-        # if isinstance(proto_option, dict):
-        #     command += " {0}".format(
-        #         list(proto_option.keys())[0],
-        #     )
+    if aces.get("dscp"):
+        parts.append(" dscp %s" % (aces["dscp"],))
 
-        if aces.get("log"):
-            command += " log"
-            if aces["log"].get("user_cookie"):
-                command += " {user_cookie}".format(**aces["log"])
+    log = aces.get("log")
+    if log:
+        parts.append(" log")
+        if isinstance(log, dict) and log.get("user_cookie"):
+            parts.append(" %s" % (log["user_cookie"],))
 
-        if aces.get("fragments"):
-            command += " fragments"
+    if aces.get("fragments"):
+        parts.append(" fragments")
 
-        if aces.get("reflexive"):
-            command += " reflexive"
+    if aces.get("reflexive"):
+        parts.append(" reflexive")
 
-        if aces.get("precedence"):
-            command += " precedence {precedence}".format(**aces)
+    if aces.get("precedence"):
+        parts.append(" precedence %s" % (aces["precedence"],))
 
-        if aces.get("sequence"):
-            command += " sequence {sequence}".format(**aces)
+    if aces.get("sequence"):
+        parts.append(" sequence %s" % (aces["sequence"],))
 
-        # if aces.get("log_input"):
-        #     command += " log-input"
-        #     if aces["log_input"].get("user_cookie"):
-        #         command += " {user_cookie}".format(**aces["log_input"])
+    return "".join(parts)
 
-        # if aces.get("option"):
-        #     option_val = list(aces.get("option").keys())[0]
-        #     command += " option {0}".format(option_val)
 
-    return command
+def render_access_list_entries(aces, negate=False):
+    """Returns the commands of a list of ACEs, the same commands as
+    rendering every ACE with the "aces" parser of AclsTemplate
+    """
+    render = _tmplt_access_list_entries
+    if negate:
+        return ["no " + render(ace) for ace in aces]
+    return [render(ace) for ace in aces]
 
 
-class AclsTemplate(NetworkTemplate):
+class AclsTemplate(OneosNetworkTemplate):
     def __init__(self, lines=None, module=None):
         super(AclsTemplate, self).__init__(
             lines=lines, tmplt=self, module=module
         )
 
+    # the config sections parsed by the template
+    SECTIONS = (
+        "ip access",
+        "ipv6 access",
+        "ip-remark access",
+        "ipv6-remark access",
+    )
+
     # fmt: off
     PARSERS = [
         {
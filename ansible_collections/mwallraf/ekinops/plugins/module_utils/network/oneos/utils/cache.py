@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022, 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import re
+import tempfile
+import time
+
+
+class DeviceCache:
+    """Small on-disk cache with one JSON document per host
+
+    Every entry is stored together with the serial number of the device
+    it was collected from, a lookup with a different serial number is
+    treated as a cache miss (ex. when a CPE was swapped but kept its
+    management address).
+
+    Example of a cache file (<path>/<host>.json):
+        {
+            "oneos_version": {
+                "value": 6,
+                "serial_number": "T1914008214019302",
+                "updated_at": 1660643561.3
+            }
+        }
+
+    Usage:
+        >>> cache = DeviceCache("/tmp/oneos", "10.0.0.1")
+        >>> cache.set("oneos_version", 6, serial_number="T1914008214019302")
+        >>> cache.get("oneos_version")
+        6
+        >>> cache.get("oneos_version", serial_number="OTHERSERIAL")
+        >>> cache.get("oneos_version", max_age=0)
+        >>>
+    """
+
+    def __init__(self, path, host):
+        self.path = path
+        self.host = host
+        self.filename = os.path.join(
+            path, "%s.json" % re.sub(r"[^\w\.\-]", "_", str(host))
+        )
+
+    def _load(self):
+        try:
+            with open(self.filename) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _save(self, data):
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+        # write to a temporary file first so that parallel forks never
+        # read a partially written cache file
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.filename)
+
+    def get_entry(self, key):
+        """Returns the raw cache entry (value, serial_number, updated_at)"""
+        return self._load().get(key)
+
+    def get(self, key, serial_number=None, max_age=None):
+        """Returns the cached value or None if it is unknown, if it
+        was collected from a device with another serial number or if it
+        is older than max_age seconds
+        """
+        entry = self.get_entry(key)
+        if not entry:
+            return None
+        cached_serial = entry.get("serial_number")
+        if serial_number and cached_serial and serial_number != cached_serial:
+            return None
+        if max_age is not None:
+            if time.time() - entry.get("updated_at", 0) > max_age:
+                return None
+        return entry.get("value")
+
+    def set(self, key, value, serial_number=None):
+        data = self._load()
+        data[key] = {
+            "value": value,
+            "serial_number": serial_number,
+            "updated_at": time.time(),
+        }
+        try:
+            self._save(data)
+        except (IOError, OSError):
+            # caching is an optimization, never fail on it
+            pass
+
+    def delete(self, key):
+        data = self._load()
+        if data.pop(key, None) is not None:
+            try:
+                self._save(data)
+            except (IOError, OSError):
+                pass
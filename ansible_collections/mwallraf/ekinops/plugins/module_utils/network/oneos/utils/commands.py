@@ -1,3 +1,80 @@
+# OneOS version profiles, indexed by version ("5", "6", "6.5", ...)
+ONEOS_PROFILES = {}
+
+
+class UnsupportedOneosVersion(ValueError):
+    pass
+
+
+# commands that do not change the device state and that can be
+# pipelined in a single write when batching is enabled
+READ_ONLY_COMMANDS = ("show ", "sh ", "ls ", "cat ")
+
+
+def _add_profile(version, cls):
+    # reverse index of CACHEABLE_FACTS: command -> fact group
+    cls.FACT_GROUPS = dict(
+        (cmd, group)
+        for group, commands in cls.CACHEABLE_FACTS.items()
+        for cmd in commands
+    )
+    ONEOS_PROFILES[str(version)] = cls
+    return cls
+
+
+def oneos_profile(version):
+    """Class decorator that registers the commands of a OneOS version"""
+
+    def _register(cls):
+        return _add_profile(version, cls)
+
+    return _register
+
+
+def register_oneos_profile(version, base=None, **attributes):
+    """Registers a profile for a OneOS (minor) version that differs from
+    an existing profile, only the differences have to be provided
+
+    :version: the version of the new profile, ex. "6.5"
+    :base: the version of the profile to extend, by default the major
+           version ("6" for "6.5")
+    :attributes: the profile attributes to change, dict attributes
+                 (ex. COMMANDMAP) are merged with those of the base
+                 profile, other attributes are replaced
+
+    Example:
+        >>> register_oneos_profile(
+        ...     "6.5",
+        ...     COMMANDMAP={"alias-get-hostname": "show hostname"},
+        ... )
+        >>> OneosCommand("6.5.1").get("alias-get-hostname")
+        'show hostname'
+    """
+    version = str(version)
+    base_cls = ONEOS_PROFILES[str(base or version.split(".")[0])]
+    for name, value in attributes.items():
+        if isinstance(value, dict):
+            attributes[name] = dict(getattr(base_cls, name, {}), **value)
+    cls = type(
+        "OneosCommandV" + version.replace(".", "_"), (base_cls,), attributes
+    )
+    return _add_profile(version, cls)
+
+
+def get_oneos_profile(version):
+    """Returns the most specific profile for a version, "6.5.1" returns
+    the "6.5.1", "6.5" or "6" profile, whichever is registered first
+    """
+    parts = str(version).split(".")
+    while parts:
+        profile = ONEOS_PROFILES.get(".".join(parts))
+        if profile:
+            return profile
+        parts.pop()
+    raise UnsupportedOneosVersion("unsupported oneos version: %s" % version)
+
+
+@oneos_profile("5")
 class OneosCommandV5:
 
     # map an alias to a command
@@ -7,6 +84,18 @@ class OneosCommandV5:
         " | include (interface|access)",
         "alias-get-acl-remarks": "sh running-config "
         "| i (ipv6 access-list|ip access-list| remark)",
+        "alias-get-startup-config": "cat /BSA/config/bsaStart.cfg",
+    }
+
+    # local equivalent of the running-config aliases, used to slice a
+    # cached running-config: (top-level sections, include regex)
+    CONFIG_SLICES = {
+        "alias-get-hostname": (None, r"hostname"),
+        "alias-get-interface-acl": (None, r"(interface|access)"),
+        "alias-get-acl-remarks": (
+            None,
+            r"(ipv6 access-list|ip access-list| remark)",
+        ),
     }
 
     # commands used to parse Hardware facts
@@ -21,7 +110,31 @@ class OneosCommandV5:
         "show device status ram",
     ]
 
+    # commands with slowly changing output that may be cached on disk,
+    # grouped per fact group (see the fact_cache_ttl cliconf option)
+    CACHEABLE_FACTS = {
+        "device_info": ["show system hardware"],
+        "boot": [
+            "cat /BSA/bsaBoot.inf",
+            "ls /BSA/binaries",
+            "ls /BSA/config",
+        ],
+    }
+
+    # upload location and commands to apply a config file on the device,
+    # {path} is replaced by the uploaded file, rm asks for a confirmation
+    CONFIG_FILE = {
+        "path": "/BSA/config/ansible-candidate.cfg",
+        "apply": "exec-script {path}",
+        "remove": {
+            "command": "rm {path}",
+            "prompt": r"[\[(][yY](es)?/[nN]o?[\])]",
+            "answer": "y",
+        },
+    }
+
 
+@oneos_profile("6")
 class OneosCommandV6:
 
     # map an alias to a command
@@ -31,6 +144,23 @@ class OneosCommandV6:
         ' | i "(interface|access-group)"',
         "alias-get-acl-remarks": "show running-config ip access-list "
         '| i "(ipv6 access-list|ip access-list| remark)"',
+        "alias-get-acls": "show running-config ip access-list",
+        "alias-get-startup-config": "show startup-config",
+    }
+
+    # local equivalent of the running-config aliases, used to slice a
+    # cached running-config: (top-level sections, include regex)
+    CONFIG_SLICES = {
+        "alias-get-hostname": (["hostname"], None),
+        "alias-get-interface-acl": (
+            ["interface"],
+            r"(interface|access-group)",
+        ),
+        "alias-get-acl-remarks": (
+            ["ip access-list"],
+            r"(ipv6 access-list|ip access-list| remark)",
+        ),
+        "alias-get-acls": (["ip access-list"], None),
     }
 
     # commands used to parse Hardware facts
@@ -43,13 +173,37 @@ class OneosCommandV6:
         "show software-image",
     ]
 
+    # commands with slowly changing output that may be cached on disk,
+    # grouped per fact group (see the fact_cache_ttl cliconf option)
+    CACHEABLE_FACTS = {
+        "device_info": ["show system hardware"],
+        "boot": [
+            "ls -l /BSA/binaries",
+            "ls -l /BSA/config",
+            "show software-image",
+        ],
+    }
+
+    # upload location and commands to apply a config file on the device,
+    # {path} is replaced by the uploaded file, rm asks for a confirmation
+    CONFIG_FILE = {
+        "path": "/BSA/config/ansible-candidate.cfg",
+        "apply": "exec-script {path}",
+        "remove": {
+            "command": "rm {path}",
+            "prompt": r"[\[(][yY](es)?/[nN]o?[\])]",
+            "answer": "y",
+        },
+    }
+
 
 class OneosCommand:
     """Base class for OneOs specific commands
 
-    The base class will determine which child class to generate:
+    The base class will determine which profile to use:
         OneosCommandV5  (for oneos 5)
         OneosCommandV6  (for oneos 6)
+        or a registered minor version profile (see register_oneos_profile)
 
     The purpose of this class is to return the optimal command
     for the given OneOs version.
@@ -74,15 +228,16 @@ class OneosCommand:
         >>>
     """
 
-    __SUPPORTED_VERSIONS__ = ["5", "6"]
-
     def __init__(self, version=None) -> None:
-        if str(version) not in self.__SUPPORTED_VERSIONS__:
-            raise Exception("unsupported oneos version")
+        profile = get_oneos_profile(version)
 
         self.version = str(version)
-        self.commands = self._get_commands()
-        self.facts_hardware_commands = self._get_facts_hardware_commands()
+        self.profile = profile
+        self.commands = profile.COMMANDMAP
+        self.config_slices = profile.CONFIG_SLICES
+        self.cacheable_facts = profile.CACHEABLE_FACTS
+        self.facts_hardware_commands = profile.COMMANDS_HARDWARE_FACTS
+        self.config_file = profile.CONFIG_FILE
 
     def get(self, cmd):
         """If a specific command (or alias) exists for the
@@ -92,16 +247,18 @@ class OneosCommand:
         oneos_cmd = self.commands.get(cmd, None)
         return oneos_cmd
 
+    def get_config_slice(self, cmd):
+        """Returns the (sections, include) filter to apply on the full
+        running-config for a running-config alias or None
+        """
+        return self.config_slices.get(cmd, None)
+
+    def get_fact_group(self, cmd):
+        """Returns the fact group of a cacheable command or None"""
+        return self.profile.FACT_GROUPS.get(cmd, None)
+
     def __repr__(self) -> str:
         return f"<OneosCommandV{self.version}>"
 
     def __str__(self) -> str:
         return f"<OneosCommandV{self.version}>"
-
-    def _get_commands(self):
-        _obj = eval("OneosCommandV" + self.version)
-        return _obj.COMMANDMAP
-
-    def _get_facts_hardware_commands(self):
-        _obj = eval("OneosCommandV" + self.version)
-        return _obj.COMMANDS_HARDWARE_FACTS
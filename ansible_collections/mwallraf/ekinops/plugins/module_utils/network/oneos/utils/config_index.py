@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022, 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+
+from ansible.module_utils._text import to_bytes
+
+# number of indexes kept by get_config_index
+CONFIG_INDEX_CACHE_SIZE = 4
+
+_CONFIG_INDEXES = {}
+
+
+class ConfigIndex:
+    """OneOS config (or show output) split in top-level blocks in a
+    single pass, the blocks are indexed by the first word of their header
+
+    A block is the list of lines of a top-level line (the header) and its
+    indented child lines. Empty lines, comments and exit lines are not
+    part of any block, neither are indented lines before the first
+    top-level line.
+
+    Example:
+        >>> index = ConfigIndex(running_config)
+        >>> index.get_blocks("ip access-list")
+        [['ip access-list standard NAT_ACL', ' permit 10.0.0.0 0.0.0.255'],
+         ...]
+    """
+
+    def __init__(self, config):
+        if isinstance(config, list):
+            lines = config
+        else:
+            lines = config.splitlines()
+
+        self.blocks = list()
+        self.sections = dict()
+
+        block = None
+        for line in lines:
+            stripped = line.strip()
+            if not stripped or stripped == "exit" or stripped[0] == "!":
+                continue
+            if line[0] not in " \t":
+                block = [line]
+                keyword = stripped.split(None, 1)[0].lower()
+                self.sections.setdefault(keyword, []).append(len(self.blocks))
+                self.blocks.append(block)
+            elif block is not None:
+                block.append(line)
+
+    def get_blocks(self, *prefixes):
+        """Returns the blocks of which the header starts with one of the
+        prefixes (case insensitive) in config order
+        """
+        positions = set()
+        for prefix in prefixes:
+            prefix = prefix.lower()
+            for position in self.sections.get(prefix.split(None, 1)[0], ()):
+                if self.blocks[position][0].lower().startswith(prefix):
+                    positions.add(position)
+        return [self.blocks[position] for position in sorted(positions)]
+
+    def get_lines(self, *prefixes):
+        """Returns the lines of the blocks of get_blocks"""
+        return [line for block in self.get_blocks(*prefixes) for line in block]
+
+
+def get_config_index(config):
+    """Returns the ConfigIndex of a config (text or list of lines), the
+    last indexes are kept so that every resource template that parses
+    the same config reuses its index
+    """
+    if isinstance(config, list):
+        config = "\n".join(config)
+    key = hashlib.sha1(
+        to_bytes(config, errors="surrogate_or_strict")
+    ).hexdigest()
+
+    index = _CONFIG_INDEXES.pop(key, None)
+    if index is None:
+        index = ConfigIndex(config)
+    _CONFIG_INDEXES[key] = index
+    while len(_CONFIG_INDEXES) > CONFIG_INDEX_CACHE_SIZE:
+        _CONFIG_INDEXES.pop(next(iter(_CONFIG_INDEXES)))
+    return index
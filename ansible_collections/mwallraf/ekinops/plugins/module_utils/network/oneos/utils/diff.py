@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022, 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+import re
+
+from ansible.module_utils._text import to_bytes
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.config import (  # noqa: E501
+    NetworkConfig,
+)
+
+
+def config_digest(config, ignore_lines=None):
+    """Returns the sha1 hex digest of a config and the ignore_lines
+    that were used to parse it
+    """
+    sha1 = hashlib.sha1(to_bytes(config, errors="surrogate_or_strict"))
+    sha1.update(to_bytes(repr(ignore_lines)))
+    return sha1.hexdigest()
+
+
+def normalized_config_digest(config, ignore_lines=None):
+    """Returns the sha1 hex digest of a config without comments, empty
+    lines and ignore_lines, every line is reduced to its depth and its
+    stripped text so that configs that only differ in layout (ex. the
+    running-config and the startup-config file) have the same digest
+
+    The header of the OneOS 5 running-config is not part of the startup
+    file and is removed first.
+    """
+    config = re.sub(
+        """Building configuration...\n\nCurrent configuration: \n\n""",
+        "",
+        config,
+        flags=re.MULTILINE,
+    )
+    # NetworkConfig adds ignore_lines to the module wide ignore patterns,
+    # they are applied here so that they don't leak into other configs
+    ignore_re = [re.compile(regex) for regex in ignore_lines or []]
+    sha1 = hashlib.sha1()
+    for item in NetworkConfig(indent=1, contents=config).items:
+        if any(regex.match(item.text) for regex in ignore_re):
+            continue
+        sha1.update(
+            to_bytes(
+                "%s %s\n" % (len(item._parents), item.text),
+                errors="surrogate_or_strict",
+            )
+        )
+    return sha1.hexdigest()
+
+
+class RunningConfigIndex:
+    """Running-config indexed by top-level section for fast line diffs
+
+    NetworkConfig.difference(match="line") checks every candidate line
+    with "line not in running.items", which compares the line with every
+    running line. The index keeps the lines (parents + text, the
+    ConfigLine equality) of every top-level section in a set so that the
+    same check is a lookup in the section of the candidate line.
+
+    The index can be passed to NetworkConfig.difference as "other" for
+    match="line", for the other match modes the parsed running-config
+    (self.config) has to be used.
+
+    Example:
+        >>> index = RunningConfigIndex(running)
+        >>> candidate.difference(index, match="line")
+    """
+
+    def __init__(self, config, ignore_lines=None):
+        self.digest = config_digest(config, ignore_lines)
+        self.config = NetworkConfig(
+            indent=1, contents=config, ignore_lines=ignore_lines
+        )
+        self.sections = dict()
+        for item in self.config.items:
+            self.sections.setdefault(self._section(item), set()).add(item.line)
+
+    @staticmethod
+    def _section(item):
+        if item._parents:
+            return item._parents[0].text
+        return item.text
+
+    @property
+    def items(self):
+        # NetworkConfig.difference uses other.items for the line match
+        return self
+
+    def __contains__(self, item):
+        return item.line in self.sections.get(self._section(item), ())
+
+    def __len__(self):
+        return len(self.config)
+
+    def get_block(self, path):
+        return self.config.get_block(path)
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022, 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from copy import deepcopy
+from itertools import chain
+
+from ansible.module_utils.common._collections_compat import Mapping
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.rm_base.network_template import (  # noqa: E501
+    NetworkTemplate,
+)
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (  # noqa: E501
+    dict_merge,
+    sort_list,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.config_index import (  # noqa: E501
+    get_config_index,
+)
+
+
+def merge_parsed(base, other):
+    """dict_merge(base, other) that updates base in place
+
+    dict_merge deep copies base on every call, merging the result of
+    every parsed line into the result of all previous lines that way
+    takes quadratic time. The values of other are not copied, other
+    should not be used afterwards.
+    """
+    for key, item in other.items():
+        if key not in base or item is None:
+            base[key] = item
+            continue
+        value = base[key]
+        if isinstance(value, dict):
+            if isinstance(item, Mapping):
+                merge_parsed(value, item)
+            else:
+                base[key] = item
+        elif isinstance(value, list):
+            try:
+                base[key] = list(set(chain(value, item)))
+            except TypeError:
+                value.extend([i for i in item if i not in value])
+        elif sort_list(value) != sort_list(item):
+            base[key] = item
+    return base
+
+
+class OneosNetworkTemplate(NetworkTemplate):
+    """NetworkTemplate that only parses the top-level sections of the
+    config that the resource owns
+
+    The lines are split in blocks by get_config_index (shared by all
+    templates that parse the same config), only the blocks of which the
+    header starts with one of the SECTIONS are parsed. The header line is
+    matched against all parsers, the child lines only against the
+    parsers that are not "shared" (the shared parsers match the section
+    headers). The parsed lines are merged with merge_parsed.
+
+    All lines are parsed like NetworkTemplate does if SECTIONS is None.
+    """
+
+    # header prefixes of the top-level sections parsed by the template
+    SECTIONS = None
+
+    def parse(self):
+        if self.SECTIONS is None:
+            return super(OneosNetworkTemplate, self).parse()
+
+        child_parsers = [
+            parser
+            for parser in self._tmplt.PARSERS
+            if not parser.get("shared")
+        ]
+
+        result = {}
+        shared = {}
+        index = get_config_index(self._lines)
+        for block in index.get_blocks(*self.SECTIONS):
+            parsers = self._tmplt.PARSERS
+            for line in block:
+                for parser in parsers:
+                    cap = parser["getval"].match(line)
+                    if cap:
+                        capdict = dict(
+                            (k, v)
+                            for k, v in cap.groupdict().items()
+                            if v is not None
+                        )
+                        if parser.get("shared"):
+                            shared = capdict
+                        vals = dict_merge(capdict, shared)
+                        res = self._deepformat(
+                            deepcopy(parser["result"]), vals
+                        )
+                        merge_parsed(result, res)
+                        break
+                parsers = child_parsers
+        return result
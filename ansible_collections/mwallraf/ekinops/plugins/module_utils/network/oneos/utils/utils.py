@@ -4,3 +4,108 @@
 # (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
 # utils
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import re
+
+from ansible.module_utils._text import to_bytes, to_text
+
+
+def parse_oneos_full_version(output):
+    """Returns the OneOS version (ex. "6.2.2") found in the output of
+    "show version" or None
+
+    Example:
+        >>> parse_oneos_full_version("Software version : ONEOS92-V5.2R2E7")
+        '5.2'
+    """
+    match = re.search(r"-V(5(?:\.\d+)*)|-(6(?:\.\d+)*)", output)
+    if match:
+        return match.group(1) or match.group(2)
+    return None
+
+
+def parse_oneos_version(output):
+    """Returns the OneOS major version (5 or 6) found in the output of
+    "show version" or None
+
+    Example:
+        >>> parse_oneos_version("Software version : OneOS-pCPE-ARM_pi1-6.2.2")
+        6
+    """
+    version = parse_oneos_full_version(output)
+    if version:
+        return oneos_major_version(version)
+    return None
+
+
+def oneos_major_version(version):
+    """Returns the major version of a OneOS version as int
+
+    Example:
+        >>> oneos_major_version("6.5.1")
+        6
+    """
+    return int(str(version).split(".")[0])
+
+
+def count_prompts(output, prompt):
+    """Returns the number of lines of the output that start with the
+    prompt of the device
+    """
+    prompt = to_text(prompt, errors="surrogate_or_strict").strip()
+    if not prompt:
+        return 0
+    lines = to_text(output, errors="surrogate_or_strict").splitlines()
+    return sum(1 for line in lines if line.strip().startswith(prompt))
+
+
+def is_terminal_error(output, regexes):
+    """Returns True if the output of a command matches one of the
+    compiled terminal error regexes (bytes patterns)
+    """
+    output = to_bytes(output, errors="surrogate_or_strict")
+    return any(regex.search(output) for regex in regexes)
+
+
+def filter_config(config, sections=None, include=None):
+    """Returns a filtered copy of a running-config, this is the local
+    equivalent of "show running-config <section> | include <regex>"
+
+    :config: the full running-config as text
+    :sections: only keep the top-level blocks that start with one of
+               these keywords (ex. "interface"), the block includes
+               its indented child lines
+    :include: only keep the lines that match this regular expression
+
+    Example:
+        >>> filter_config(config, sections=["interface"],
+        ...               include=r"(interface|access-group)")
+        'interface gigabitethernet 0/0\\n ip access-group WAN in\\n...'
+    """
+    if sections:
+        sections = tuple(sections)
+    include_re = re.compile(include) if include else None
+
+    lines = []
+    in_section = not sections
+    for line in config.splitlines():
+        if sections and line and not line[0].isspace():
+            # a top-level line starts a new block, "exit" closes the
+            # current block and is filtered like any other line
+            if line.rstrip() == "exit":
+                if in_section and (not include_re or include_re.search(line)):
+                    lines.append(line)
+                in_section = False
+                continue
+            in_section = line.startswith(sections)
+        if not in_section:
+            continue
+        if include_re and not include_re.search(line):
+            continue
+        lines.append(line)
+
+    return "\n".join(lines)
@@ -52,6 +52,9 @@ options:
         before it is considered failed. The command is run on the
         target device every retry and evaluated against the
         I(wait_for) conditions.
+      - Only the commands of the conditionals that are not satisfied
+        yet are run again, a conditional on C(result[N]) needs command
+        N, other conditionals need all commands.
     default: 10
   interval:
     description:
@@ -60,6 +63,42 @@ options:
         conditions, the interval indicates how long to wait before
         trying the command again.
     default: 1
+  backoff:
+    description:
+      - The interval is multiplied by I(backoff) after every retry,
+        the default keeps the same interval between all retries.
+    type: float
+    default: 1
+  max_interval:
+    description:
+      - The maximum interval in seconds between two retries when
+        I(backoff) is used.
+    type: float
+  jitter:
+    description:
+      - Randomizes every interval by up to this fraction of the
+        interval, ex. 0.2 waits between 80% and 120% of the interval.
+        Spreads the retries of many devices that wait at the same time.
+    type: float
+    default: 0
+  timeout:
+    description:
+      - The maximum time in seconds to wait for the conditionals,
+        no retries are started after the timeout even if I(retries) is
+        not reached yet.
+    type: float
+  output:
+    description:
+      - With C(structured) the output of known commands is also parsed
+        and returned in I(parsed). Parsed commands are
+        C(show system status), C(show memory), C(show interfaces) and
+        C(show ip access-list), commands with arguments use the parser
+        of the command without the arguments.
+      - C(show ip access-list) is parsed like the gathered facts of
+        M(mwallraf.ekinops.oneos_acls), the match counters and the
+        remarks are not part of the parsed output.
+    default: text
+    choices: ['text', 'structured']
 """
 
 EXAMPLES = """
@@ -90,6 +129,26 @@ tasks:
       wait_for:
         - result[0] contains OneOs
 
+  - name: Get the interfaces and the memory usage as structured data
+    mwallraf.ekinops.oneos_command:
+      commands:
+        - show interfaces
+        - show memory
+      output: structured
+
+  - name: Wait up to 10 minutes for the uplink after a reload
+    mwallraf.ekinops.oneos_command:
+      commands:
+        - show interfaces gigabitethernet 0/0
+      wait_for:
+        - result[0] contains "line protocol is up"
+      retries: 60
+      interval: 5
+      backoff: 1.5
+      max_interval: 60
+      jitter: 0.2
+      timeout: 600
+
   - name: Reboot ONEOS device
     mwallraf.ekinops.oneos_command:
       commands:
@@ -112,6 +171,27 @@ stdout_lines:
   type: list
   sample: [['...', '...'], ['...'], ['...']]
 
+parsed:
+  description:
+    - The parsed output of every command, null for commands without a
+      parser
+  returned: when output is structured
+  type: list
+  sample: [{'mem_free_mb': 812, 'mem_total_mb': 1024, '...': '...'}, null]
+
+wait_for_timing:
+  description:
+    - Per conditional, if it was satisfied, the seconds since the
+      commands were first sent at which it was satisfied (null if not)
+      and the number of times it was evaluated
+  returned: when wait_for is used
+  type: list
+  sample:
+    - conditional: result[0] contains "line protocol is up"
+      satisfied: true
+      seconds: 37.2
+      attempts: 6
+
 failed_conditions:
   description: The list of conditionals that have failed
   returned: failed
@@ -121,6 +201,8 @@ failed_conditions:
 
 __metaclass__ = type
 
+import random  # noqa:E402
+import re  # noqa:E402
 import time  # noqa:E402
 
 from ansible.module_utils._text import to_text  # noqa:E402
@@ -137,6 +219,9 @@ from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.one
     run_commands,
     oneos_argument_spec,
 )
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.facts.legacy.base import (  # noqa:E501,E402
+    CommandParser,
+)
 
 
 def parse_commands(module, warnings):
@@ -156,6 +241,31 @@ def parse_commands(module, warnings):
     return commands
 
 
+def get_conditional_commands(conditional, count):
+    """Returns the indexes of the commands that a conditional needs,
+    all commands unless the conditional starts with result[N]
+    """
+    match = re.match(r"result\[(\d+)\]", conditional.key)
+    if match and int(match.group(1)) < count:
+        return [int(match.group(1))]
+    return list(range(count))
+
+
+def get_retry_interval(module, retry):
+    """Returns the seconds to wait before the retry (1 for the first
+    retry), with backoff and jitter
+    """
+    interval = module.params["interval"] * module.params["backoff"] ** (
+        retry - 1
+    )
+    if module.params["max_interval"] is not None:
+        interval = min(interval, module.params["max_interval"])
+    jitter = module.params["jitter"]
+    if jitter:
+        interval *= 1 + random.uniform(-jitter, jitter)
+    return max(interval, 0)
+
+
 def main():
     """main entry point for module execution"""
     argument_spec = dict(
@@ -164,6 +274,11 @@ def main():
         match=dict(default="all", choices=["all", "any"]),
         retries=dict(default=10, type="int"),
         interval=dict(default=1, type="int"),
+        backoff=dict(default=1, type="float"),
+        max_interval=dict(type="float"),
+        jitter=dict(default=0, type="float"),
+        timeout=dict(type="float"),
+        output=dict(default="text", choices=["text", "structured"]),
     )
 
     argument_spec.update(oneos_argument_spec)
@@ -183,34 +298,80 @@ def main():
         module.fail_json(msg=to_text(exc))
 
     retries = module.params["retries"]
-    interval = module.params["interval"]
     match = module.params["match"]
+    timeout = module.params["timeout"]
 
-    while retries > 0:
-        responses = run_commands(module, commands)
+    needs = dict(
+        (item, get_conditional_commands(item, len(commands)))
+        for item in conditionals
+    )
+    timing = [
+        dict(conditional=item.raw, satisfied=False, seconds=None, attempts=0)
+        for item in conditionals
+    ]
+    timing_of = dict(zip(conditionals, timing))
+
+    start = time.time()
+    responses = [None] * len(commands)
+    pending = list(range(len(commands)))
+    attempt = 0
+    while True:
+        attempt += 1
+        outputs = run_commands(module, [commands[idx] for idx in pending])
+        for idx, output in zip(pending, outputs):
+            responses[idx] = output
+        elapsed = round(time.time() - start, 4)
 
         for item in list(conditionals):
+            timing_of[item]["attempts"] += 1
             if item(responses):
+                timing_of[item].update(satisfied=True, seconds=elapsed)
                 if match == "any":
                     conditionals = list()
                     break
                 conditionals.remove(item)
 
-        if not conditionals:
+        if not conditionals or attempt >= retries:
             break
 
+        interval = get_retry_interval(module, attempt)
+        if timeout is not None:
+            remaining = start + timeout - time.time()
+            if remaining <= 0:
+                break
+            interval = min(interval, remaining)
         time.sleep(interval)
-        retries -= 1
+
+        # only the commands of the unsatisfied conditionals run again
+        pending = sorted(
+            set(idx for item in conditionals for idx in needs[item])
+        )
+
+    if timing:
+        result["wait_for_timing"] = timing
 
     if conditionals:
         failed_conditions = [item.raw for item in conditionals]
         msg = "One or more conditional statements have not been satisfied"
-        module.fail_json(msg=msg, failed_conditions=failed_conditions)
+        module.fail_json(
+            msg=msg,
+            failed_conditions=failed_conditions,
+            wait_for_timing=timing,
+        )
 
     result.update(
         {"stdout": responses, "stdout_lines": list(to_lines(responses))}
     )
 
+    if module.params["output"] == "structured":
+        parser = CommandParser(module)
+        result["parsed"] = [
+            parser.parse(
+                item["command"] if isinstance(item, dict) else item, response
+            )
+            for item, response in zip(commands, responses)
+        ]
+
     module.exit_json(**result)
 
 
@@ -103,6 +103,33 @@ options:
       character.  This only applies to the configuration action.
     default: '@'
     type: str
+  chunk_size:
+    description:
+    - Send the configuration lines to the device in chunks of at most
+      I(chunk_size) lines in a single write instead of waiting for the
+      prompt after every line, this speeds up large changes on slow links.
+    - The output of every line is checked for errors after the chunk has
+      been sent, all failing lines of the chunk are reported. The device
+      keeps processing the lines that follow a failing line in the same
+      chunk.
+    - When not set or lower than 2 every line is sent one by one.
+    type: int
+  file_apply_threshold:
+    description:
+    - When the number of configuration lines to send is higher than
+      I(file_apply_threshold), the lines are uploaded as a file to
+      C(/BSA/config) over the existing SSH connection (scp, see the
+      C(ansible_oneos_config_file_proto) variable) and applied on the
+      device with a single command instead of being sent line by line.
+    - The file is removed after it has been applied. Errors are parsed
+      from the output of the apply command and returned per line in
+      I(errors).
+    - The device has to allow scp or sftp for the connection user, the
+      apply command must finish within the connection
+      C(command_timeout).
+    - This is opt-in, when not set the lines are always sent line by line
+      or in chunks, see I(chunk_size).
+    type: int
   backup:
     description:
     - This argument will cause the module to create a full backup of the
@@ -327,6 +354,20 @@ commands:
   returned: always
   type: list
   sample: ['hostname foo', 'router ospf 1', 'router-id 192.0.2.1']
+errors:
+  description: The configuration lines that failed when the configuration
+               was applied as a file, see I(file_apply_threshold)
+  returned: when the file apply failed
+  type: list
+  sample: [{"line": 2, "command": " ip address 10.0.0.300 255.255.255.0",
+            "error": "% Syntax error: invalid ip address"}]
+applied:
+  description: The configuration lines that were applied without error
+               when the file apply failed, the device keeps applying the
+               lines that follow a failing line
+  returned: when the file apply failed
+  type: list
+  sample: ['interface gigabitethernet 0/1', 'description uplink']
 backup_path:
   description: The full path to the backup file
   returned: when backup is yes
@@ -382,8 +423,31 @@ def check_args(module, warnings):
             )
 
 
-def edit_config(connection, commands):
-    connection.edit_config(candidate=commands)
+def edit_config(connection, commands, chunk_size=None):
+    if chunk_size and chunk_size > 1:
+        connection.edit_config(candidate=commands, chunk_size=chunk_size)
+    else:
+        connection.edit_config(candidate=commands)
+
+
+def apply_config_file(module, connection, commands):
+    response = connection.apply_config_file(candidate=commands)
+    if response["errors"]:
+        # the device keeps applying the lines after a failing line, the
+        # running-config has been changed by the lines without error
+        failed = set(error.get("line") for error in response["errors"])
+        module.fail_json(
+            msg="configuration failed on %s line(s)"
+            % len(response["errors"]),
+            errors=response["errors"],
+            commands=commands,
+            applied=[
+                line
+                for idx, line in enumerate(response["request"], 1)
+                if idx not in failed
+            ],
+            changed=True,
+        )
 
 
 def get_candidate_config(module):
@@ -433,6 +497,8 @@ def main():
         ),
         replace=dict(default="line", choices=["line", "block"]),
         multiline_delimiter=dict(default="@"),
+        chunk_size=dict(type="int"),
+        file_apply_threshold=dict(type="int"),
         running_config=dict(aliases=["config"]),
         intended_config=dict(),
         defaults=dict(type="bool", default=False),
@@ -514,8 +580,13 @@ def main():
             # send the configuration commands to the device and merge
             # them with the current running config
             if not module.check_mode:
-                if commands:
-                    edit_config(connection, commands)
+                threshold = module.params["file_apply_threshold"]
+                if threshold and len(commands) > threshold:
+                    apply_config_file(module, connection, commands)
+                elif commands:
+                    edit_config(
+                        connection, commands, module.params["chunk_size"]
+                    )
                 # if banner_diff:
                 #     connection.edit_banner(
                 #         candidate=json.dumps(banner_diff),
@@ -529,19 +600,20 @@ def main():
     # startup_config = None
     if module.params["save_when"] == "always":
         save_config(module, result)
-    # TODO: this needs to work for oneos 5 + 6
-    # elif module.params["save_when"] == "modified":
-    #     output = run_commands(
-    #         module, ["show running-config", "show startup-config"]
-    #     )
-    #     running_config = NetworkConfig(
-    #         indent=1, contents=output[0], ignore_lines=diff_ignore_lines
-    #     )
-    #     startup_config = NetworkConfig(
-    #         indent=1, contents=output[1], ignore_lines=diff_ignore_lines
-    #     )
-    #     if running_config.sha1 != startup_config.sha1:
-    #         save_config(module, result)
+    elif module.params["save_when"] == "modified":
+        # normalized sha1 digests, the startup digest is cached by the
+        # connection until the next write mem
+        try:
+            running_digest = connection.get_config_digest(
+                source="running", diff_ignore_lines=diff_ignore_lines
+            )
+            startup_digest = connection.get_config_digest(
+                source="startup", diff_ignore_lines=diff_ignore_lines
+            )
+        except ConnectionError as exc:
+            module.fail_json(msg=to_text(exc, errors="surrogate_then_replace"))
+        if running_digest != startup_digest:
+            save_config(module, result)
     elif module.params["save_when"] == "changed" and result["changed"]:
         save_config(module, result)
 
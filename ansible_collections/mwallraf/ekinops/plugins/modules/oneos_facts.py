@@ -28,12 +28,17 @@ options:
     description:
       - When supplied, this argument will restrict the facts collected
         to a given subset. Possible values for this argument include
-        all, min, hardware, config, legacy, and interfaces. Can specify a
-        list of values to include a larger subset. Values can also be used
-        with an initial C(M(!)) to specify that a specific subset should
-        not be collected.
+        all, min, hardware, config, legacy, interfaces and acl_counters.
+        Can specify a list of values to include a larger subset. Values
+        can also be used with an initial C(M(!)) to specify that a
+        specific subset should not be collected.
+      - The C(acl_counters) subset only returns the match counters of the
+        access-list entries of C(show ip access-list) in
+        C(ansible_net_acl_counters), as parallel lists C(acls),
+        C(sequences) and C(matches). It is cheap enough to be polled
+        regularly.
     required: false
-    default: 'all'
+    default: ['!config', '!acl_counters']
     version_added: "2.2"
   gather_network_resources:
     description:
@@ -45,6 +50,26 @@ options:
         specific subset should not be collected.
     required: false
     version_added: "2.9"
+  gather_timing:
+    description:
+      - When set the time spent on each legacy fact subset and the device
+        latency of every command are returned in the
+        C(ansible_net_gather_timing) fact, this can be used to find out
+        which subset slows down the fact collection.
+    type: bool
+    required: false
+    default: false
+  interfaces_filter:
+    description:
+      - Restricts the C(interfaces) legacy subset to the listed interfaces.
+        Values are interface names or glob patterns, names are compared
+        case insensitive.
+      - When only names are given each interface is fetched separately
+        with C(show interfaces <name>), otherwise the full output is
+        fetched and only the matching interfaces are parsed.
+    type: list
+    elements: str
+    required: false
 """
 
 EXAMPLES = """
@@ -70,6 +95,20 @@ EXAMPLES = """
 - oneos_facts:
     gather_subset: min
     gather_network_resources: hostname
+
+- oneos_facts:
+    gather_subset: hardware
+    gather_timing: true
+
+# Poll the access-list match counters only
+- oneos_facts:
+    gather_subset: acl_counters
+
+- oneos_facts:
+    gather_subset: interfaces
+    interfaces_filter:
+      - GigabitEthernet 0/0
+      - Cellular*
 """
 
 RETURN = """
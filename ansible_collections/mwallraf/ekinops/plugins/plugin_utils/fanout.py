@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022, 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Runs read-only OneOS commands on many hosts from a single process, every
+host gets its own SSH session from a bounded pool of worker threads.
+
+Usage:
+    >>> for result in fan_out(["10.0.0.1", "10.0.0.2"], ["show version"],
+    ...                       username="admin", password="secret"):
+    ...     print(result["host"], result["failed"])
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import socket
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ansible.module_utils._text import to_bytes, to_text
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.commands import (  # noqa: E501
+    ONEOS_PROFILES,
+    READ_ONLY_COMMANDS,
+    OneosCommand,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.utils import (  # noqa: E501
+    oneos_major_version,
+    parse_oneos_full_version,
+)
+from ansible_collections.mwallraf.ekinops.plugins.terminal.oneos import (
+    TerminalModule,
+)
+
+try:
+    import paramiko
+
+    HAS_PARAMIKO = True
+except ImportError:
+    HAS_PARAMIKO = False
+
+
+class FanoutError(Exception):
+    pass
+
+
+class OneosSshSession:
+    """Interactive SSH session to a single OneOS device
+
+    The prompt and error detection use the regexes of the oneos terminal
+    plugin, aliases are translated with OneosCommand.
+    """
+
+    def __init__(
+        self,
+        host,
+        port=22,
+        username=None,
+        password=None,
+        key_filename=None,
+        timeout=30,
+        oneos_version=None,
+        host_key_checking=True,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.key_filename = key_filename
+        self.timeout = timeout
+        self.oneos_version = oneos_version
+        self.host_key_checking = host_key_checking
+        self.oneos_command_map = None
+        self._client = None
+        self._shell = None
+        self._deadline = None
+
+    def open(self):
+        if not HAS_PARAMIKO:
+            raise FanoutError("paramiko is required for the oneos fan-out")
+
+        self._deadline = time.time() + self.timeout
+        self._client = paramiko.SSHClient()
+        if self.host_key_checking:
+            self._client.load_system_host_keys()
+            self._client.set_missing_host_key_policy(paramiko.RejectPolicy())
+        else:
+            self._client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        self._client.connect(
+            self.host,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            key_filename=self.key_filename,
+            timeout=self.timeout,
+            look_for_keys=not self.password,
+            allow_agent=not self.password,
+        )
+        self._shell = self._client.invoke_shell(width=512)
+        self.receive()
+
+        self.send_command("term len 0", check_rc=False)
+        if not self.oneos_version:
+            output = self.send_command("show version")
+            self.oneos_version = parse_oneos_full_version(output)
+        self.oneos_command_map = OneosCommand(self.oneos_version)
+
+    def close(self):
+        if self._client:
+            self._client.close()
+        self._client = self._shell = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def receive(self):
+        """Reads from the shell until a prompt is found at the end of
+        the received data, every read waits at most until the deadline
+        of the session
+        """
+        buffer = b""
+        while True:
+            remaining = self._deadline - time.time()
+            if remaining <= 0:
+                raise FanoutError("timeout waiting for the prompt")
+            self._shell.settimeout(remaining)
+            try:
+                data = self._shell.recv(4096)
+            except socket.timeout:
+                raise FanoutError("timeout waiting for the prompt")
+            if not data:
+                raise FanoutError("connection closed by the device")
+            buffer += data
+            for regex in TerminalModule.terminal_stdout_re:
+                if regex.search(buffer[-256:]):
+                    return buffer
+
+    def send_command(self, command, check_rc=True):
+        """Sends a command and returns its output without the echoed
+        command and the prompt
+        """
+        if self.oneos_command_map:
+            command = self.oneos_command_map.get(command) or command
+        self._shell.sendall(to_bytes(command) + b"\r")
+        output = self.receive()
+
+        if check_rc:
+            for regex in TerminalModule.terminal_stderr_re:
+                if regex.search(output):
+                    raise FanoutError(to_text(output))
+
+        lines = to_text(output, errors="surrogate_or_strict").splitlines()
+        return "\n".join(lines[1:-1]).strip()
+
+
+def is_read_only(command):
+    """Returns True for a single read-only command, a line break would
+    send a second command to the device
+    """
+    if "\r" in command or "\n" in command:
+        return False
+    return command.strip().startswith(READ_ONLY_COMMANDS)
+
+
+def check_read_only(commands, oneos_version=None):
+    """Raises FanoutError if a command is not read-only, aliases are
+    checked for the OneOS version or every known version if not set
+    """
+    if oneos_version:
+        command_maps = [OneosCommand(oneos_version)]
+    else:
+        command_maps = [OneosCommand(v) for v in sorted(ONEOS_PROFILES)]
+    for command in commands:
+        for command_map in command_maps:
+            translated = command_map.get(command) or command
+            if not is_read_only(translated):
+                raise FanoutError(
+                    "only read-only commands are allowed: %s" % translated
+                )
+
+
+def run_host(host, commands, session_class=OneosSshSession, **kwargs):
+    """Runs the commands on a single host and returns the result, errors
+    are reported in the result instead of being raised
+    """
+    result = {"host": host, "failed": False, "stdout": []}
+    start = time.time()
+    try:
+        # before the session is opened, the version may be detected later
+        check_read_only(commands, kwargs.get("oneos_version"))
+        with session_class(host, **kwargs) as session:
+            for command in commands:
+                command = session.oneos_command_map.get(command) or command
+                result["stdout"].append(session.send_command(command))
+            result["oneos_version"] = oneos_major_version(
+                session.oneos_version
+            )
+    except Exception as e:
+        result["failed"] = True
+        result["msg"] = to_text(e)
+    result["elapsed"] = round(time.time() - start, 3)
+    return result
+
+
+def fan_out(hosts, commands, concurrency=20, **kwargs):
+    """Runs the commands on all hosts with at most concurrency sessions
+    at the same time, results are yielded as soon as a host is done
+
+    :hosts: list of hostnames or ip addresses
+    :commands: list of read-only commands or aliases
+    :concurrency: number of worker threads
+    :kwargs: passed to run_host (session_class) and the session
+             (port, username, password, timeout, ...)
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(run_host, host, commands, **kwargs)
+            for host in hosts
+        ]
+        for future in as_completed(futures):
+            yield future.result()
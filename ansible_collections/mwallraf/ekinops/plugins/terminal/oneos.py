@@ -27,33 +27,135 @@ from ansible.errors import AnsibleConnectionFailure
 from ansible.module_utils._text import to_text, to_bytes
 from ansible.plugins.terminal import TerminalBase
 from ansible.utils.display import Display
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.utils import (  # noqa: E501
+    count_prompts,
+    is_terminal_error,
+    oneos_major_version,
+)
 
 display = Display()
 
 
+class TailRegex(object):
+    """Compiled regex anchored with $ that only searches the last line of
+    the data, within the last window bytes
+
+    With the libssh transport netcommon searches the terminal regexes in
+    the complete response after every received chunk, which gets slow
+    for outputs of several MB. The prompt of OneOS is always on the last
+    line of a response.
+    """
+
+    def __init__(self, pattern, flags=0, window=1024):
+        self.regex = re.compile(pattern, flags)
+        self.pattern = self.regex.pattern
+        self.flags = self.regex.flags
+        self.window = window
+
+    def search(self, data):
+        end = len(data)
+        start = max(end - self.window, 0)
+        # $ also matches before a trailing newline
+        line = data.rfind(b"\n", start, end - 1)
+        if line >= 0:
+            start = line
+        return self.regex.search(data, start)
+
+
 class TerminalModule(TerminalBase):
 
     terminal_stdout_re = [
-        re.compile(rb"[\r\n]?[\w\+\-\.:\/\[\]]+(?:\([^\)]+\)){0,3}(?:[>#]) ?$")
+        TailRegex(rb"[\r\n]?[\w\+\-\.:\/\[\]]+(?:\([^\)]+\)){0,3}(?:[>#]) ?$")
     ]
 
+    # the error can be followed by more output than any window in the
+    # same chunk, the literal patterns are cheap to search completely
     terminal_stderr_re = [
         re.compile(rb"Error: Invalid command"),
-        re.compile(rb" +^$"),
         re.compile(rb"Syntax error:"),
-        re.compile(rb"-+^$"),
     ]
 
+    # signatures of the OneOS version in the login banner, the software
+    # version is often part of the banner
+    terminal_version_re = {
+        5: re.compile(rb"ONEOS\w*-\S*V5\.\d", re.I),
+        6: re.compile(rb"ONEOS-\S+-6\.\d", re.I),
+    }
+
+    # the command that sets the terminal width per OneOS version
+    terminal_width_commands = {
+        6: b"screen-width 512",
+        5: b"stty columns 255",
+    }
+
+    def __init__(self, *args, **kwargs):
+        super(TerminalModule, self).__init__(*args, **kwargs)
+        # version found by probing the terminal width commands, reused
+        # when the persistent connection reconnects
+        self._oneos_version = None
+
+    def get_oneos_version(self):
+        """Returns the OneOS version if it is known without sending a
+        command: from the ansible_oneos_version variable or the version
+        cache of the cliconf plugin, from the login banner or from an
+        earlier connection to the device. Returns None otherwise.
+        """
+        cliconf = getattr(self._connection, "cliconf", None)
+        if cliconf is not None:
+            try:
+                version = oneos_major_version(
+                    cliconf.get_known_oneos_version()
+                )
+            except ValueError:
+                # unknown (None) or not a OneOS version
+                version = None
+            if version in self.terminal_width_commands:
+                return version
+
+        banner = getattr(self._connection, "_last_response", None)
+        if banner:
+            for version, regex in self.terminal_version_re.items():
+                if regex.search(banner):
+                    return version
+
+        return self._oneos_version
+
     def on_open_shell(self):
+        version = self.get_oneos_version()
+        width_command = self.terminal_width_commands.get(version)
+
+        if width_command and self._batch_setup():
+            try:
+                self._exec_cli_batch([b"term len 0", width_command])
+                return
+            except AnsibleConnectionFailure:
+                display.vvvv("batched terminal setup failed, retrying")
 
         try:
             self._exec_cli_command(b"term len 0")
         except AnsibleConnectionFailure:
             raise AnsibleConnectionFailure("unable to set terminal parameters")
 
+        if width_command:
+            try:
+                self._exec_cli_command(width_command)
+                return
+            except AnsibleConnectionFailure:
+                display.display(
+                    "WARNING: Unable to set terminal width for ONEOS%s, "
+                    "trying all versions" % version
+                )
+
+        self._probe_terminal_width()
+
+    def _probe_terminal_width(self):
+        """Tries the terminal width command of every version, the version
+        that accepts it is remembered for the next connection
+        """
         try:
             # ONEOS6
-            self._exec_cli_command(b"screen-width 512")
+            self._exec_cli_command(self.terminal_width_commands[6])
+            self._oneos_version = 6
             return
         except AnsibleConnectionFailure:
             display.display(
@@ -63,13 +165,59 @@ class TerminalModule(TerminalBase):
 
         try:
             # ONEOS5
-            self._exec_cli_command(b"stty columns 255")
+            self._exec_cli_command(self.terminal_width_commands[5])
+            self._oneos_version = 5
         except AnsibleConnectionFailure:
             display.display(
                 "WARNING: Unable to set terminal width, command responses "
                 "may be truncated"
             )
 
+    def _batch_setup(self):
+        """The terminal setup commands are sent in one write if the
+        batch_commands option of the cliconf plugin is enabled
+        """
+        cliconf = getattr(self._connection, "cliconf", None)
+        if cliconf is None:
+            return False
+        return bool(cliconf.batch_commands)
+
+    def _exec_cli_batch(self, commands):
+        """Sends the commands in a single write and waits for the prompt
+        of every command, raises AnsibleConnectionFailure if one of the
+        commands fails
+        """
+        cliconf = self._connection.cliconf
+        texts = [to_text(cmd) for cmd in commands]
+        output = to_text(
+            self._connection.send(
+                command=b"\r".join(commands), strip_prompt=False
+            )
+        )
+        outputs = cliconf.split_batch_output(output, texts)
+        # every receive waits for one more prompt, there is nothing left
+        # to wait for once the prompt of every command was received
+        while len(outputs) < len(commands):
+            prompts = count_prompts(output, self._connection.get_prompt())
+            if prompts >= len(commands):
+                break
+            received = len(outputs)
+            # the received output ends with a prompt, the next command is
+            # echoed right after it
+            more = self._connection.receive(strip_prompt=False)
+            output += to_text(more)
+            outputs = cliconf.split_batch_output(output, texts)
+            if len(outputs) == received:
+                break
+        if len(outputs) < len(commands):
+            raise AnsibleConnectionFailure(
+                "missing output of the terminal setup commands"
+            )
+        for out in outputs:
+            if is_terminal_error(out, self.terminal_stderr_re):
+                raise AnsibleConnectionFailure(out)
+        return outputs
+
     def on_become(self, passwd=None):
         if self._get_prompt().endswith(b"#"):
             return
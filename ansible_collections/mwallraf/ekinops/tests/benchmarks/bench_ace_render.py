@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Compares the rendering of the ACE commands of a large ACL:
+  - legacy   : string concatenation with str.format per attribute
+  - template : AclsTemplate.render per ACE (addcmd)
+  - batch    : render_access_list_entries for all ACEs at once (as used
+               by the acls module)
+
+Usage (from the root of the repository):
+    python -m \\
+    ansible_collections.mwallraf.ekinops.tests.benchmarks.bench_ace_render
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import time
+
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.rm_templates.acls import (  # noqa:E501
+    AclsTemplate,
+    render_access_list_entries,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.helpers import (  # noqa:E501
+    legacy_tmplt_access_list_entries,
+    synthetic_aces,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--aces", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    aces = synthetic_aces(args.aces)
+    template = AclsTemplate()
+
+    print("render %s ACEs" % len(aces))
+    baseline = None
+    for name, func in (
+        (
+            "legacy",
+            lambda: [legacy_tmplt_access_list_entries(a) for a in aces],
+        ),
+        ("template", lambda: [template.render(a, "aces") for a in aces]),
+        ("batch", lambda: render_access_list_entries(aces)),
+    ):
+        start = time.time()
+        for _ in range(args.rounds):
+            func()
+        elapsed = (time.time() - start) / args.rounds
+        baseline = baseline or elapsed
+        print(
+            "  %-9s: %8.2f ms (x%.2f)"
+            % (name, elapsed * 1000, baseline / elapsed)
+        )
+
+
+if __name__ == "__main__":
+    main()
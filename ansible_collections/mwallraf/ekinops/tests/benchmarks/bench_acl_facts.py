@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Compares the preparation of the acls facts data (get_acl_data followed by
+sanitize_data) of a large ACL dump:
+  - legacy : two outputs, two re.sub calls per remark line and string
+             concatenation in sanitize_data
+  - oneos5 : two outputs, remarks tagged in a single regex pass
+  - oneos6 : a single running-config section split in ACLs and remarks
+
+Usage (from the root of the repository):
+    python -m \\
+    ansible_collections.mwallraf.ekinops.tests.benchmarks.bench_acl_facts
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import time
+import tracemalloc
+
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.facts.acls.acls import (  # noqa:E501
+    AclsFacts,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.compat.mock import (
+    MagicMock,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.helpers import (  # noqa:E501
+    legacy_acl_outputs,
+    legacy_get_acl_data,
+    legacy_sanitize_data,
+    synthetic_acl_config,
+)
+
+
+def get_facts(oneos_version, outputs, source="show"):
+    module = MagicMock()
+    module.oneos_version = oneos_version
+    module._oneos_capabilities = {"acl_facts_source": source}
+    connection = MagicMock()
+    connection.get.side_effect = lambda command: outputs[command]
+    facts = AclsFacts(module)
+    return lambda: facts.sanitize_data(facts.get_acl_data(connection))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--acls", type=int, default=50)
+    parser.add_argument("--aces", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    config = synthetic_acl_config(args.acls, args.aces)
+    show, remarks = legacy_acl_outputs(config)
+    outputs = {
+        "show ip access-list": show,
+        "alias-get-acl-remarks": remarks,
+        "alias-get-acls": config,
+    }
+
+    print(
+        "%s running-config lines, %s show + remarks lines"
+        % (config.count("\n") + 1, show.count("\n") + remarks.count("\n") + 2)
+    )
+    baseline = None
+    for name, func in (
+        (
+            "legacy",
+            lambda: legacy_sanitize_data(legacy_get_acl_data(show, remarks)),
+        ),
+        ("oneos5", get_facts(5, outputs)),
+        ("oneos6", get_facts(6, outputs, "running-config")),
+    ):
+        start = time.time()
+        for _ in range(args.rounds):
+            func()
+        elapsed = (time.time() - start) / args.rounds
+
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        baseline = baseline or elapsed
+        print(
+            "  %-7s: %8.2f ms (x%.2f), peak %6.2f MB"
+            % (name, elapsed * 1000, baseline / elapsed, peak / 1024.0**2)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Compares the cliconf get_diff on a large synthetic running-config:
+  - legacy  : running-config parsed and scanned linearly on every call
+  - indexed : RunningConfigIndex, first call (parse + index)
+  - cached  : RunningConfigIndex, next calls with the same running-config
+
+Usage (from the root of the repository):
+    python -m \\
+    ansible_collections.mwallraf.ekinops.tests.benchmarks.bench_get_diff
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import time
+
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.helpers import (  # noqa:E501
+    FakeConnection,
+    get_cliconf,
+    legacy_get_diff,
+    synthetic_running_config,
+)
+
+
+def candidate_config(oneos_version, lines):
+    """Returns a candidate config that changes the description of some
+    interfaces
+    """
+    intf = "GigabitEthernet" if oneos_version == 5 else "gigabitethernet"
+    candidate = list()
+    for idx in range(lines // 3):
+        slot, port = divmod(idx * 7, 16)
+        candidate += [
+            "interface %s %s/%s" % (intf, slot, port),
+            " description changed %s" % idx,
+            "exit",
+        ]
+    return "\n".join(candidate)
+
+
+def timed(func, rounds):
+    start = time.time()
+    for _ in range(rounds):
+        func()
+    return (time.time() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--interfaces", type=int, default=5000)
+    parser.add_argument("--candidate-lines", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    for oneos_version in (5, 6):
+        running = synthetic_running_config(oneos_version, args.interfaces)
+        candidate = candidate_config(oneos_version, args.candidate_lines)
+        print(
+            "OneOS %s, %s running-config lines, %s candidate lines"
+            % (
+                oneos_version,
+                running.count("\n") + 1,
+                candidate.count("\n") + 1,
+            )
+        )
+
+        def legacy():
+            legacy_get_diff(candidate, running, "line", "line")
+
+        def indexed():
+            cliconf = get_cliconf(
+                FakeConnection(), oneos_version=str(oneos_version)
+            )
+            cliconf.get_diff(candidate, running)
+
+        cliconf = get_cliconf(
+            FakeConnection(), oneos_version=str(oneos_version)
+        )
+        cliconf.get_diff(candidate, running)
+
+        def cached():
+            cliconf.get_diff(candidate, running)
+
+        baseline = None
+        for name, func in (
+            ("legacy", legacy),
+            ("indexed", indexed),
+            ("cached", cached),
+        ):
+            elapsed = timed(func, args.rounds)
+            baseline = baseline or elapsed
+            print(
+                "  %-8s: %9.2f ms (x%.2f)"
+                % (name, elapsed * 1000, baseline / elapsed)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Compares the interface fact parsers on a synthetic show interfaces
+output:
+  - legacy      : one re.search with a raw pattern string per field
+  - precompiled : one compiled pattern per field (parse_* functions)
+  - single pass : one combined pattern per block (parse_interface_block)
+
+and the complete Interfaces fact population:
+  - blocks      : split in a dict of blocks by string concatenation
+  - streaming   : StreamingInterfaces, one interface at a time
+
+Usage (from the root of the repository):
+    python -m \\
+    ansible_collections.mwallraf.ekinops.tests.benchmarks.bench_interface_facts
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import re
+import time
+
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.facts.legacy.base import (  # noqa:E501
+    PATTERNS,
+    Interfaces,
+    StreamingInterfaces,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.compat.mock import (
+    MagicMock,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.base import (  # noqa:E501
+    load_fixture,
+)
+
+FIELDS = [
+    "description",
+    "macaddress",
+    "mtu",
+    "bandwidth",
+    "mediatype",
+    "duplex",
+    "speed",
+    "lineprotocol",
+    "operstatus",
+    "type",
+    "vrf",
+    "flags",
+]
+
+
+def show_interfaces(count):
+    """Returns a show interfaces output with (about) count interfaces,
+    based on the oneos6 fixture which has 5 interfaces
+    """
+    fixture = load_fixture("command_show_interfaces", 6)
+    blocks = list()
+    for idx in range(count // 5):
+        blocks.append(
+            fixture.replace(" 0/", " %s/" % (idx * 2))
+            .replace(" 1/", " %s/" % (idx * 2 + 1))
+            .replace("Loopback 1", "Loopback %s" % idx)
+            .replace("Null 0", "Null %s" % idx)
+        )
+    return "".join(blocks)
+
+
+def _legacy_search(field, block, convert=None):
+    """parse_* as it was before the pattern registry, the pattern is
+    looked up in the re module cache on every call
+    """
+    pattern = PATTERNS[field]
+    match = re.search(pattern.pattern, block, pattern.flags)
+    if match:
+        return convert(match.group(1)) if convert else match.group(1)
+
+
+def legacy(interfaces, block):
+    return dict(
+        description=_legacy_search("description", block),
+        macaddress=_legacy_search("macaddress", block),
+        mtu=_legacy_search("mtu", block, int),
+        bandwidth=_legacy_search("bandwidth", block, int),
+        mediatype=_legacy_search("mediatype", block),
+        duplex=_legacy_search("duplex", block),
+        speed=_legacy_search("speed", block, int),
+        lineprotocol=_legacy_search("lineprotocol", block),
+        operstatus=_legacy_search("operstatus", block),
+        type=_legacy_search("type", block),
+        vrf=_legacy_search("vrf", block),
+        flags=_legacy_search("flags", block, lambda f: f.split(" ")),
+    )
+
+
+def precompiled(interfaces, block):
+    return dict(
+        (field, getattr(interfaces, "parse_" + field)(block))
+        for field in FIELDS
+    )
+
+
+def single_pass(interfaces, block):
+    return interfaces.parse_interface_block(block)
+
+
+def legacy_parse_interfaces(data):
+    """Interfaces.parse_interfaces before it used iter_interface_blocks"""
+    parsed = dict()
+    key = ""
+    for line in data.split("\n"):
+        if len(line) == 0:
+            continue
+        if line[0] == " ":
+            parsed[key] += "\n%s" % line
+        else:
+            match = re.match(r"^(\w+\s?\S+) is.*", line)
+            if match:
+                key = match.group(1)
+                parsed[key] = line
+    return parsed
+
+
+def populate_blocks(data):
+    interfaces = Interfaces(MagicMock(params={}))
+    interfaces.facts["all_ipv4_addresses"] = list()
+    interfaces.facts["all_ipv6_addresses"] = list()
+    interfaces.populate_interfaces(legacy_parse_interfaces(data))
+
+
+def populate_streaming(data):
+    interfaces = StreamingInterfaces(MagicMock(params={}))
+    interfaces.responses = [data]
+    interfaces.populate()
+
+
+def run(parser, interfaces, blocks, rounds):
+    start = time.time()
+    for _ in range(rounds):
+        for block in blocks:
+            parser(interfaces, block)
+    return (time.time() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--interfaces", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    interfaces = Interfaces(MagicMock(params={}))
+    data = show_interfaces(args.interfaces)
+    blocks = list(interfaces.parse_interfaces(data).values())
+
+    print("show interfaces, %s interfaces" % len(blocks))
+    baseline = None
+    for name, func in (
+        ("legacy", legacy),
+        ("precompiled", precompiled),
+        ("single pass", single_pass),
+    ):
+        elapsed = run(func, interfaces, blocks, args.rounds)
+        baseline = baseline or elapsed
+        print(
+            "  %-12s: %8.2f ms (x%.2f)"
+            % (name, elapsed * 1000, baseline / elapsed)
+        )
+
+    print("populate interfaces facts")
+    baseline = None
+    for name, func in (
+        ("blocks", populate_blocks),
+        ("streaming", populate_streaming),
+    ):
+        start = time.time()
+        for _ in range(args.rounds):
+            func(data)
+        elapsed = (time.time() - start) / args.rounds
+        baseline = baseline or elapsed
+        print(
+            "  %-12s: %8.2f ms (x%.2f)"
+            % (name, elapsed * 1000, baseline / elapsed)
+        )
+
+
+if __name__ == "__main__":
+    main()
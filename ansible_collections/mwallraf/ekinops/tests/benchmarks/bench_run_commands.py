@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Compares sequential and batched Cliconf.run_commands against a fake
+connection that simulates the network round-trip of every write.
+
+Usage (from the root of the repository):
+    python -m \\
+    ansible_collections.mwallraf.ekinops.tests.benchmarks.bench_run_commands
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import time
+
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.commands import (  # noqa:E501
+    OneosCommandV5,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.helpers import (  # noqa:E501
+    FakeConnection,
+    get_cliconf,
+)
+
+
+class SlowConnection(FakeConnection):
+    """Every write waits for one network round-trip, every command
+    adds the device processing time
+    """
+
+    def __init__(self, rtt, command_time, **kwargs):
+        super(SlowConnection, self).__init__(**kwargs)
+        self.rtt = rtt
+        self.command_time = command_time
+
+    def send(self, command, **kwargs):
+        commands = len(command.split(b"\r"))
+        time.sleep(self.rtt + commands * self.command_time)
+        return super(SlowConnection, self).send(command, **kwargs)
+
+
+def run(batch, rtt, command_time, rounds):
+    connection = SlowConnection(rtt, command_time, oneos_version=5)
+    cliconf = get_cliconf(connection, oneos_version="5", batch_commands=batch)
+    start = time.time()
+    for _ in range(rounds):
+        cliconf.run_commands(
+            list(OneosCommandV5.COMMANDS_HARDWARE_FACTS), check_rc=False
+        )
+    return (time.time() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rtt", type=float, default=0.050)
+    parser.add_argument("--command-time", type=float, default=0.005)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    sequential = run(False, args.rtt, args.command_time, args.rounds)
+    batched = run(True, args.rtt, args.command_time, args.rounds)
+
+    print(
+        "hardware facts (%s commands), rtt %.0f ms"
+        % (len(OneosCommandV5.COMMANDS_HARDWARE_FACTS), args.rtt * 1000)
+    )
+    print("  sequential : %8.1f ms/host" % (sequential * 1000))
+    print("  batched    : %8.1f ms/host" % (batched * 1000))
+    print("  saving     : %8.1f ms/host" % ((sequential - batched) * 1000))
+
+
+if __name__ == "__main__":
+    main()
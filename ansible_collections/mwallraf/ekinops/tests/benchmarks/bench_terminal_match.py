@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Compares the cost of the prompt and error matching of the terminal plugin
+while a large output is received. Like the libssh transport of
+network_cli, the terminal regexes are searched in the complete response
+after every received chunk, the matching is timed after a sample of the
+chunks:
+  - legacy : the regexes before the tail matching, including the
+             " +^$" and "-+^$" patterns that never match
+  - tail   : TerminalModule.terminal_stdout_re (last line only) and
+             terminal_stderr_re (literal patterns, complete response)
+
+Usage (from the root of the repository):
+    python -m \\
+    ansible_collections.mwallraf.ekinops.tests.benchmarks.bench_terminal_match
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import re
+import time
+
+from ansible_collections.mwallraf.ekinops.plugins.terminal.oneos import (
+    TerminalModule,
+)
+
+LEGACY_STDOUT_RE = [
+    re.compile(rb"[\r\n]?[\w\+\-\.:\/\[\]]+(?:\([^\)]+\)){0,3}(?:[>#]) ?$")
+]
+
+LEGACY_STDERR_RE = [
+    re.compile(rb"Error: Invalid command"),
+    re.compile(rb" +^$"),
+    re.compile(rb"Syntax error:"),
+    re.compile(rb"-+^$"),
+]
+
+
+def synthetic_output(size):
+    """Returns a running-config like output of about size bytes that ends
+    with the prompt
+    """
+    lines = list()
+    length = 0
+    idx = 0
+    while length < size:
+        line = (
+            "interface gigabitethernet 0/%s\n"
+            " description customer %s - access port\n"
+            " ip address 10.%s.%s.1 255.255.255.0\n"
+            "exit\n" % (idx, idx, idx // 256 % 256, idx % 256)
+        )
+        lines.append(line)
+        length += len(line)
+        idx += 1
+    return ("".join(lines) + "lab-lbb150#").encode()
+
+
+def match_chunk(resp, stdout_re, stderr_re):
+    """Searches the regexes like network_cli does after a chunk, returns
+    True if the prompt is matched
+    """
+    if any(regex.search(resp) for regex in stderr_re):
+        raise AssertionError("error matched at byte %s" % len(resp))
+    return any(regex.search(resp) for regex in stdout_re)
+
+
+def receive(output, chunk_size, samples, stdout_re, stderr_re):
+    """Times the matching after samples chunks spread over the output,
+    returns the average time per chunk and the time of the last chunk
+    """
+    ends = list(range(chunk_size, len(output), chunk_size)) + [len(output)]
+    step = max(len(ends) // samples, 1)
+    elapsed = list()
+    for end in ends[::step][-samples:]:
+        resp = output[:end]
+        start = time.perf_counter()
+        prompt = match_chunk(resp, stdout_re, stderr_re)
+        elapsed.append(time.perf_counter() - start)
+        if prompt != (end == len(output)):
+            raise AssertionError("prompt matched at byte %s" % end)
+    if end != len(output):
+        raise AssertionError("last chunk not sampled")
+    return sum(elapsed) / len(elapsed), elapsed[-1], len(ends)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=float, default=5.0, help="MB")
+    parser.add_argument("--chunk-size", type=int, default=16384)
+    parser.add_argument("--samples", type=int, default=20)
+    args = parser.parse_args()
+
+    output = synthetic_output(int(args.size * 1024**2))
+    baseline = None
+    for name, stdout_re, stderr_re in (
+        ("legacy", LEGACY_STDOUT_RE, LEGACY_STDERR_RE),
+        (
+            "tail",
+            TerminalModule.terminal_stdout_re,
+            TerminalModule.terminal_stderr_re,
+        ),
+    ):
+        per_chunk, last, chunks = receive(
+            output, args.chunk_size, args.samples, stdout_re, stderr_re
+        )
+        if baseline is None:
+            baseline = per_chunk
+            print(
+                "%s bytes in %s chunks of %s bytes"
+                % (len(output), chunks, args.chunk_size)
+            )
+        print(
+            "  %-6s: %10.2f us per chunk (x%.1f), %10.2f us last chunk"
+            % (name, per_chunk * 1e6, baseline / per_chunk, last * 1e6)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Times the parsers and renderers of the collection on generated fixtures
+of increasing size, without a device.
+
+Every case is run for each of its sizes, the size is the number of items
+in the generated output (cores, files, interfaces, ACEs, config blocks,
+...). The resource templates are much slower than the other parsers and
+are run on smaller sizes by default.
+The best time of --rounds runs is kept. The results can be written to a
+JSON file and are compared with a stored baseline, a case is flagged as a
+regression when it is more than --threshold slower than the baseline (and
+at least --min-delta seconds). The exit status is 1 if there is a
+regression.
+
+The baseline is machine dependent, save a new one (--save-baseline) when
+the benchmarks are run on another machine.
+
+Usage (from the root of the repository):
+    python -m ansible_collections.mwallraf.ekinops.tests.benchmarks.suite
+    python -m ansible_collections.mwallraf.ekinops.tests.benchmarks.suite \\
+        --output results.json --case acls
+    python -m ansible_collections.mwallraf.ekinops.tests.benchmarks.suite \\
+        --save-baseline
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from datetime import datetime
+
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.facts.legacy.base import (  # noqa:E501
+    Hardware,
+    Interfaces,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.oneos import (  # noqa:E501
+    commands_add_exit,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.rm_templates.acl_interfaces import (  # noqa:E501
+    Acl_interfacesTemplate,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.rm_templates.acls import (  # noqa:E501
+    AclsTemplate,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils import (  # noqa:E501
+    config_index,
+)
+from ansible_collections.mwallraf.ekinops.tests.benchmarks.bench_get_diff import (  # noqa:E501
+    candidate_config,
+)
+from ansible_collections.mwallraf.ekinops.tests.benchmarks.bench_interface_facts import (  # noqa:E501
+    show_interfaces,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.compat.mock import (
+    MagicMock,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.helpers import (  # noqa:E501
+    FakeConnection,
+    get_cliconf,
+    legacy_acl_outputs,
+    synthetic_acl_config,
+    synthetic_running_config,
+)
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+SIZES = (10, 100, 1000)
+
+# name -> (function that takes a size and returns the function to time,
+#          default sizes)
+CASES = dict()
+
+
+def case(name, sizes=SIZES):
+    """Registers a benchmark case"""
+
+    def _register(func):
+        CASES[name] = (func, sizes)
+        return func
+
+    return _register
+
+
+def get_hardware(oneos_version):
+    module = MagicMock()
+    module.oneos_version = oneos_version
+    return Hardware(module)
+
+
+def show_system_status(oneos_version, cores):
+    lines = [
+        "System Information for device LBB_150 S/N T1914008214019302",
+        "",
+        "Software version    : OneOS-pCPE-ARM_pi1-6.2.2",
+        "Boot version        : BOOT-ARM_hw1-3.1.2",
+        "Recovery version    : OneOs-RCY-ARM_pi1-1.3.3",
+        "License token       : None",
+        "",
+        "Current system time : 2021-01-18 08:07:29+0000",
+        "System started      : 2021-01-02 02:44:24+0000",
+        "Start caused by     : Software requested",
+        "Sys Up time         : 16d 5h 23m 5s",
+        "",
+    ]
+    for core in range(cores):
+        if oneos_version == 5:
+            lines += [
+                "Core %s,     control, CPU load for 1 second: 7.2%%" % core,
+                "Average CPU load (5 / 60 Minutes)         : 7.5% / 7.0%",
+            ]
+        else:
+            lines.append(
+                " %s     control      1.0 %%     3.0 %%      1.0 %%"
+                "     1.0 %%      1.0 %%" % core
+            )
+    return "\n".join(lines)
+
+
+def show_memory(pools):
+    lines = ["Pool %s : %s KB" % (idx, idx * 1024) for idx in range(pools)]
+    lines += [
+        "System total    : 2 053 088",
+        "        used    : 1 024 000  49.8%",
+        "        free    : 1 029 088  50.2%",
+        "Memory Total    : 2102362112",
+    ]
+    return "\n".join(lines)
+
+
+def ls_files(oneos_version, folder, files):
+    lines = list()
+    for idx in range(files):
+        if oneos_version == 5:
+            lines.append("   file-%s.cfg          %s" % (idx, 1000 + idx))
+        else:
+            lines.append(
+                "-rw-r--r-- 1 %s Jan 01 2021 %s-%s.bin"
+                % (1000 + idx, folder, idx)
+            )
+    return "\n".join(lines)
+
+
+def show_software_image(banks):
+    lines = list()
+    for idx in range(banks):
+        lines += [
+            " %s bank :" % ("Active" if idx == 0 else "Bank%s" % idx),
+            "Software version    : binaries-%s" % idx,
+            "Header checksum     : 0x%08x" % idx,
+        ]
+    return "\n".join(lines)
+
+
+def show_device_status(volumes):
+    lines = ["  Flash disk : 256MB", "  Ram disk : 1MB"]
+    for idx in range(volumes):
+        lines += [
+            "devHdr.name: flashdisk:",
+            "free space on volume: %s,000 bytes" % (100 + idx),
+        ]
+    return "\n".join(lines)
+
+
+@case("Hardware.parse_system_info")
+def bench_parse_system_info(size):
+    hardware = get_hardware(6)
+    data = show_system_status(6, size)
+    return lambda: hardware.parse_system_info(data)
+
+
+@case("Hardware.parse_software_info")
+def bench_parse_software_info(size):
+    hardware = get_hardware(6)
+    data = show_system_status(6, size)
+    return lambda: hardware.parse_software_info(data)
+
+
+@case("Hardware.parse_memory")
+def bench_parse_memory(size):
+    hardware = get_hardware(6)
+    data = show_memory(size)
+    return lambda: hardware.parse_memory(data)
+
+
+@case("Hardware.parse_cpu_V5")
+def bench_parse_cpu_v5(size):
+    hardware = get_hardware(5)
+    data = show_system_status(5, size)
+    return lambda: hardware.parse_cpu_V5(data)
+
+
+@case("Hardware.parse_cpu_V6")
+def bench_parse_cpu_v6(size):
+    hardware = get_hardware(6)
+    data = show_system_status(6, size)
+    return lambda: hardware.parse_cpu_V6(data)
+
+
+@case("Hardware.parse_boot_info_V5")
+def bench_parse_boot_info_v5(size):
+    hardware = get_hardware(5)
+    datas = [
+        "flash:/BSA/binaries/image.bin\nflash:/BSA/config/bsaStart.cfg",
+        ls_files(5, "binaries", size),
+        ls_files(5, "config", size),
+    ]
+    return lambda: hardware.parse_boot_info_V5(datas)
+
+
+@case("Hardware.parse_boot_info_V6")
+def bench_parse_boot_info_v6(size):
+    hardware = get_hardware(6)
+    datas = [
+        ls_files(6, "binaries", size),
+        ls_files(6, "config", size),
+        show_software_image(2),
+    ]
+    return lambda: hardware.parse_boot_info_V6(datas)
+
+
+@case("Hardware.parse_filesystems_info_V5")
+def bench_parse_filesystems_info_v5(size):
+    hardware = get_hardware(5)
+    data = show_device_status(size)
+    return lambda: hardware.parse_filesystems_info_V5(data)
+
+
+@case("Hardware.parse_filesystems_info_V6")
+def bench_parse_filesystems_info_v6(size):
+    hardware = get_hardware(6)
+    data = "\n".join(
+        ["  tmp   %s   %s  1.0%%" % (idx, idx) for idx in range(size)]
+        + ["  user   1000000   500000   50.0%"]
+    )
+    return lambda: hardware.parse_filesystems_info_V6(data)
+
+
+@case("Interfaces.parse_interfaces")
+def bench_parse_interfaces(size):
+    interfaces = Interfaces(MagicMock(params={}))
+    data = show_interfaces(max(size, 5))
+    return lambda: interfaces.parse_interfaces(data)
+
+
+def parse_template(template_class, lines):
+    """Returns a function that parses the lines with a fresh config
+    index, the index of the previous round is not reused
+    """
+
+    def _parse():
+        config_index._CONFIG_INDEXES.clear()
+        return template_class(lines=lines).parse()
+
+    return _parse
+
+
+@case("AclsTemplate.parse", sizes=(5, 20, 50))
+def bench_acls_template_parse(size):
+    show, remarks = legacy_acl_outputs(
+        synthetic_acl_config(max(size // 100, 1), min(size, 100))
+    )
+    data = show + "\n" + remarks.replace("ip access", "ip-remark access")
+    return parse_template(AclsTemplate, data.splitlines())
+
+
+@case("Acl_interfacesTemplate.parse", sizes=(10, 50, 200))
+def bench_acl_interfaces_template_parse(size):
+    lines = synthetic_running_config(6, size).splitlines()
+    return parse_template(Acl_interfacesTemplate, lines)
+
+
+@case("Cliconf.get_diff")
+def bench_get_diff(size):
+    running = synthetic_running_config(6, size)
+    candidate = candidate_config(6, max(size // 10, 3))
+
+    def _get_diff():
+        cliconf = get_cliconf(FakeConnection(), oneos_version="6")
+        return cliconf.get_diff(candidate, running)
+
+    return _get_diff
+
+
+@case("commands_add_exit")
+def bench_commands_add_exit(size):
+    commands = list()
+    for idx in range(size):
+        commands += [
+            "interface dot11radio 0/0.%s" % idx,
+            " dot11 qos wmm",
+            " ssid SSID-%s" % idx,
+            "  wps enable",
+            "  authentication wpa2-psk",
+            " shutdown",
+        ]
+    return lambda: commands_add_exit(commands, start_command="interface")
+
+
+def timed(func, rounds):
+    """Returns the best time of rounds calls of func"""
+    best = None
+    for _ in range(rounds):
+        start = time.time()
+        func()
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def run_benchmarks(cases=None, sizes=None, rounds=3):
+    """Runs the cases (all cases by default) for the sizes (the default
+    sizes of each case if not given) and returns a list of
+    {"case", "size", "seconds"} results
+    """
+    results = list()
+    for name in cases or sorted(CASES):
+        setup, default_sizes = CASES[name]
+        for size in sizes or default_sizes:
+            func = setup(size)
+            results.append(
+                {
+                    "case": name,
+                    "size": size,
+                    "seconds": round(timed(func, rounds), 6),
+                }
+            )
+    return results
+
+
+def compare(results, baseline, threshold=0.5, min_delta=0.0005):
+    """Returns the results that are more than threshold (a ratio) and
+    min_delta seconds slower than the same case and size in the baseline,
+    with the baseline time in "baseline_seconds"
+    """
+    previous = dict(
+        ((r["case"], r["size"]), r["seconds"])
+        for r in baseline.get("results", [])
+    )
+    regressions = list()
+    for result in results:
+        seconds = previous.get((result["case"], result["size"]))
+        if seconds is None:
+            continue
+        if (
+            result["seconds"] > seconds * (1 + threshold)
+            and result["seconds"] - seconds > min_delta
+        ):
+            regressions.append(dict(result, baseline_seconds=seconds))
+    return regressions
+
+
+def get_report(results, rounds):
+    return {
+        "created": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "rounds": rounds,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--case",
+        action="append",
+        help="only run the cases that contain this text",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        help="run every case for these sizes instead of its default sizes",
+    )
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--output", help="write the results to this file")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="store the results as the new baseline",
+    )
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--min-delta", type=float, default=0.0005)
+    args = parser.parse_args()
+
+    cases = sorted(
+        name
+        for name in CASES
+        if not args.case or any(c in name for c in args.case)
+    )
+    results = run_benchmarks(cases, args.sizes, args.rounds)
+    report = get_report(results, args.rounds)
+
+    for result in results:
+        print(
+            "%-36s %6s: %10.3f ms"
+            % (result["case"], result["size"], result["seconds"] * 1000)
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print("baseline saved to %s" % args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("no baseline found at %s" % args.baseline)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold, args.min_delta)
+    for result in regressions:
+        print(
+            "REGRESSION %s %s: %.3f ms, baseline %.3f ms"
+            % (
+                result["case"],
+                result["size"],
+                result["seconds"] * 1000,
+                result["baseline_seconds"] * 1000,
+            )
+        )
+    if not regressions:
+        print("no regressions against %s" % args.baseline)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Fake connections and generated outputs shared by the unit tests and the
+benchmarks (tests/benchmarks)
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import itertools
+import re
+
+from ansible.module_utils._text import to_bytes, to_text
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.config import (  # noqa:E501
+    NetworkConfig,
+)
+from ansible_collections.mwallraf.ekinops.plugins.cliconf.oneos import Cliconf
+from ansible_collections.mwallraf.ekinops.tests.unit.compat.mock import (
+    MagicMock,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.base import (  # noqa:E501
+    load_fixture,
+)
+
+# show running-config with an optional section and include filter
+RUNNING_CONFIG_RE = re.compile(
+    r'^(?:show|sh) running-config ?([^|]*?) ?(?:\| ?(?:i|include) "?(.*?)"?)?$'
+)
+
+# no fixture, the serial number is set per test
+PRODUCT_INFO_AREA = (
+    "Product Name        : LBB_150 \n"
+    "Commercial Name     : LBB150 \n"
+    "Serial Number       : {serial} \n"
+)
+
+
+class FakeConnection(object):
+    """Minimal stand-in for the network_cli connection that replays
+    fixture output and keeps track of the commands that were sent
+    """
+
+    prompt = "lab-lbb150#"
+
+    def __init__(self, oneos_version=6, host="10.0.0.1"):
+        self.oneos_version = oneos_version
+        self.host = host
+        self.options = {}
+        self.sent = []
+        self.pending = []
+        self.serial_number = "T1914008214019302"
+
+    def get_option(self, option):
+        if option == "host":
+            return self.host
+        if option in self.options:
+            return self.options[option]
+        raise KeyError(option)
+
+    def set_option(self, option, value):
+        self.options[option] = value
+
+    def get_prompt(self):
+        return to_bytes(self.prompt)
+
+    def output(self, command):
+        match = RUNNING_CONFIG_RE.match(command)
+        if match:
+            return self.running_config_output(*match.groups())
+        if command == "show product-info-area":
+            return PRODUCT_INFO_AREA.format(serial=self.serial_number)
+        filename = "command_" + command.replace(" ", "_")
+        try:
+            return load_fixture(filename, self.oneos_version)
+        except (IOError, OSError):
+            return "% Syntax error: unknown command " + command
+
+    def running_config_output(self, section, include):
+        """Filters the running-config fixture like the device does, the
+        blocks of the section first and then every line with include
+        """
+        config = load_fixture("command_show_running-config", 6)
+        if self.oneos_version == 5:
+            config = load_fixture("command_show_running-config", 5)
+        # the captured fixture ends with the prompt, network_cli strips it
+        lines = [line for line in config.splitlines() if line != self.prompt]
+        if section:
+            blocks = list()
+            in_block = False
+            for line in lines:
+                if line and not line[0].isspace():
+                    if in_block and line.rstrip() == "exit":
+                        blocks.append(line)
+                        in_block = False
+                        continue
+                    in_block = line.split(" ")[: len(section.split())] == (
+                        section.split()
+                    )
+                if in_block:
+                    blocks.append(line)
+            lines = blocks
+        if include:
+            lines = [line for line in lines if re.search(include, line)]
+        return "\n".join(lines)
+
+    def send(self, command, **kwargs):
+        command = to_text(command)
+        self.sent.append(command)
+        commands = command.split("\r")
+        if len(commands) == 1:
+            return self.output(command)
+
+        # pipelined commands are echoed after the prompt of the
+        # previous command
+        lines = [commands[0]]
+        for idx, cmd in enumerate(commands):
+            lines.append(self.output(cmd))
+            if idx + 1 < len(commands):
+                lines.append(self.prompt + commands[idx + 1])
+            else:
+                lines.append(self.prompt)
+        return "\n".join(lines)
+
+    def receive(self, **kwargs):
+        return self.pending.pop(0)
+
+
+def synthetic_running_config(oneos_version=6, interfaces=1000):
+    """Returns a large OneOS running-config, about 6 lines per interface"""
+    if oneos_version == 5:
+        intf = "GigabitEthernet"
+    else:
+        intf = "gigabitethernet"
+    lines = ["hostname lab-lbb150", "ip ssh enable"]
+    for idx in range(interfaces):
+        slot, port = divmod(idx, 16)
+        lines += [
+            "interface %s %s/%s" % (intf, slot, port),
+            " description customer %s" % idx,
+            " ip address 10.%s.%s.1 255.255.255.0" % (slot, port),
+            " ip access-group ACL-%s in" % idx,
+            "exit",
+            "ip access-list extended ACL-%s" % idx,
+            " permit ip 10.%s.%s.0 0.0.0.255 any" % (slot, port),
+            "exit",
+        ]
+    lines.append("ip route 0.0.0.0 0.0.0.0 10.0.0.1")
+    return "\n".join(lines)
+
+
+def legacy_get_diff(candidate, running, diff_match, diff_replace, path=None):
+    """config_diff as it was calculated before RunningConfigIndex"""
+    candidate_obj = NetworkConfig(indent=1)
+    candidate_obj.load(candidate)
+    running_obj = NetworkConfig(indent=1, contents=running)
+    configdiffobjs = candidate_obj.difference(
+        running_obj, path=path, match=diff_match, replace=diff_replace
+    )
+    configlines = list()
+    for i, o in enumerate(configdiffobjs):
+        configlines.append(o.text)
+        if i + 1 < len(configdiffobjs):
+            levels = len(o.parents) - len(configdiffobjs[i + 1].parents)
+        else:
+            levels = len(o.parents)
+        if o.text == "exit":
+            levels -= 1
+        if levels > 0:
+            for i in range(levels):
+                configlines.append("exit")
+    return "\n".join(configlines)
+
+
+def get_cliconf(connection, **options):
+    cliconf = Cliconf(connection)
+    cliconf._get_plugin_option = MagicMock(
+        side_effect=lambda option, default=None: options.get(option, default)
+    )
+    return cliconf
+
+
+def synthetic_acl_config(acls, aces, remarks=True):
+    """Returns the running-config access-list sections of acls extended
+    ACLs with aces ACEs each, with a remark after every ACE if remarks
+    is set
+    """
+    lines = list()
+    for acl in range(acls):
+        lines.append("ip access-list extended ACL-%s" % acl)
+        for idx in range(aces):
+            lines.append(
+                " permit tcp 10.%s.%s.0 0.0.0.255 any eq 443"
+                % (idx // 256 % 256, idx % 256)
+            )
+            if remarks:
+                lines.append(" remark customer %s" % idx)
+        lines.append("exit")
+    return "\n".join(lines)
+
+
+def legacy_acl_outputs(config):
+    """Returns the output of "show ip access-list" and of the remarks
+    alias for the ACLs of synthetic_acl_config
+    """
+    show = list()
+    remarks = list()
+    for line in config.splitlines():
+        if line == "exit":
+            continue
+        if not line.startswith(" "):
+            show.append(line)
+            remarks.append(line)
+        elif line.startswith(" remark"):
+            remarks.append(line)
+        else:
+            show.append("  %s (3 matches)" % line.strip())
+    return "\n".join(show), "\n".join(remarks)
+
+
+def legacy_get_acl_data(acl_data, remarks_data):
+    """AclsFacts.get_acl_data before the single source and single pass
+    tagging
+    """
+    _acl_data = acl_data
+    if remarks_data:
+        remarks_config = []
+        for rem in remarks_data.split("\n"):
+            rem = re.sub(r"^(ip )", "ip-remark ", rem)
+            rem = re.sub(r"^(ipv6 )", "ipv6-remark ", rem)
+            remarks_config.append(rem)
+        _acl_data += "\n" + "\n".join(remarks_config)
+    return _acl_data
+
+
+def legacy_sanitize_data(data):
+    """AclsFacts.sanitize_data before it was built with a single join"""
+    re_data = ""
+    for da in data.split("\n"):
+        if "match" in da:
+            mod_da = re.sub(r"\([^()]*\)", "", da)
+            re_data += mod_da[:-1] + "\n"
+        elif da.startswith("interface"):
+            continue
+        else:
+            re_data += da + "\n"
+    return re_data
+
+
+def legacy_tmplt_access_list_entries(aces):
+    """_tmplt_access_list_entries as it was before the list based
+    renderer (without the commented out code)
+    """
+
+    def source_destination_common_config(config_data, command, attr):
+        if config_data[attr].get("address"):
+            command += " {address}".format(**config_data[attr])
+            if config_data[attr].get("wildcard_bits"):
+                command += " {wildcard_bits}".format(**config_data[attr])
+        elif config_data[attr].get("any"):
+            command += " 0.0.0.0 255.255.255.255".format(**config_data[attr])
+        elif config_data[attr].get("host"):
+            command += " {host} 0.0.0.0".format(**config_data[attr])
+        if config_data[attr].get("port_protocol"):
+            if config_data[attr].get("port_protocol").get("range"):
+                command += " {0} {1}".format(
+                    config_data[attr]["port_protocol"]["range"].get("start"),
+                    config_data[attr]["port_protocol"]["range"].get("end"),
+                )
+            else:
+                port_proto_type = list(
+                    config_data[attr]["port_protocol"].keys(),
+                )[0]
+                # kept as in the original template for parity
+                command += " {1}".format(  # noqa:F523,F524
+                    config_data[attr]["port_protocol"][port_proto_type],
+                )
+        return command
+
+    command = " "
+    if aces:
+        if aces.get("grant"):
+            command += "{grant}".format(**aces)
+        if aces.get("protocol_options"):
+            command += " {protocol}".format(**aces["protocol_options"])
+            if "protocol_number" in aces["protocol_options"]:
+                command += " {protocol_number}".format(
+                    **aces["protocol_options"]
+                )
+        if aces.get("source"):
+            command = source_destination_common_config(aces, command, "source")
+        if aces.get("destination"):
+            command = source_destination_common_config(
+                aces,
+                command,
+                "destination",
+            )
+        if aces.get("protocol_options"):
+            icmp_message_type = aces["protocol_options"].get(
+                "icmp_message_type"
+            )
+            icmp_message_code = aces["protocol_options"].get(
+                "icmp_message_code"
+            )
+            if icmp_message_type:
+                command += " {}".format(icmp_message_type)
+            if icmp_message_code:
+                command += " {}".format(icmp_message_code)
+        if aces.get("dscp"):
+            command += " dscp {dscp}".format(**aces)
+        if aces.get("log"):
+            command += " log"
+            if aces["log"].get("user_cookie"):
+                command += " {user_cookie}".format(**aces["log"])
+        if aces.get("fragments"):
+            command += " fragments"
+        if aces.get("reflexive"):
+            command += " reflexive"
+        if aces.get("precedence"):
+            command += " precedence {precedence}".format(**aces)
+        if aces.get("sequence"):
+            command += " sequence {sequence}".format(**aces)
+    return command
+
+
+def synthetic_aces(count=None):
+    """Returns ACEs with every combination of the attributes that the
+    legacy renderer supports, repeated until there are count ACEs
+    """
+    addresses = [
+        None,
+        {"any": True},
+        {"host": "10.0.0.1"},
+        {"address": "10.1.0.0", "wildcard_bits": "0.0.255.255"},
+        {
+            "address": "10.2.0.0",
+            "port_protocol": {"range": {"start": 1000, "end": 2000}},
+        },
+    ]
+    protocols = [
+        None,
+        {"protocol": "ip"},
+        {"protocol": "tcp"},
+        {"protocol": "ip", "protocol_number": 47},
+        {"protocol": "icmp", "icmp_message_type": 8, "icmp_message_code": 0},
+    ]
+    extras = [
+        {},
+        {"dscp": 46},
+        {"log": {"user_cookie": "cookie"}},
+        {"fragments": True, "reflexive": True},
+        {"precedence": 5},
+    ]
+    aces = list()
+    for sequence, (grant, protocol, source, destination, extra) in enumerate(
+        itertools.product(
+            ["permit", "deny", None],
+            protocols,
+            addresses,
+            addresses,
+            extras,
+        )
+    ):
+        ace = dict(extra, sequence=sequence * 10 or None, afi="ipv4")
+        for key, value in (
+            ("grant", grant),
+            ("protocol_options", protocol),
+            ("source", source),
+            ("destination", destination),
+        ):
+            if value is not None:
+                ace[key] = dict(value) if isinstance(value, dict) else value
+        aces.append(ace)
+    while count and len(aces) < count:
+        aces += aces[: count - len(aces)]
+    return aces[:count] if count else aces
@@ -0,0 +1,498 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Fake OneOS SSH server that replays the command fixtures, used to test
+plugins that open their own SSH sessions and to load test the plugin stack
+(network_cli, terminal and cliconf plugins) without real devices.
+
+The behaviour of the device can be tuned:
+  - latency, jitter : seconds before every response (latency + a random
+                      part of up to jitter seconds)
+  - connect_latency : seconds before the banner is sent
+  - banner          : one of BANNERS or a custom text
+  - prompt_style    : one of PROMPT_STYLES, the "user" prompt requires an
+                      "enable" first
+  - paging          : page_length lines per page with a --More-- prompt
+                      until paging is disabled with "term len 0"
+  - chunk_size      : send the output in chunks of chunk_size bytes with
+                      chunk_delay seconds in between
+  - echo            : echo the commands, like a real device does
+
+The terminal setup commands of the other OneOS version are rejected with
+a syntax error, like a real device does.
+
+Usage:
+    >>> server = FakeOneosSshServer(oneos_version=6).start()
+    >>> server.port
+    40021
+    >>> server.stop()
+
+    >>> fleet = start_fleet(200, oneos_versions=(5, 6), latency=0.05)
+    >>> [server.port for server in fleet]
+    >>> stop_fleet(fleet)
+
+Command line, runs until interrupted and writes an inventory of the
+fake devices:
+    python -m ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.ssh_server \\
+        --count 200 --oneos-version 5 6 --latency 0.05 --inventory fake.ini
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import itertools
+import random
+import socket
+import threading
+import time
+
+from ansible.module_utils._text import to_bytes, to_text
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.base import (  # noqa:E501
+    load_fixture,
+)
+
+try:
+    import paramiko
+
+    HAS_PARAMIKO = True
+except ImportError:
+    HAS_PARAMIKO = False
+
+
+# the login banners, sent before the first prompt
+BANNERS = {
+    "welcome": "\r\nWelcome to OneOS\r\n",
+    "none": "",
+    "motd": "\r\n"
+    "******************************************\r\n"
+    "*  Authorized access only, all sessions  *\r\n"
+    "*  are logged - support: noc@example.com *\r\n"
+    "******************************************\r\n",
+    "version": "\r\nWelcome to OneOS\r\nSoftware version : {software}\r\n",
+}
+
+# the software version of each OneOS version, replaces {software} in the
+# banner
+SOFTWARE_VERSIONS = {
+    5: "ONEOS92-DUAL_FT-V5.2R2E7_HA8",
+    6: "OneOS-pCPE-ARM_pi1-6.2.2",
+}
+
+# the prompts, {hostname} is replaced by the hostname of the device
+PROMPT_STYLES = {
+    "enable": "{hostname}#",
+    "user": "{hostname}>",
+    "trailing-space": "{hostname}# ",
+}
+
+# the terminal setup commands that each OneOS version accepts
+SETUP_COMMANDS = {
+    5: ("term len 0", "stty columns 255"),
+    6: ("term len 0", "screen-width 512"),
+}
+
+# the device information commands sent by the cliconf plugin that have
+# no fixture, {serial} is unique per server
+DEVICE_OUTPUTS = {
+    "show product-info-area": "Product Name        : LBB_150 \n"
+    "Commercial Name     : LBB150 \n"
+    "Serial Number       : {serial} \n",
+    "show system hardware": "Local               : 4 x ETHERNET \n"
+    "Uplink              : 1 x ETHERNET \n",
+}
+
+MORE_PROMPT = " --More-- "
+
+_SERIAL_NUMBERS = itertools.count(1)
+
+_HOST_KEY = []
+_HOST_KEY_LOCK = threading.Lock()
+
+
+def get_host_key():
+    # generated once and shared by all servers, generating a key for
+    # every server makes starting a large fleet very slow
+    with _HOST_KEY_LOCK:
+        if not _HOST_KEY:
+            _HOST_KEY.append(paramiko.RSAKey.generate(2048))
+    return _HOST_KEY[0]
+
+
+if HAS_PARAMIKO:
+
+    class _ServerInterface(paramiko.ServerInterface):
+        """Accepts every login and a single interactive shell"""
+
+        def __init__(self):
+            self.shell_requested = threading.Event()
+
+        def check_auth_password(self, username, password):
+            return paramiko.AUTH_SUCCESSFUL
+
+        def get_allowed_auths(self, username):
+            return "password"
+
+        def check_channel_request(self, kind, chanid):
+            if kind == "session":
+                return paramiko.OPEN_SUCCEEDED
+            return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+        def check_channel_pty_request(self, *args):
+            return True
+
+        def check_channel_shell_request(self, channel):
+            self.shell_requested.set()
+            return True
+
+
+class FakeOneosSshServer:
+    """Listens on a local port and answers every command with the
+    oneos<version>_command_<command> fixture
+    """
+
+    def __init__(
+        self,
+        oneos_version=6,
+        hostname="lab-lbb150",
+        latency=0,
+        jitter=0,
+        connect_latency=0,
+        banner="welcome",
+        prompt_style="enable",
+        paging=False,
+        page_length=24,
+        chunk_size=None,
+        chunk_delay=0,
+        echo=True,
+        port=0,
+    ):
+        self.oneos_version = int(oneos_version)
+        self.hostname = hostname
+        self.prompt = PROMPT_STYLES["enable"].format(hostname=hostname)
+        self.latency = latency
+        self.jitter = jitter
+        self.connect_latency = connect_latency
+        self.banner = BANNERS.get(banner, banner).replace(
+            "{software}", SOFTWARE_VERSIONS[self.oneos_version]
+        )
+        self.prompt_style = prompt_style
+        self.paging = paging
+        self.page_length = page_length
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.echo = echo
+        self.serial_number = "T%016d" % next(_SERIAL_NUMBERS)
+        self.commands = list()
+        self.sessions = 0
+        self.port = port
+        self._socket = None
+        self._running = False
+
+    def start(self):
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind(("127.0.0.1", self.port))
+        self._socket.listen(100)
+        self.port = self._socket.getsockname()[1]
+        self._running = True
+        thread = threading.Thread(target=self._accept)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        # wakes up the blocking accept() so that the port is released
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
+
+    def output(self, command):
+        if command in SETUP_COMMANDS[self.oneos_version]:
+            return ""
+        if command == "hostname":
+            return self.hostname
+        filename = "command_" + command.replace(" ", "_")
+        try:
+            return load_fixture(filename, self.oneos_version)
+        except (IOError, OSError):
+            pass
+        if command in DEVICE_OUTPUTS:
+            return DEVICE_OUTPUTS[command].format(
+                hostname=self.hostname, serial=self.serial_number
+            )
+        return "% Syntax error: unknown command " + command
+
+    def _accept(self):
+        while self._running:
+            try:
+                client, addr = self._socket.accept()
+            except OSError:
+                return
+            thread = threading.Thread(target=self._serve, args=(client,))
+            thread.daemon = True
+            thread.start()
+
+    def _serve(self, client):
+        transport = paramiko.Transport(client)
+        transport.add_server_key(get_host_key())
+        server = _ServerInterface()
+        try:
+            transport.start_server(server=server)
+            channel = transport.accept(10)
+            if channel is None or not server.shell_requested.wait(10):
+                return
+            self.sessions += 1
+            _Session(self, channel).run()
+        except (EOFError, OSError, paramiko.SSHException):
+            pass
+        finally:
+            transport.close()
+
+    def _wait(self):
+        delay = self.latency
+        if self.jitter:
+            delay += random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+
+class _Session:
+    """The interactive shell of a single SSH session"""
+
+    def __init__(self, server, channel):
+        self.server = server
+        self.channel = channel
+        self.enabled = server.prompt_style != "user"
+        self.paging = server.paging
+        self.buffer = b""
+
+    @property
+    def prompt(self):
+        style = self.server.prompt_style
+        if not self.enabled:
+            style = "user"
+        elif style == "user":
+            style = "enable"
+        return PROMPT_STYLES[style].format(hostname=self.server.hostname)
+
+    def run(self):
+        if self.server.connect_latency:
+            time.sleep(self.server.connect_latency)
+        self.send(self.server.banner + self.prompt)
+        while True:
+            line = self.readline()
+            if line is None:
+                return
+            command = to_text(line).strip()
+            self.server.commands.append(command)
+            self.server._wait()
+            self.execute(command)
+
+    def readline(self):
+        """Returns the next command line or None when the session is
+        closed
+        """
+        while b"\r" not in self.buffer:
+            data = self.channel.recv(1024)
+            if not data:
+                return None
+            self.buffer += data
+        line, self.buffer = self.buffer.split(b"\r", 1)
+        self.buffer = self.buffer.lstrip(b"\n")
+        return line
+
+    def readkey(self):
+        """Returns the next key pressed at the --More-- prompt"""
+        if not self.buffer:
+            data = self.channel.recv(1024)
+            if not data:
+                return None
+            self.buffer += data
+        key, self.buffer = self.buffer[:1], self.buffer[1:]
+        return key
+
+    def execute(self, command):
+        output = ""
+        if command == "enable":
+            self.enabled = True
+        elif command == "disable":
+            self.enabled = self.server.prompt_style != "user"
+        elif command == "term len 0":
+            self.paging = False
+        elif command:
+            output = self.server.output(command)
+
+        if self.server.echo:
+            self.send(command + "\r\n")
+        else:
+            self.send("\r\n")
+        lines = output.splitlines() if output else []
+        if self.paging and len(lines) > self.server.page_length:
+            self.send_paged(lines)
+        elif lines:
+            self.send("\r\n".join(lines) + "\r\n")
+        self.send(self.prompt)
+
+    def send_paged(self, lines):
+        """Sends page_length lines at a time, space shows the next page,
+        return the next line and q stops the output
+        """
+        length = self.server.page_length
+        self.send("\r\n".join(lines[:length]) + "\r\n")
+        position = length
+        while position < len(lines):
+            self.send(MORE_PROMPT)
+            key = self.readkey()
+            # erase the --More-- prompt
+            self.send("\r" + " " * len(MORE_PROMPT) + "\r")
+            if key in (None, b"q", b"Q"):
+                return
+            step = 1 if key in (b"\r", b"\n") else length
+            end = position + step
+            self.send("\r\n".join(lines[position:end]) + "\r\n")
+            position += step
+
+    def send(self, text):
+        data = to_bytes(text)
+        size = self.server.chunk_size
+        if not size:
+            self.channel.sendall(data)
+            return
+        for start in range(0, len(data), size):
+            end = start + size
+            self.channel.sendall(data[start:end])
+            if self.server.chunk_delay:
+                time.sleep(self.server.chunk_delay)
+
+
+def start_fleet(
+    count, oneos_versions=(6,), hostname="fake-oneos", first_port=0, **kwargs
+):
+    """Starts count servers on localhost, the OneOS versions are assigned
+    round robin, the hostnames are numbered: fake-oneos-001,
+    fake-oneos-002, ...
+
+    The servers listen on consecutive ports from first_port, or on free
+    ports if first_port is 0. The other arguments are passed to every
+    FakeOneosSshServer.
+    """
+    servers = list()
+    for idx in range(count):
+        servers.append(
+            FakeOneosSshServer(
+                oneos_version=oneos_versions[idx % len(oneos_versions)],
+                hostname="%s-%03d" % (hostname, idx + 1),
+                port=first_port + idx if first_port else 0,
+                **kwargs
+            ).start()
+        )
+    return servers
+
+
+def stop_fleet(servers):
+    for server in servers:
+        server.stop()
+
+
+def get_inventory(servers, username="admin", password="admin"):
+    """Returns an ansible INI inventory with a host per server"""
+    lines = ["[oneos]"]
+    for server in servers:
+        lines.append(
+            "%s ansible_host=127.0.0.1 ansible_port=%s"
+            " ansible_oneos_version=%s"
+            % (server.hostname, server.port, server.oneos_version)
+        )
+    lines += [
+        "",
+        "[oneos:vars]",
+        "ansible_connection=ansible.netcommon.network_cli",
+        "ansible_network_os=mwallraf.ekinops.oneos",
+        "ansible_user=%s" % username,
+        "ansible_password=%s" % password,
+        "ansible_host_key_checking=false",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Runs fake OneOS SSH devices on localhost"
+    )
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument(
+        "--oneos-version", type=int, nargs="+", default=[6], choices=[5, 6]
+    )
+    parser.add_argument("--first-port", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--jitter", type=float, default=0)
+    parser.add_argument("--connect-latency", type=float, default=0)
+    parser.add_argument("--banner", default="welcome")
+    parser.add_argument(
+        "--prompt-style", default="enable", choices=sorted(PROMPT_STYLES)
+    )
+    parser.add_argument("--paging", action="store_true")
+    parser.add_argument("--page-length", type=int, default=24)
+    parser.add_argument("--chunk-size", type=int)
+    parser.add_argument("--chunk-delay", type=float, default=0)
+    parser.add_argument("--no-echo", action="store_true")
+    parser.add_argument("--inventory", help="write the inventory here")
+    args = parser.parse_args()
+
+    if not HAS_PARAMIKO:
+        parser.error("paramiko is required")
+
+    options = dict(
+        latency=args.latency,
+        jitter=args.jitter,
+        connect_latency=args.connect_latency,
+        banner=args.banner,
+        prompt_style=args.prompt_style,
+        paging=args.paging,
+        page_length=args.page_length,
+        chunk_size=args.chunk_size,
+        chunk_delay=args.chunk_delay,
+        echo=not args.no_echo,
+    )
+    servers = start_fleet(
+        args.count,
+        tuple(args.oneos_version),
+        first_port=args.first_port,
+        **options
+    )
+
+    inventory = get_inventory(servers)
+    if args.inventory:
+        with open(args.inventory, "w") as f:
+            f.write(inventory)
+        print("inventory written to %s" % args.inventory)
+    else:
+        print(inventory)
+
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_fleet(servers)
+        print(
+            "%s sessions, %s commands"
+            % (
+                sum(s.sessions for s in servers),
+                sum(len(s.commands) for s in servers),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
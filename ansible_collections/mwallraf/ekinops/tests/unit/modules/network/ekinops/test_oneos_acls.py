@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import time
+import unittest
+
+from copy import deepcopy
+
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.config.acls.acls import (  # noqa:E501
+    Acls,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.facts.acls.acls import (  # noqa:E501
+    AclsFacts,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.rm_templates.acls import (  # noqa:E501
+    AclsTemplate,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.utils import (  # noqa:E501
+    filter_config,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.compat.mock import (
+    MagicMock,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.base import (  # noqa:E501
+    load_fixture,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.helpers import (  # noqa:E501
+    legacy_acl_outputs,
+    legacy_get_acl_data,
+    legacy_sanitize_data,
+    synthetic_acl_config,
+)
+
+
+def synthetic_acls(count, remarks=True):
+    """Returns the facts of one extended ACL with count ACEs, with a
+    remark for every ACE if remarks is set
+    """
+    aces = list()
+    for idx in range(count):
+        aces.append(
+            {
+                "sequence": (idx + 1) * 10,
+                "grant": "permit",
+                "protocol_options": {"protocol": "tcp"},
+                "source": {
+                    "address": "10.%s.%s.0" % (idx // 256 % 256, idx % 256),
+                    "wildcard_bits": "0.0.0.255",
+                },
+                "destination": {"any": True},
+            }
+        )
+        if remarks:
+            aces.append({"remarks": ["customer %s" % idx]})
+    return [
+        {
+            "afi": "ipv4",
+            "acls": [{"name": "BIG", "acl_type": "extended", "aces": aces}],
+        }
+    ]
+
+
+def get_acl_facts(oneos_version, outputs, source="show"):
+    """Returns the acls facts for a OneOS version, outputs maps the
+    commands to their output
+    """
+    module = MagicMock()
+    module.oneos_version = oneos_version
+    module._oneos_capabilities = {"acl_facts_source": source}
+    connection = MagicMock()
+    connection.get.side_effect = lambda command: outputs[command]
+    facts = AclsFacts(module)
+    ansible_facts = {"ansible_network_resources": {}}
+    facts.populate_facts(connection, ansible_facts)
+    return ansible_facts["ansible_network_resources"]["acls"], connection
+
+
+class TemplateAcls(Acls):
+    """Renders every ace with addcmd and the "aces" parser, as the acls
+    module did before render_access_list_entries
+    """
+
+    def addaces(self, aces, negate=False):
+        for ace in aces:
+            self.addcmd(ace, "aces", negate=negate)
+
+
+def get_acls(state, want, have, acls_class=Acls):
+    """Returns an Acls resource module without a device connection"""
+    acls = acls_class.__new__(acls_class)
+    acls.state = state
+    acls.want = want
+    acls.have = have
+    acls.commands = []
+    acls._module = MagicMock()
+    acls._tmplt = AclsTemplate()
+    return acls
+
+
+def generate_commands(state, want, have):
+    acls = get_acls(state, deepcopy(want), deepcopy(have))
+    start = time.time()
+    acls.generate_commands()
+    return acls.commands, time.time() - start
+
+
+class TestOneosAcls(unittest.TestCase):
+    def setUp(self):
+        self.have = synthetic_acls(4)
+        self.want = deepcopy(self.have)
+        aces = self.want[0]["acls"][0]["aces"]
+        aces[2]["grant"] = "deny"
+        aces[3]["remarks"] = ["changed"]
+
+    def test_overridden(self):
+        commands, _ = generate_commands("overridden", self.want, self.have)
+        self.assertEqual(
+            commands,
+            [
+                "ip access-list extended BIG",
+                "no  permit tcp 10.0.1.0 0.0.0.255 0.0.0.0 255.255.255.255"
+                " sequence 20",
+                " deny tcp 10.0.1.0 0.0.0.255 0.0.0.0 255.255.255.255"
+                " sequence 20",
+                "no remark customer 1",
+                "remark changed",
+                "exit",
+            ],
+        )
+
+    def test_template_parity(self):
+        have = synthetic_acls(50)
+        want = deepcopy(have)
+        aces = want[0]["acls"][0]["aces"]
+        aces[10]["grant"] = "deny"
+        del aces[20:30]
+        del aces[-6:]
+        for state in ("merged", "replaced", "overridden", "deleted"):
+            if state == "merged":
+                state_want = deepcopy(have)
+                state_want[0]["acls"][0]["aces"].append(
+                    {
+                        "sequence": 1000,
+                        "grant": "deny",
+                        "source": {"any": True},
+                    }
+                )
+            else:
+                state_want = want
+            acls = get_acls(state, deepcopy(state_want), deepcopy(have))
+            acls.generate_commands()
+            legacy = get_acls(
+                state, deepcopy(state_want), deepcopy(have), TemplateAcls
+            )
+            legacy.generate_commands()
+            self.assertEqual(acls.commands, legacy.commands, state)
+            self.assertTrue(acls.commands, state)
+
+    def test_merged(self):
+        want = deepcopy(self.have)
+        want[0]["acls"][0]["aces"].append(
+            {"sequence": 100, "grant": "deny", "source": {"any": True}}
+        )
+        want[0]["acls"][0]["aces"].append({"remarks": ["new"]})
+        commands, _ = generate_commands("merged", want, self.have)
+        self.assertEqual(
+            commands,
+            [
+                "ip access-list extended BIG",
+                "remark new",
+                " deny ip 0.0.0.0 255.255.255.255 sequence 100",
+                "exit",
+            ],
+        )
+
+    def test_unchanged(self):
+        for state in ("merged", "replaced", "overridden"):
+            commands, _ = generate_commands(state, self.have, self.have)
+            self.assertEqual(commands, [], state)
+
+
+class TestOneosAclsFacts(unittest.TestCase):
+    def setUp(self):
+        self.config = synthetic_acl_config(3, 20)
+        self.show, self.remarks = legacy_acl_outputs(self.config)
+
+    def test_get_acl_data_oneos5(self):
+        module = MagicMock()
+        module.oneos_version = 5
+        connection = MagicMock()
+        outputs = {
+            "show ip access-list": self.show,
+            "alias-get-acl-remarks": self.remarks + "\nipv6 access-list V6",
+        }
+        connection.get.side_effect = lambda command: outputs[command]
+        data = AclsFacts(module).get_acl_data(connection)
+        self.assertEqual(
+            data,
+            legacy_get_acl_data(
+                self.show, self.remarks + "\nipv6 access-list V6"
+            ),
+        )
+
+    def test_sanitize_data(self):
+        data = legacy_get_acl_data(self.show, self.remarks)
+        data += "\ninterface gigabitethernet 0/0\n remark no match (1)"
+        data += "\ninterface gigabitethernet 0/1 match (2)\nexit"
+        self.assertEqual(
+            AclsFacts(None).sanitize_data(data), legacy_sanitize_data(data)
+        )
+
+    def test_default_source_oneos6(self):
+        outputs = {
+            "show ip access-list": self.show,
+            "alias-get-acl-remarks": self.remarks,
+        }
+        facts, connection = get_acl_facts(6, outputs)
+        self.assertEqual(
+            [c[0][0] for c in connection.get.call_args_list],
+            ["show ip access-list", "alias-get-acl-remarks"],
+        )
+        self.assertEqual(facts, get_acl_facts(5, outputs)[0])
+
+    def test_single_source_oneos5(self):
+        # the running-config source needs the OneOS 6 slice
+        outputs = {
+            "show ip access-list": self.show,
+            "alias-get-acl-remarks": self.remarks,
+        }
+        _, connection = get_acl_facts(5, outputs, source="running-config")
+        self.assertNotIn(
+            "alias-get-acls", [c[0][0] for c in connection.get.call_args_list]
+        )
+
+    def test_single_source_oneos6(self):
+        facts, connection = get_acl_facts(
+            6, {"alias-get-acls": self.config}, source="running-config"
+        )
+        connection.get.assert_called_once_with("alias-get-acls")
+        legacy, _ = get_acl_facts(
+            5,
+            {
+                "show ip access-list": self.show,
+                "alias-get-acl-remarks": self.remarks,
+            },
+        )
+        self.assertEqual(facts, legacy)
+        aces = facts[0]["acls"][0]["aces"]
+        self.assertEqual(len(aces), 21)
+        self.assertEqual(len(aces[-1]["remarks"]), 20)
+
+    def test_single_source_oneos6_fixture(self):
+        config = load_fixture("command_show_running-config_ip_access-list", 6)
+        facts, _ = get_acl_facts(
+            6, {"alias-get-acls": config}, source="running-config"
+        )
+        legacy, _ = get_acl_facts(
+            5,
+            {
+                "show ip access-list": load_fixture(
+                    "command_show_ip_access-list", 6
+                ),
+                "alias-get-acl-remarks": filter_config(
+                    config,
+                    include=r"(ipv6 access-list|ip access-list| remark)",
+                ),
+            },
+        )
+        self.assertEqual(facts, legacy)
+        self.assertEqual(
+            [acl["name"] for acl in facts[0]["acls"]],
+            ["BYPASS-LIST", "CONNECTED-BGP-ACL", "NAT_ACL"],
+        )
+        self.assertEqual(
+            facts[0]["acls"][0]["aces"][-1]["remarks"],
+            ["no nat for the tunnel endpoints"],
+        )
+
+
+class TestOneosAclsScaling(unittest.TestCase):
+    """generate_commands has to scale linearly with the number of ACEs,
+    a quadratic step makes the 10000 ACE run 100 times slower than the
+    1000 ACE run
+    """
+
+    sizes = (100, 1000, 10000)
+
+    def timing(self, state):
+        timing = dict()
+        for size in self.sizes:
+            have = synthetic_acls(size)
+            want = deepcopy(have)
+            for ace in want[0]["acls"][0]["aces"][::100]:
+                ace["grant"] = "deny"
+            if state == "merged":
+                want[0]["acls"][0]["aces"] = [{"remarks": ["new"]}]
+            commands, timing[size] = generate_commands(state, want, have)
+            self.assertTrue(commands)
+        return timing
+
+    def assertLinear(self, timing):
+        self.assertLess(timing[10000], max(timing[1000], 0.001) * 40, timing)
+
+    def test_overridden_scaling(self):
+        self.assertLinear(self.timing("overridden"))
+
+    def test_merged_scaling(self):
+        self.assertLinear(self.timing("merged"))
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import unittest
+
+from ansible_collections.mwallraf.ekinops.tests.benchmarks.suite import (
+    CASES,
+    compare,
+    run_benchmarks,
+)
+
+
+class TestOneosBenchmarkSuite(unittest.TestCase):
+    def test_cases_run(self):
+        for name, (setup, sizes) in CASES.items():
+            self.assertIsNotNone(setup(2)(), name)
+
+    def test_run_benchmarks(self):
+        results = run_benchmarks(["commands_add_exit"], (1, 2), rounds=1)
+        self.assertEqual(
+            [(r["case"], r["size"]) for r in results],
+            [("commands_add_exit", 1), ("commands_add_exit", 2)],
+        )
+
+    def test_compare(self):
+        baseline = {
+            "results": [
+                {"case": "a", "size": 10, "seconds": 0.01},
+                {"case": "b", "size": 10, "seconds": 0.01},
+                {"case": "c", "size": 10, "seconds": 0.0001},
+            ]
+        }
+        results = [
+            {"case": "a", "size": 10, "seconds": 0.012},
+            {"case": "b", "size": 10, "seconds": 0.02},
+            {"case": "c", "size": 10, "seconds": 0.0004},
+            {"case": "d", "size": 10, "seconds": 1},
+        ]
+        self.assertEqual(
+            compare(results, baseline, threshold=0.5, min_delta=0.0005),
+            [
+                {
+                    "case": "b",
+                    "size": 10,
+                    "seconds": 0.02,
+                    "baseline_seconds": 0.01,
+                }
+            ],
+        )
@@ -0,0 +1,713 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import re
+import shutil
+import tempfile
+import unittest
+
+from ansible.errors import AnsibleConnectionFailure
+from ansible.module_utils._text import to_text
+from ansible_collections.mwallraf.ekinops.plugins.cliconf.oneos import Cliconf
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.commands import (  # noqa:E501
+    ONEOS_PROFILES,
+    OneosCommand,
+    register_oneos_profile,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.compat.mock import (
+    MagicMock,
+    patch,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.base import (  # noqa:E501
+    load_fixture,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.helpers import (  # noqa:E501
+    FakeConnection,
+    get_cliconf,
+    legacy_get_diff,
+    synthetic_running_config,
+)
+
+
+class FakeConfigConnection(FakeConnection):
+    """Config lines return no output, lines with "invalid" in them
+    return a syntax error
+    """
+
+    def output(self, command):
+        if "invalid" in command:
+            return "% Syntax error: unknown command " + command
+        return ""
+
+
+class FakeFileConnection(FakeConfigConnection):
+    """Keeps the uploaded files, exec-script echoes the lines of the
+    uploaded file
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(FakeFileConnection, self).__init__(*args, **kwargs)
+        self.files = {}
+        self.answers = {}
+
+    def copy_file(self, source=None, destination=None, proto="scp"):
+        with open(source) as f:
+            self.files[destination] = f.read()
+
+    def send(self, command, **kwargs):
+        if kwargs.get("prompt"):
+            self.answers[to_text(command)] = (
+                to_text(kwargs["prompt"]),
+                to_text(kwargs["answer"]),
+            )
+        return super(FakeFileConnection, self).send(command, **kwargs)
+
+    def output(self, command):
+        if command.startswith("exec-script "):
+            lines = list()
+            for line in self.files[command.split(" ", 1)[1]].splitlines():
+                lines.append(line)
+                if "invalid" in line:
+                    lines.append("% Syntax error: unknown command")
+            return "\n".join(lines)
+        return super(FakeFileConnection, self).output(command)
+
+
+class FakeStartupConnection(FakeConnection):
+    """Returns the startup-config fixture, the saved copy of the
+    running-config fixture without the OneOS 5 running-config header
+    """
+
+    startup_commands = ("show startup-config", "cat /BSA/config/bsaStart.cfg")
+
+    def output(self, command):
+        if command in self.startup_commands:
+            return load_fixture("startup-config", self.oneos_version)
+        return super(FakeStartupConnection, self).output(command)
+
+
+class TestOneosCliconfVersion(unittest.TestCase):
+    def setUp(self):
+        self.cache_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_path)
+
+    def test_oneos_version_detected_once(self):
+        connection = FakeConnection(oneos_version=6)
+        cliconf = get_cliconf(connection)
+        self.assertEqual(cliconf.oneos_version, 6)
+        self.assertEqual(cliconf.oneos_version, 6)
+        self.assertEqual(connection.sent, ["show version"])
+
+    def test_oneos_version_from_option(self):
+        connection = FakeConnection(oneos_version=6)
+        cliconf = get_cliconf(connection, oneos_version="5")
+        self.assertEqual(cliconf.oneos_version, 5)
+        self.assertEqual(connection.sent, [])
+
+    def test_minor_version_profile_from_option(self):
+        register_oneos_profile(
+            "6.5", COMMANDMAP={"alias-get-hostname": "show hostname"}
+        )
+        self.addCleanup(ONEOS_PROFILES.pop, "6.5", None)
+        cliconf = get_cliconf(FakeConnection(), oneos_version="6.5")
+        self.assertEqual(cliconf.oneos_version, 6)
+        self.assertEqual(cliconf.oneos_full_version, "6.5")
+        self.assertEqual(
+            cliconf.translate_command("alias-get-hostname"), "show hostname"
+        )
+        self.assertEqual(
+            cliconf.get_device_operations(), Cliconf.ONEOS6_OPERATIONS
+        )
+
+    def test_minor_version_profile_detected(self):
+        register_oneos_profile(
+            "6.2", COMMANDMAP={"alias-get-hostname": "show hostname"}
+        )
+        self.addCleanup(ONEOS_PROFILES.pop, "6.2", None)
+        connection = FakeConnection(oneos_version=6)
+        cliconf = get_cliconf(connection)
+        self.assertEqual(
+            cliconf.translate_command("alias-get-hostname"), "show hostname"
+        )
+        self.assertEqual(cliconf.oneos_full_version, "6.2.2")
+        self.assertEqual(cliconf.oneos_version, 6)
+        self.assertEqual(connection.sent, ["show version"])
+
+    def test_oneos_version_unsupported_option(self):
+        cliconf = get_cliconf(FakeConnection(), oneos_version="7")
+        with self.assertRaises(ValueError):
+            cliconf.oneos_version
+
+    def test_oneos_version_from_disk_cache(self):
+        connection = FakeConnection(oneos_version=5)
+        cliconf = get_cliconf(connection, version_cache_path=self.cache_path)
+        self.assertEqual(cliconf.oneos_version, 5)
+        self.assertEqual(connection.sent, ["show version"])
+
+        connection = FakeConnection(oneos_version=5)
+        cliconf = get_cliconf(connection, version_cache_path=self.cache_path)
+        self.assertEqual(cliconf.oneos_version, 5)
+        self.assertEqual(connection.sent, [])
+
+    def test_oneos_version_cache_serial_mismatch(self):
+        connection = FakeConnection(oneos_version=6)
+        cliconf = get_cliconf(connection, version_cache_path=self.cache_path)
+        cliconf.version_cache.set("oneos_version", 5, serial_number="OLD")
+
+        self.assertEqual(cliconf.oneos_version, 5)
+        cliconf._verify_oneos_version("NEW")
+        self.assertEqual(cliconf.oneos_version, 6)
+        self.assertEqual(
+            cliconf.version_cache.get("oneos_version", serial_number="NEW"),
+            "6.2.2",
+        )
+
+    def test_oneos_version_in_capabilities(self):
+        connection = FakeConnection(oneos_version=6)
+        cliconf = get_cliconf(connection, oneos_version="6")
+        cliconf.get_device_info = MagicMock(return_value={})
+        capabilities = cliconf.get_capabilities()
+        self.assertIn('"oneos_version": 6', capabilities)
+
+
+class TestOneosCliconfRunCommands(unittest.TestCase):
+    commands = ["show version", "show system status", "show sntp"]
+
+    def test_run_commands_sequential(self):
+        connection = FakeConnection(oneos_version=5)
+        cliconf = get_cliconf(connection, oneos_version="5")
+        responses = cliconf.run_commands(self.commands)
+        self.assertEqual(connection.sent, self.commands)
+        self.assertEqual(len(responses), 3)
+
+    def test_run_commands_batched(self):
+        connection = FakeConnection(oneos_version=5)
+        cliconf = get_cliconf(
+            connection, oneos_version="5", batch_commands=True
+        )
+        responses = cliconf.run_commands(self.commands)
+        self.assertEqual(connection.sent, ["\r".join(self.commands)])
+        self.assertEqual(
+            responses,
+            [connection.output(cmd).strip() for cmd in self.commands],
+        )
+        # terminal error detection is restored after the batch
+        self.assertIsNone(connection.options["terminal_stderr_re"])
+
+    def test_run_commands_timing(self):
+        connection = FakeConnection(oneos_version=5)
+        cliconf = get_cliconf(
+            connection, oneos_version="5", batch_commands=True
+        )
+        cliconf.run_commands(self.commands)
+        timing = cliconf.get_command_timing()
+        self.assertEqual([t["command"] for t in timing], self.commands)
+
+    def test_run_commands_reuses_device_info_output(self):
+        connection = FakeConnection(oneos_version=5)
+        cliconf = get_cliconf(connection, oneos_version="5")
+        cliconf.get_device_info()
+        sent = list(connection.sent)
+        self.assertIn("show system hardware", sent)
+
+        responses = cliconf.run_commands(["show system hardware"])
+        self.assertEqual(connection.sent, sent)
+        self.assertEqual(
+            responses, [connection.output("show system hardware").strip()]
+        )
+
+    def test_run_commands_json_output(self):
+        connection = FakeConnection(oneos_version=5)
+        output = connection.output
+        connection.output = lambda command: (
+            ' {"hostname": "lab"}'
+            if command == "show json"
+            else output(command)
+        )
+        cliconf = get_cliconf(connection, oneos_version="5")
+        with patch("json.loads", wraps=json.loads) as loads:
+            responses = cliconf.run_commands(self.commands + ["show json"])
+        # text outputs are not passed to json.loads
+        loads.assert_called_once_with('{"hostname": "lab"}')
+        self.assertEqual(responses[-1], {"hostname": "lab"})
+
+    def test_run_commands_batched_prompt_answer(self):
+        connection = FakeConnection(oneos_version=5)
+        cliconf = get_cliconf(
+            connection, oneos_version="5", batch_commands=True
+        )
+        cliconf.send_command = MagicMock(return_value="done")
+        commands = [
+            "show version",
+            "show sntp",
+            {"command": "reboot", "prompt": "[yes/no]", "answer": "yes"},
+            "show system status",
+        ]
+        responses = cliconf.run_commands(commands)
+        self.assertEqual(connection.sent, ["show version\rshow sntp"])
+        self.assertEqual(cliconf.send_command.call_count, 2)
+        self.assertEqual(len(responses), 4)
+
+    def test_run_commands_batched_error(self):
+        connection = FakeConnection(oneos_version=5)
+        cliconf = get_cliconf(
+            connection, oneos_version="5", batch_commands=True
+        )
+        commands = ["show version", "show unknown"]
+        responses = cliconf.run_commands(commands, check_rc=False)
+        self.assertIn("Syntax error", responses[1])
+        with self.assertRaises(AnsibleConnectionFailure):
+            cliconf.run_commands(commands)
+
+    def test_run_commands_batched_slow_prompt(self):
+        connection = FakeConnection(oneos_version=5)
+        cliconf = get_cliconf(connection, oneos_version="5")
+        output = connection.send("\r".join(self.commands))
+        first, last = output.split(FakeConnection.prompt + "show sntp")
+        connection.send = MagicMock(return_value=first)
+        connection.pending = [FakeConnection.prompt + "show sntp" + last]
+        responses, elapsed = cliconf._run_command_batch(
+            [{"command": cmd} for cmd in self.commands]
+        )
+        self.assertEqual(len(responses), 3)
+        self.assertEqual(len(elapsed), 3)
+        self.assertEqual(responses[2], connection.output("show sntp").strip())
+
+    def test_run_commands_batched_unexpected_echo(self):
+        connection = FakeConnection(oneos_version=5)
+        cliconf = get_cliconf(connection, oneos_version="5")
+        # the device does not echo the commands, every prompt is received
+        # but the output can not be split
+        output = "\n".join(
+            connection.output(cmd) + "\n" + connection.prompt
+            for cmd in self.commands
+        )
+        connection.send = MagicMock(return_value=output)
+        with self.assertRaises(AnsibleConnectionFailure) as error:
+            cliconf._run_command_batch(
+                [{"command": cmd} for cmd in self.commands]
+            )
+        self.assertIn("batch_commands", str(error.exception))
+
+    def test_run_commands_batched_no_progress(self):
+        connection = FakeConnection(oneos_version=5)
+        cliconf = get_cliconf(connection, oneos_version="5")
+        output = "show version\n%s\n%s" % (
+            connection.output("show version"),
+            connection.prompt,
+        )
+        connection.send = MagicMock(return_value=output)
+        # the next command is echoed differently
+        connection.pending = ["SHOW SYSTEM STATUS\n" + connection.prompt]
+        with self.assertRaises(AnsibleConnectionFailure):
+            cliconf._run_command_batch(
+                [{"command": cmd} for cmd in self.commands]
+            )
+
+
+class TestOneosCliconfRunningConfigCache(unittest.TestCase):
+    aliases = [
+        "alias-get-hostname",
+        "alias-get-interface-acl",
+        "alias-get-acl-remarks",
+    ]
+
+    def test_aliases_served_from_snapshot(self):
+        connection = FakeConnection(oneos_version=6)
+        cliconf = get_cliconf(
+            connection, oneos_version="6", running_config_cache=True
+        )
+        responses = cliconf.run_commands(
+            self.aliases + ["show running-config"]
+        )
+        self.assertEqual(connection.sent, ["show running-config"])
+        self.assertEqual(responses[0], "hostname lab-lbb150")
+        self.assertEqual(
+            responses[1],
+            connection.running_config_output(
+                "interface", "(interface|access-group)"
+            ),
+        )
+        self.assertEqual(
+            responses[2],
+            connection.running_config_output(
+                "ip access-list", "(ipv6 access-list|ip access-list| remark)"
+            ),
+        )
+
+    def test_aliases_match_device_output(self):
+        for version in (5, 6):
+            aliases = OneosCommand(version).config_slices
+            connection = FakeConnection(oneos_version=version)
+            cliconf = get_cliconf(
+                connection,
+                oneos_version=str(version),
+                running_config_cache=False,
+            )
+            expected = cliconf.run_commands(list(aliases))
+            self.assertNotIn("show running-config", connection.sent)
+
+            cliconf = get_cliconf(
+                connection,
+                oneos_version=str(version),
+                running_config_cache=True,
+            )
+            connection.sent = []
+            self.assertEqual(cliconf.run_commands(list(aliases)), expected)
+            self.assertEqual(connection.sent, ["show running-config"])
+
+    def test_aliases_not_batched(self):
+        connection = FakeConnection(oneos_version=6)
+        cliconf = get_cliconf(
+            connection,
+            oneos_version="6",
+            batch_commands=True,
+            running_config_cache=True,
+        )
+        cliconf.run_commands(self.aliases)
+        self.assertEqual(connection.sent, ["show running-config"])
+
+    def test_snapshot_invalidated_by_config_change(self):
+        connection = FakeConnection(oneos_version=6)
+        cliconf = get_cliconf(
+            connection, oneos_version="6", running_config_cache=True
+        )
+        cliconf.send_command("alias-get-hostname")
+        cliconf.send_command("show version")
+        cliconf.send_command("alias-get-hostname")
+        self.assertEqual(connection.sent.count("show running-config"), 1)
+
+        cliconf.send_command("write mem")
+        cliconf.send_command("alias-get-hostname")
+        self.assertEqual(connection.sent.count("show running-config"), 2)
+
+    def test_device_info_invalidated_with_snapshot(self):
+        connection = FakeConnection(oneos_version=6)
+        cliconf = get_cliconf(
+            connection, oneos_version="6", running_config_cache=True
+        )
+        cliconf.get_device_info()
+        self.assertTrue(cliconf._device_info)
+        cliconf.send_command("show version")
+        self.assertTrue(cliconf._device_info)
+
+        cliconf.send_command("hostname new-name")
+        self.assertEqual(cliconf._device_info, {})
+        self.assertIsNone(cliconf._running_config)
+
+    def test_snapshot_disabled_by_default(self):
+        connection = FakeConnection(oneos_version=6)
+        cliconf = get_cliconf(connection, oneos_version="6")
+        cliconf.send_command("alias-get-hostname")
+        cliconf.send_command("alias-get-hostname")
+        self.assertEqual(connection.sent, ["show running-config hostname"] * 2)
+
+
+class TestOneosCliconfFactCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_path)
+
+    def test_device_info_from_fact_cache(self):
+        connection = FakeConnection(oneos_version=6)
+        cliconf = get_cliconf(
+            connection, oneos_version="6", fact_cache_path=self.cache_path
+        )
+        device_info = cliconf.get_device_info()
+        self.assertIn("show product-info-area", connection.sent)
+        self.assertIn("show system hardware", connection.sent)
+
+        connection = FakeConnection(oneos_version=6)
+        cliconf = get_cliconf(
+            connection, oneos_version="6", fact_cache_path=self.cache_path
+        )
+        self.assertEqual(cliconf.get_device_info(), device_info)
+        self.assertEqual(
+            connection.sent, ["hostname", "show product-info-area"]
+        )
+
+    def test_fact_cache_other_serial_number(self):
+        connection = FakeConnection(oneos_version=6)
+        cliconf = get_cliconf(
+            connection, oneos_version="6", fact_cache_path=self.cache_path
+        )
+        cliconf.get_device_info()
+
+        connection = FakeConnection(oneos_version=6)
+        connection.serial_number = "T1914008214019999"
+        cliconf = get_cliconf(
+            connection, oneos_version="6", fact_cache_path=self.cache_path
+        )
+        device_info = cliconf.get_device_info()
+        self.assertEqual(
+            device_info["network_os_serial_number"], "T1914008214019999"
+        )
+        self.assertEqual(
+            connection.sent,
+            ["hostname", "show product-info-area", "show system hardware"],
+        )
+
+    def test_fact_cache_ttl(self):
+        connection = FakeConnection(oneos_version=5)
+        cliconf = get_cliconf(
+            connection,
+            oneos_version="5",
+            fact_cache_path=self.cache_path,
+            fact_cache_ttl={"boot": 0},
+        )
+        cliconf.run_commands(["ls /BSA/binaries", "show system hardware"])
+        cliconf.run_commands(["ls /BSA/binaries", "show system hardware"])
+        self.assertEqual(
+            connection.sent,
+            [
+                "ls /BSA/binaries",
+                "show product-info-area",
+                "show system hardware",
+                "ls /BSA/binaries",
+            ],
+        )
+
+
+class TestOneosCliconfGetDiff(unittest.TestCase):
+    candidates = [
+        # unchanged block
+        "interface gigabitethernet 0/1\n description customer 1\nexit",
+        # changed block
+        "interface gigabitethernet 0/2\n description changed\n"
+        " ip address 10.0.2.1 255.255.255.0\nexit",
+        # new block and top-level line
+        "interface gigabitethernet 9/9\n description new\nexit\n"
+        "hostname lab-lbb150\nip route 10.0.0.0 255.0.0.0 10.0.0.2",
+        # nested block
+        "ip access-list extended ACL-3\n permit ip any any\nexit",
+    ]
+
+    def setUp(self):
+        self.running = synthetic_running_config(6, 50)
+
+    def test_get_diff_parity(self):
+        cliconf = get_cliconf(FakeConnection(), oneos_version="6")
+        for candidate in self.candidates:
+            for match in ("line", "strict", "exact"):
+                for replace in ("line", "block"):
+                    diff = cliconf.get_diff(
+                        candidate,
+                        self.running,
+                        diff_match=match,
+                        diff_replace=replace,
+                    )
+                    self.assertEqual(
+                        diff["config_diff"],
+                        legacy_get_diff(
+                            candidate, self.running, match, replace
+                        ),
+                        (candidate, match, replace),
+                    )
+
+    def test_get_diff_path_parity(self):
+        cliconf = get_cliconf(FakeConnection(), oneos_version="6")
+        path = ["interface gigabitethernet 0/2"]
+        candidate = "interface gigabitethernet 0/2\n description changed"
+        for match in ("line", "strict", "exact"):
+            diff = cliconf.get_diff(
+                candidate, self.running, diff_match=match, path=path
+            )
+            self.assertEqual(
+                diff["config_diff"],
+                legacy_get_diff(candidate, self.running, match, "line", path),
+            )
+
+    def test_running_index_cached(self):
+        cliconf = get_cliconf(FakeConnection(), oneos_version="6")
+        cliconf.get_diff(self.candidates[0], self.running)
+        index = cliconf._running_index
+        cliconf.get_diff(self.candidates[1], self.running)
+        self.assertIs(cliconf._running_index, index)
+        cliconf.get_diff(self.candidates[1], self.running + "\nsnmp")
+        self.assertIsNot(cliconf._running_index, index)
+
+
+class TestOneosCliconfEditConfig(unittest.TestCase):
+    candidate = [
+        "interface gigabitethernet 0/1",
+        " description uplink",
+        " ip address 10.0.0.1 255.255.255.0",
+        "exit",
+        "ip route 0.0.0.0 0.0.0.0 10.0.0.254",
+    ]
+
+    def test_edit_config_per_line(self):
+        connection = FakeConfigConnection()
+        cliconf = get_cliconf(connection, oneos_version="6")
+        resp = cliconf.edit_config(self.candidate)
+        self.assertEqual(
+            connection.sent,
+            ["end", "configure terminal"] + self.candidate + ["end"],
+        )
+        self.assertEqual(resp["request"], self.candidate)
+
+    def test_edit_config_chunked(self):
+        connection = FakeConfigConnection()
+        cliconf = get_cliconf(connection, oneos_version="6")
+        resp = cliconf.edit_config(self.candidate, chunk_size=3)
+        stripped = [line.strip() for line in self.candidate]
+        self.assertEqual(
+            connection.sent,
+            [
+                "end",
+                "configure terminal",
+                "\r".join(stripped[:3]),
+                "\r".join(stripped[3:]),
+                "end",
+            ],
+        )
+        self.assertEqual(resp["request"], self.candidate)
+        self.assertEqual(resp["response"], [""] * 5)
+
+    def test_edit_config_chunked_prompt_answer(self):
+        connection = FakeConfigConnection()
+        cliconf = get_cliconf(connection, oneos_version="6")
+        candidate = self.candidate[:2] + [
+            {"command": "no ip route", "prompt": "[y/n]", "answer": "y"}
+        ]
+        cliconf.edit_config(candidate, chunk_size=10)
+        self.assertEqual(
+            connection.sent[2:4],
+            [
+                "interface gigabitethernet 0/1\rdescription uplink",
+                "no ip route",
+            ],
+        )
+
+    def test_edit_config_chunked_error(self):
+        connection = FakeConfigConnection()
+        cliconf = get_cliconf(connection, oneos_version="6")
+        candidate = self.candidate[:2] + [" invalid line"] + self.candidate[2:]
+        with self.assertRaises(AnsibleConnectionFailure) as ctx:
+            cliconf.edit_config(candidate, chunk_size=10)
+        self.assertIn("invalid line: % Syntax error", str(ctx.exception))
+        self.assertIn("1 line(s)", str(ctx.exception))
+
+
+class TestOneosCliconfApplyConfigFile(unittest.TestCase):
+    candidate = TestOneosCliconfEditConfig.candidate
+    path = "/BSA/config/ansible-candidate.cfg"
+
+    def test_apply_config_file(self):
+        for oneos_version in ("5", "6"):
+            connection = FakeFileConnection(oneos_version=int(oneos_version))
+            cliconf = get_cliconf(connection, oneos_version=oneos_version)
+            resp = cliconf.apply_config_file(self.candidate + ["end"])
+            self.assertEqual(
+                connection.files[self.path].splitlines(),
+                ["configure terminal"] + self.candidate + ["end"],
+            )
+            self.assertEqual(
+                connection.sent,
+                ["exec-script " + self.path, "rm " + self.path],
+            )
+            self.assertEqual(resp["request"], self.candidate)
+            self.assertEqual(resp["errors"], [])
+
+    def test_apply_config_file_remove_prompt(self):
+        connection = FakeFileConnection()
+        cliconf = get_cliconf(connection, oneos_version="6")
+        cliconf.apply_config_file(self.candidate)
+        prompt, answer = connection.answers["rm " + self.path]
+        self.assertTrue(re.search(prompt, "Remove file ? [y/n]"))
+        self.assertEqual(answer, "y")
+        self.assertNotIn("exec-script " + self.path, connection.answers)
+
+    def test_apply_config_file_errors(self):
+        connection = FakeFileConnection()
+        cliconf = get_cliconf(connection, oneos_version="6")
+        candidate = list(self.candidate)
+        candidate.insert(2, " invalid line")
+        resp = cliconf.apply_config_file(candidate)
+        self.assertEqual(
+            resp["errors"],
+            [
+                {
+                    "line": 3,
+                    "command": " invalid line",
+                    "error": "% Syntax error: unknown command",
+                }
+            ],
+        )
+        # the file is removed when the apply fails
+        self.assertEqual(connection.sent[-1], "rm " + self.path)
+
+
+class TestOneosCliconfConfigDigest(unittest.TestCase):
+    def test_startup_digest(self):
+        for oneos_version, command in (
+            (5, "cat /BSA/config/bsaStart.cfg"),
+            (6, "show startup-config"),
+        ):
+            connection = FakeStartupConnection(oneos_version=oneos_version)
+            cliconf = get_cliconf(connection, oneos_version=str(oneos_version))
+            self.assertEqual(
+                cliconf.get_config_digest("running"),
+                cliconf.get_config_digest("startup"),
+            )
+            self.assertIn(command, connection.sent)
+
+    def test_startup_digest_oneos5_header(self):
+        connection = FakeStartupConnection(oneos_version=5)
+        cliconf = get_cliconf(connection, oneos_version="5")
+        running = cliconf.get_config(source="running")
+        self.assertTrue(running.startswith("Building configuration..."))
+        self.assertEqual(
+            cliconf.get_config_digest("running"),
+            cliconf.get_config_digest("startup"),
+        )
+
+        # a changed running-config is still detected
+        connection.output = lambda command: "hostname other\n" + (
+            FakeStartupConnection.output(connection, command)
+        )
+        cliconf.send_command("hostname other")
+        self.assertNotEqual(
+            cliconf.get_config_digest("running"),
+            cliconf.get_config_digest("startup"),
+        )
+
+    def test_startup_digest_cached(self):
+        connection = FakeStartupConnection(oneos_version=6)
+        cliconf = get_cliconf(connection, oneos_version="6")
+        cliconf.get_config_digest("startup")
+        cliconf.get_config_digest("startup")
+        self.assertEqual(connection.sent.count("show startup-config"), 1)
+
+        # a different diff_ignore_lines has its own digest
+        cliconf.get_config_digest("startup", ["hostname .*"])
+        self.assertEqual(connection.sent.count("show startup-config"), 2)
+
+        cliconf.send_command("write mem")
+        cliconf.get_config_digest("startup")
+        self.assertEqual(connection.sent.count("show startup-config"), 3)
+
+    def test_digest_ignore_lines(self):
+        connection = FakeStartupConnection(oneos_version=6)
+        cliconf = get_cliconf(connection, oneos_version="6")
+        running = cliconf.get_config_digest("running", ["hostname .*"])
+        cliconf.send_command("hostname other")
+        connection.output = lambda command: "hostname other\n" + (
+            FakeConnection.output(connection, command)
+        )
+        self.assertNotEqual(running, cliconf.get_config_digest("running"))
+        self.assertEqual(
+            running, cliconf.get_config_digest("running", ["hostname .*"])
+        )
@@ -8,8 +8,16 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import unittest
+
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.facts.legacy.base import (  # noqa:E501
+    CommandParser,
+)
 from ansible_collections.mwallraf.ekinops.plugins.modules import oneos_command
-from ansible_collections.mwallraf.ekinops.tests.unit.compat.mock import patch
+from ansible_collections.mwallraf.ekinops.tests.unit.compat.mock import (
+    MagicMock,
+    patch,
+)
 from ansible_collections.mwallraf.ekinops.tests.unit.modules.utils import (
     set_module_args,
 )
@@ -33,9 +41,17 @@ class TestOneOsCommandModule(TestOneOsModule):
 
         self.run_commands = self.mock_run_commands.start()
 
+        self.mock_get_oneos_version = patch(
+            "ansible_collections.mwallraf.ekinops.plugins.module_utils."
+            "network.oneos.facts.legacy.base.get_oneos_version"
+        )
+        self.get_oneos_version = self.mock_get_oneos_version.start()
+        self.get_oneos_version.return_value = 6
+
     def tearDown(self):
         super(TestOneOsCommandModule, self).tearDown()
         self.mock_run_commands.stop()
+        self.mock_get_oneos_version.stop()
 
     def load_fixtures(self, commands=None):
         def load_from_file(*args, **kwargs):
@@ -188,3 +204,192 @@ class TestOneOsCommandModule(TestOneOsModule):
         )
         result = self.execute_module()
         self.assertNotEqual(result["warnings"], [])
+
+    def test_oneos_command_structured(self):
+        set_module_args(
+            dict(
+                commands=[
+                    {"command": "show system status", "oneos_version": 6},
+                    {"command": "show interfaces", "oneos_version": 6},
+                    {"command": "show version", "oneos_version": 6},
+                ],
+                output="structured",
+            )
+        )
+        result = self.execute_module()
+        status, interfaces, version = result["parsed"]
+        self.assertEqual(
+            status["software"]["software_version"],
+            "OneOS-pCPE-ARM_pi1-6.2.2",
+        )
+        self.assertEqual(len(status["cpu"]), 2)
+        self.assertIn("GigabitEthernet 0/0", interfaces)
+        self.assertIsNone(version)
+        self.assertEqual(len(result["stdout"]), 3)
+
+    def test_oneos_command_structured_acls(self):
+        set_module_args(
+            dict(
+                commands=[
+                    {"command": "show ip access-list", "oneos_version": 6}
+                ],
+                output="structured",
+            )
+        )
+        result = self.execute_module()
+        acls = result["parsed"][0][0]["acls"]
+        self.assertEqual(
+            [acl["name"] for acl in acls],
+            ["BYPASS-LIST", "CONNECTED-BGP-ACL", "NAT_ACL"],
+        )
+        self.assertEqual(len(acls[0]["aces"]), 5)
+        self.assertEqual(
+            acls[2]["aces"][0]["source"],
+            {"address": "192.168.100.0", "wildcard_bits": "0.0.0.255"},
+        )
+
+    def test_oneos_command_text(self):
+        set_module_args(dict(commands=["show version"]))
+        result = self.execute_module()
+        self.assertNotIn("parsed", result)
+
+    def execute_waiting(self, failed=False, **kwargs):
+        """Runs the module with wait_for, returns the result and the
+        intervals it slept
+        """
+        set_module_args(dict(commands=["show version"], **kwargs))
+        with patch(
+            "ansible_collections.mwallraf.ekinops.plugins.modules."
+            "oneos_command.time.sleep"
+        ) as sleep:
+            result = self.execute_module(failed=failed)
+        return result, [call[0][0] for call in sleep.call_args_list]
+
+    def test_oneos_command_wait_for_reruns_unsatisfied(self):
+        set_module_args(
+            dict(
+                commands=["show version", "show system status"],
+                wait_for=[
+                    'result[0] contains "ONEOS"',
+                    'result[1] contains "test"',
+                ],
+                retries=3,
+            )
+        )
+        with patch(
+            "ansible_collections.mwallraf.ekinops.plugins.modules."
+            "oneos_command.time.sleep"
+        ):
+            result = self.execute_module(failed=True)
+        commands = [call[0][1] for call in self.run_commands.call_args_list]
+        self.assertEqual(
+            commands,
+            [["show version", "show system status"]]
+            + [["show system status"]] * 2,
+        )
+        self.assertEqual(
+            result["failed_conditions"], ['result[1] contains "test"']
+        )
+        first, second = result["wait_for_timing"]
+        self.assertTrue(first["satisfied"])
+        self.assertEqual(first["attempts"], 1)
+        self.assertFalse(second["satisfied"])
+        self.assertIsNone(second["seconds"])
+        self.assertEqual(second["attempts"], 3)
+
+    def test_oneos_command_wait_for_timing(self):
+        result, intervals = self.execute_waiting(
+            wait_for='result[0] contains "ONEOS"'
+        )
+        self.assertEqual(intervals, [])
+        timing = result["wait_for_timing"]
+        self.assertEqual(
+            timing[0]["conditional"], 'result[0] contains "ONEOS"'
+        )
+        self.assertTrue(timing[0]["satisfied"])
+        self.assertGreaterEqual(timing[0]["seconds"], 0)
+
+    def test_oneos_command_wait_for_backoff(self):
+        result, intervals = self.execute_waiting(
+            failed=True,
+            wait_for='result[0] contains "test"',
+            retries=5,
+            backoff=2,
+            max_interval=3,
+        )
+        self.assertEqual(intervals, [1, 2, 3, 3])
+        self.assertEqual(self.run_commands.call_count, 5)
+
+    def test_oneos_command_wait_for_jitter(self):
+        result, intervals = self.execute_waiting(
+            failed=True,
+            wait_for='result[0] contains "test"',
+            retries=20,
+            interval=10,
+            jitter=0.2,
+        )
+        self.assertEqual(len(intervals), 19)
+        self.assertTrue(all(8 <= i <= 12 for i in intervals), intervals)
+        self.assertGreater(len(set(intervals)), 1)
+
+    def test_oneos_command_wait_for_timeout(self):
+        result, intervals = self.execute_waiting(
+            failed=True, wait_for='result[0] contains "test"', timeout=0
+        )
+        self.assertEqual(intervals, [])
+        self.assertEqual(self.run_commands.call_count, 1)
+
+
+class TestOneosCommandParser(unittest.TestCase):
+    def test_parser_lookup(self):
+        module = MagicMock()
+        module.oneos_version = 6
+        parser = CommandParser(module)
+        interfaces = parser.get_parser("show interfaces")
+        self.assertEqual(interfaces.__name__, "parse_interface_facts")
+        self.assertEqual(
+            parser.get_parser("show  interfaces gigabitethernet 0/0"),
+            interfaces,
+        )
+        self.assertEqual(
+            parser.get_parser("show memory details").__name__, "parse_memory"
+        )
+        self.assertIsNone(parser.get_parser("show interfaces | include up"))
+        self.assertIsNone(parser.get_parser("show version"))
+        # the facts classes are instantiated once
+        self.assertEqual(
+            set(type(inst).__name__ for inst in parser._instances.values()),
+            set(["Interfaces", "Hardware"]),
+        )
+
+    def test_parse(self):
+        parser = CommandParser(MagicMock())
+        self.assertEqual(
+            parser.parse(
+                "show ip access-list",
+                "ip access-list extended NAT\n  10 permit ip any any "
+                "(4 matches)",
+            ),
+            [
+                {
+                    "afi": "ipv4",
+                    "acls": [
+                        {
+                            "name": "NAT",
+                            "acl_type": "extended",
+                            "aces": [
+                                {
+                                    "sequence": 10,
+                                    "grant": "permit",
+                                    "protocol_options": {"protocol": "ip"},
+                                    "source": {"any": True},
+                                    "destination": {"any": True},
+                                }
+                            ],
+                        }
+                    ],
+                }
+            ],
+        )
+        self.assertEqual(parser.parse("show json", {"a": 1}), {"a": 1})
+        self.assertIsNone(parser.parse("show version", "text"))
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import unittest
+
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.commands import (  # noqa:E501
+    ONEOS_PROFILES,
+    OneosCommand,
+    OneosCommandV6,
+    UnsupportedOneosVersion,
+    register_oneos_profile,
+)
+
+
+class TestOneosCommand(unittest.TestCase):
+    def tearDown(self):
+        ONEOS_PROFILES.pop("6.5", None)
+
+    def test_major_versions(self):
+        self.assertEqual(
+            OneosCommand(5).get("alias-get-hostname"),
+            "show running-config | i hostname",
+        )
+        self.assertEqual(
+            OneosCommand("6").get("alias-get-hostname"),
+            "show running-config hostname",
+        )
+        self.assertIsNone(OneosCommand(6).get("show version"))
+
+    def test_unsupported_version(self):
+        with self.assertRaises(UnsupportedOneosVersion):
+            OneosCommand(7)
+
+    def test_minor_version_profile(self):
+        register_oneos_profile(
+            "6.5", COMMANDMAP={"alias-get-hostname": "show hostname"}
+        )
+        command = OneosCommand("6.5.1")
+        self.assertEqual(command.get("alias-get-hostname"), "show hostname")
+        # everything else is inherited from the major version
+        self.assertEqual(
+            command.get("alias-get-acl-remarks"),
+            OneosCommandV6.COMMANDMAP["alias-get-acl-remarks"],
+        )
+        self.assertEqual(
+            command.facts_hardware_commands,
+            OneosCommandV6.COMMANDS_HARDWARE_FACTS,
+        )
+        # other minor versions keep using the major version profile
+        self.assertEqual(
+            OneosCommand("6.3").get("alias-get-hostname"),
+            "show running-config hostname",
+        )
+
+    def test_fact_group(self):
+        command = OneosCommand(5)
+        self.assertEqual(command.get_fact_group("ls /BSA/binaries"), "boot")
+        self.assertIsNone(command.get_fact_group("show version"))
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import unittest
+
+from ansible_collections.mwallraf.ekinops.plugins.modules import oneos_config
+from ansible_collections.mwallraf.ekinops.tests.unit.compat.mock import (
+    MagicMock,
+)
+
+
+class TestOneosConfigApplyFile(unittest.TestCase):
+    commands = [
+        "interface gigabitethernet 0/1",
+        " invalid line",
+        " description uplink",
+        "exit",
+    ]
+
+    def apply(self, errors):
+        module = MagicMock()
+        connection = MagicMock()
+        connection.apply_config_file.return_value = {
+            "request": self.commands,
+            "response": "",
+            "errors": errors,
+        }
+        oneos_config.apply_config_file(module, connection, self.commands)
+        return module
+
+    def test_apply_config_file(self):
+        module = self.apply([])
+        module.fail_json.assert_not_called()
+
+    def test_apply_config_file_partial(self):
+        errors = [
+            {
+                "line": 2,
+                "command": " invalid line",
+                "error": "% Syntax error: unknown command",
+            }
+        ]
+        module = self.apply(errors)
+        module.fail_json.assert_called_once_with(
+            msg="configuration failed on 1 line(s)",
+            errors=errors,
+            commands=self.commands,
+            applied=[
+                "interface gigabitethernet 0/1",
+                " description uplink",
+                "exit",
+            ],
+            changed=True,
+        )
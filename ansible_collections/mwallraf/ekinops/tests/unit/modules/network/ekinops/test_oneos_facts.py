@@ -9,7 +9,15 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 from ansible_collections.mwallraf.ekinops.plugins.modules import oneos_facts
-from ansible_collections.mwallraf.ekinops.tests.unit.compat.mock import patch
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.facts.legacy.base import (  # noqa:E501
+    AclCounters,
+    Interfaces,
+    StreamingInterfaces,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.compat.mock import (
+    MagicMock,
+    patch,
+)
 from ansible_collections.mwallraf.ekinops.tests.unit.modules.utils import (
     set_module_args,
     AnsibleFailJson,
@@ -35,6 +43,17 @@ class TestOneosFactsModule(TestOneOsModule):
             "ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.facts.legacy.base.get_capabilities"
         )
         self.get_capabilities = self.mock_get_capabilities.start()
+
+        self.mock_get_oneos_version = patch(
+            "ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.facts.legacy.base.get_oneos_version"
+        )
+        self.get_oneos_version = self.mock_get_oneos_version.start()
+        self.get_oneos_version.return_value = 5
+
+        self.mock_get_command_timing = patch(
+            "ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.facts.legacy.base.get_command_timing"
+        )
+        self.get_command_timing = self.mock_get_command_timing.start()
         # self.get_capabilities.return_value = {
         #     "device_info": {
         #         "ansible_net_hostname": "lab-lbb150",
@@ -55,6 +74,8 @@ class TestOneosFactsModule(TestOneOsModule):
         super(TestOneosFactsModule, self).tearDown()
         self.mock_run_commands.stop()
         self.mock_get_capabilities.stop()
+        self.mock_get_oneos_version.stop()
+        self.mock_get_command_timing.stop()
 
     def load_fixtures(self, commands=None):
         def load_from_file(*args, **kwargs):
@@ -86,3 +107,172 @@ class TestOneosFactsModule(TestOneOsModule):
         #     result["ansible_facts"]["ansible_net_version"],
         #     "64-bit Advanced Core OS (ACOS) version 4.1.1-P9, build 105 (Sep-21-2018,22:25)",
         # )
+
+    def load_empty_fixtures(self, commands=None):
+        self.run_commands.side_effect = lambda *args, **kwargs: [
+            "" for command in kwargs["commands"]
+        ]
+
+    def test_oneos_facts_single_run_commands(self):
+        self.load_fixtures = self.load_empty_fixtures
+        set_module_args(dict(gather_subset=["hardware", "config"]))
+        self.execute_module()
+        self.assertEqual(self.run_commands.call_count, 1)
+        commands = self.run_commands.call_args[1]["commands"]
+        self.assertEqual(len(commands), len(set(commands)))
+        self.assertIn("show system status", commands)
+        self.assertIn("show running-config", commands)
+
+    def test_oneos_facts_gather_timing(self):
+        self.load_fixtures = self.load_empty_fixtures
+        self.get_command_timing.return_value = [
+            {"command": "show running-config", "seconds": 0.5}
+        ]
+        set_module_args(dict(gather_subset=["config"], gather_timing=True))
+        result = self.execute_module()
+        timing = result["ansible_facts"]["ansible_net_gather_timing"]
+        self.assertEqual(sorted(timing["subsets"]), ["config", "default"])
+        self.assertEqual(
+            timing["commands"][0]["command"], "show running-config"
+        )
+
+    def test_oneos_facts_acl_counters_not_default(self):
+        self.load_fixtures = self.load_empty_fixtures
+        set_module_args(dict())
+        result = self.execute_module()
+        commands = self.run_commands.call_args[1]["commands"]
+        self.assertNotIn("show ip access-list", commands)
+        self.assertNotIn("ansible_net_acl_counters", result["ansible_facts"])
+
+    def test_oneos_facts_acl_counters(self):
+        self.load_fixtures = self.load_empty_fixtures
+        set_module_args(dict(gather_subset=["acl_counters"]))
+        result = self.execute_module()
+        commands = self.run_commands.call_args[1]["commands"]
+        self.assertEqual(commands, ["show ip access-list"])
+        self.assertEqual(
+            result["ansible_facts"]["ansible_net_acl_counters"],
+            {"acls": [], "sequences": [], "matches": []},
+        )
+
+
+class TestOneosAclCountersFacts(TestOneOsModule):
+    def test_parse_acl_counters(self):
+        data = "\n".join(
+            [
+                "ip access-list extended BYPASS-LIST",
+                "  10 permit tcp 10.0.0.0 0.0.0.255 any eq 80 (12 matches)",
+                "  20 permit udp host 10.0.0.1 any range 1000 2000",
+                "  30 deny ip any any (1 match) ",
+                "ip access-list standard NAT_ACL",
+                "  permit 192.168.1.0 0.0.0.255 (3 matches)",
+                "ipv6 access-list V6-LIST",
+                "  permit ipv6 any any (7 matches)",
+            ]
+        )
+        counters = AclCounters(MagicMock()).parse_acl_counters(data)
+        self.assertEqual(
+            counters,
+            {
+                "acls": ["BYPASS-LIST"] * 3 + ["NAT_ACL", "V6-LIST"],
+                "sequences": [10, 20, 30, None, None],
+                "matches": [12, 0, 1, 3, 7],
+            },
+        )
+
+
+class TestOneosInterfacesFacts(TestOneOsModule):
+    fields = [
+        "description",
+        "macaddress",
+        "mtu",
+        "bandwidth",
+        "mediatype",
+        "duplex",
+        "speed",
+        "lineprotocol",
+        "operstatus",
+        "type",
+        "vrf",
+        "flags",
+    ]
+
+    def setUp(self):
+        self.interfaces = Interfaces(MagicMock(params={}))
+        self.data = load_fixture("command_show_interfaces", 6)
+
+    def test_parse_interface_block_parity(self):
+        blocks = self.interfaces.parse_interfaces(self.data)
+        self.assertEqual(len(blocks), 5)
+        for block in blocks.values():
+            expected = dict(
+                (field, getattr(self.interfaces, "parse_" + field)(block))
+                for field in self.fields
+            )
+            self.assertEqual(
+                self.interfaces.parse_interface_block(block), expected
+            )
+
+    def test_populate_interfaces(self):
+        self.interfaces.responses = [self.data]
+        self.interfaces.populate()
+        facts = self.interfaces.facts
+        intf = facts["interfaces"]["GigabitEthernet 1/0"]
+        self.assertEqual(intf["description"], "WAN uplink")
+        self.assertEqual(intf["mtu"], 1500)
+        self.assertEqual(intf["speed"], 100000)
+        self.assertEqual(intf["duplex"], "full-duplex")
+        self.assertEqual(intf["operstatus"], "up")
+        self.assertEqual(intf["vrf"], "WAN")
+        self.assertEqual(len(intf["ipv4"]), 2)
+        self.assertIn("2001:db8:1::1/64", facts["all_ipv6_addresses"])
+
+    def test_streaming_interfaces_parity(self):
+        streaming = StreamingInterfaces(MagicMock(params={}))
+        streaming.responses = [self.data]
+        streaming.populate()
+        self.interfaces.responses = [self.data]
+        self.interfaces.populate()
+        self.assertEqual(streaming.facts, self.interfaces.facts)
+
+    def test_iter_interfaces(self):
+        streaming = StreamingInterfaces(MagicMock(params={}))
+        streaming.facts["all_ipv4_addresses"] = list()
+        streaming.facts["all_ipv6_addresses"] = list()
+        interfaces = streaming.iter_interfaces(self.data)
+        name, intf = next(interfaces)
+        self.assertEqual(name, "GigabitEthernet 0/0")
+        self.assertEqual(
+            streaming.facts["all_ipv4_addresses"], ["192.168.1.174/24"]
+        )
+
+    def test_interfaces_filter_names(self):
+        module = MagicMock(params={"interfaces_filter": ["Loopback 1"]})
+        interfaces = StreamingInterfaces(module)
+        self.assertEqual(interfaces.COMMANDS, ["show interfaces Loopback 1"])
+
+    def test_interfaces_filter_abbreviated_names(self):
+        module = MagicMock(params={"interfaces_filter": ["gi 0/0"]})
+        interfaces = StreamingInterfaces(module)
+        self.assertEqual(interfaces.COMMANDS, ["show interfaces gi 0/0"])
+        interfaces.responses = [self.data]
+        interfaces.populate()
+        # the device output is not filtered again on the abbreviated name
+        self.assertIn("GigabitEthernet 0/0", interfaces.facts["interfaces"])
+
+    def test_interfaces_filter_patterns(self):
+        module = MagicMock(
+            params={"interfaces_filter": ["gigabitethernet 0/*", "Null 0"]}
+        )
+        interfaces = StreamingInterfaces(module)
+        self.assertEqual(interfaces.COMMANDS, ["show interfaces"])
+        interfaces.parse_interface_block = MagicMock(return_value={})
+        interfaces.responses = [self.data]
+        interfaces.populate()
+        self.assertEqual(
+            sorted(interfaces.facts["interfaces"]),
+            ["GigabitEthernet 0/0", "GigabitEthernet 0/1", "Null 0"],
+        )
+        # skipped interfaces are never parsed
+        self.assertEqual(interfaces.parse_interface_block.call_count, 3)
+        self.assertNotIn("10.0.0.2/30", interfaces.facts["all_ipv4_addresses"])
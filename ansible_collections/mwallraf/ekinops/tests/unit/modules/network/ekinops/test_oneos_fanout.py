@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import socket
+import time
+import unittest
+
+from ansible_collections.mwallraf.ekinops.plugins.plugin_utils.fanout import (
+    HAS_PARAMIKO,
+    FanoutError,
+    OneosSshSession,
+    fan_out,
+    run_host,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.compat.mock import (
+    MagicMock,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.ssh_server import (  # noqa:E501
+    FakeOneosSshServer,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.base import (  # noqa:E501
+    load_fixture,
+)
+
+
+@unittest.skipUnless(HAS_PARAMIKO, "paramiko is required")
+class TestOneosFanout(unittest.TestCase):
+    def setUp(self):
+        self.servers = [
+            FakeOneosSshServer(oneos_version=5).start(),
+            FakeOneosSshServer(oneos_version=6).start(),
+        ]
+
+    def tearDown(self):
+        for server in self.servers:
+            server.stop()
+
+    def run_fanout(self, commands, ports, **kwargs):
+        # every fake device listens on its own port on localhost
+        results = list()
+        for port in ports:
+            results.extend(
+                fan_out(
+                    ["127.0.0.1"],
+                    commands,
+                    port=port,
+                    username="admin",
+                    password="admin",
+                    timeout=10,
+                    host_key_checking=False,
+                    **kwargs
+                )
+            )
+        return results
+
+    def test_fan_out(self):
+        results = self.run_fanout(
+            ["show version", "show sntp"],
+            [server.port for server in self.servers],
+        )
+        self.assertEqual(len(results), 2)
+        for result, version in zip(results, (5, 6)):
+            self.assertFalse(result["failed"], result.get("msg"))
+            self.assertEqual(result["oneos_version"], version)
+            self.assertEqual(
+                result["stdout"][1],
+                load_fixture("command_show_sntp", version).strip(),
+            )
+        # the first show version detects the OneOS version
+        self.assertEqual(
+            self.servers[0].commands,
+            ["term len 0", "show version", "show version", "show sntp"],
+        )
+
+    def test_fan_out_concurrent_sessions(self):
+        results = list(
+            fan_out(
+                ["127.0.0.1"] * 10,
+                ["show system status"],
+                concurrency=5,
+                port=self.servers[1].port,
+                username="admin",
+                password="admin",
+                oneos_version="6",
+                host_key_checking=False,
+            )
+        )
+        self.assertEqual(len(results), 10)
+        self.assertFalse(any(result["failed"] for result in results))
+        self.assertEqual(results[0]["oneos_version"], 6)
+        self.assertNotIn("show version", self.servers[1].commands)
+
+    def test_fan_out_errors(self):
+        results = self.run_fanout(
+            ["show unknown"], [self.servers[1].port]
+        ) + self.run_fanout(["reboot"], [self.servers[1].port])
+        self.assertTrue(results[0]["failed"])
+        self.assertIn("Syntax error", results[0]["msg"])
+        self.assertTrue(results[1]["failed"])
+        self.assertIn("read-only", results[1]["msg"])
+        self.assertNotIn("reboot", self.servers[1].commands)
+
+    def test_fan_out_line_breaks(self):
+        for command in ("show version\rreload", "show version\nreload"):
+            results = self.run_fanout([command], [self.servers[1].port])
+            self.assertTrue(results[0]["failed"])
+            self.assertIn("read-only", results[0]["msg"])
+        self.assertNotIn("reload", self.servers[1].commands)
+
+    def test_fan_out_unreachable(self):
+        server = self.servers.pop()
+        server.stop()
+        results = self.run_fanout(["show version"], [server.port])
+        self.assertTrue(results[0]["failed"])
+
+
+class FakeShell(object):
+    """Returns the chunks one by one, a timeout when there are no more"""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.timeouts = []
+
+    def settimeout(self, timeout):
+        self.timeouts.append(timeout)
+
+    def recv(self, size):
+        if not self.chunks:
+            raise socket.timeout()
+        return self.chunks.pop(0)
+
+
+class TestOneosFanoutHost(unittest.TestCase):
+    def test_read_only_checked_before_connecting(self):
+        for commands, oneos_version in (
+            (["show version", "reload"], None),
+            (["show version\rreload"], None),
+            (["reboot"], "6"),
+        ):
+            session_class = MagicMock()
+            result = run_host(
+                "10.0.0.1",
+                commands,
+                session_class=session_class,
+                oneos_version=oneos_version,
+            )
+            self.assertTrue(result["failed"])
+            self.assertIn("read-only", result["msg"])
+            session_class.assert_not_called()
+
+    def test_aliases_checked_for_every_version(self):
+        session_class = MagicMock()
+        session_class.return_value.__enter__.return_value = MagicMock(
+            oneos_command_map=MagicMock(get=lambda command: None),
+            oneos_version="6",
+        )
+        result = run_host(
+            "10.0.0.1", ["alias-get-hostname"], session_class=session_class
+        )
+        self.assertFalse(result["failed"], result.get("msg"))
+
+    def test_receive_deadline(self):
+        session = OneosSshSession("10.0.0.1", timeout=10)
+        session._shell = FakeShell([b"show version\r\n", b"OneOS"])
+        session._deadline = time.time() + 10
+        with self.assertRaises(FanoutError):
+            session.receive()
+        # every read only waits for the time left of the session
+        self.assertEqual(len(session._shell.timeouts), 3)
+        self.assertTrue(all(t <= 10 for t in session._shell.timeouts))
+        self.assertEqual(
+            session._shell.timeouts, sorted(session._shell.timeouts)[::-1]
+        )
+
+        session._shell = FakeShell([b"data"])
+        session._deadline = time.time() - 1
+        with self.assertRaises(FanoutError):
+            session.receive()
+        self.assertEqual(session._shell.timeouts, [])
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Runs oneos_command with ansible-playbook and the network_cli connection
+against the fake SSH server
+
+The tests take several seconds per playbook run and are only run when
+ONEOS_NETWORK_CLI_TESTS is set:
+    ONEOS_NETWORK_CLI_TESTS=1 python -m pytest test_oneos_network_cli.py
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.ssh_server import (  # noqa:E501
+    HAS_PARAMIKO,
+    get_inventory,
+    start_fleet,
+    stop_fleet,
+)
+
+# the directory that contains ansible_collections
+COLLECTIONS_ROOT = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), *([os.pardir] * 8))
+)
+
+PLAYBOOK = """
+- hosts: oneos
+  gather_facts: false
+  tasks:
+    - mwallraf.ekinops.oneos_command:
+        commands: %s
+"""
+
+
+def run_oneos_command(servers, commands, **host_vars):
+    """Runs oneos_command on the servers, returns the task result per
+    hostname
+    """
+    tmpdir = tempfile.mkdtemp()
+    try:
+        inventory = get_inventory(servers)
+        inventory += "".join(
+            "%s=%s\n" % (key, value) for key, value in host_vars.items()
+        )
+        with open(os.path.join(tmpdir, "hosts.ini"), "w") as f:
+            f.write(inventory)
+        with open(os.path.join(tmpdir, "playbook.yml"), "w") as f:
+            f.write(PLAYBOOK % json.dumps(commands))
+
+        env = dict(os.environ)
+        env.update(
+            ANSIBLE_STDOUT_CALLBACK="json",
+            ANSIBLE_PERSISTENT_COMMAND_TIMEOUT="20",
+            PYTHONPATH=COLLECTIONS_ROOT,
+        )
+        proc = subprocess.run(
+            ["ansible-playbook", "-i", "hosts.ini", "playbook.yml"],
+            cwd=tmpdir,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=120,
+        )
+        output = json.loads(proc.stdout)
+        return output["plays"][0]["tasks"][0]["hosts"]
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+@unittest.skipUnless(
+    os.environ.get("ONEOS_NETWORK_CLI_TESTS"),
+    "slow, set ONEOS_NETWORK_CLI_TESTS=1 to run the ansible-playbook tests",
+)
+@unittest.skipUnless(HAS_PARAMIKO, "paramiko is required")
+@unittest.skipUnless(shutil.which("ansible-playbook"), "ansible is required")
+class TestOneosNetworkCli(unittest.TestCase):
+    commands = ["show version", "show system status", "show sntp"]
+
+    def setUp(self):
+        self.servers = list()
+
+    def tearDown(self):
+        stop_fleet(self.servers)
+
+    def start(self, **kwargs):
+        self.servers = start_fleet(2, oneos_versions=(5, 6), **kwargs)
+
+    def test_batch_commands_slow_device(self):
+        # the device answers after the connection stopped reading, the
+        # output of every command is received separately
+        self.start(latency=0.3)
+        sequential = run_oneos_command(self.servers, self.commands)
+        batched = run_oneos_command(
+            self.servers, self.commands, ansible_oneos_batch_commands=True
+        )
+        for server in self.servers:
+            result = batched[server.hostname]
+            self.assertFalse(result.get("failed"), result.get("msg"))
+            self.assertEqual(
+                result["stdout"], sequential[server.hostname]["stdout"]
+            )
+            self.assertEqual(len(result["stdout"]), 3)
+
+    def test_batch_commands_without_echo(self):
+        self.start(echo=False)
+        results = run_oneos_command(
+            self.servers, self.commands, ansible_oneos_batch_commands=True
+        )
+        for server in self.servers:
+            result = results[server.hostname]
+            self.assertTrue(result.get("failed"))
+            self.assertIn("batch_commands", result["msg"])
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import unittest
+
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.rm_base.network_template import (  # noqa:E501
+    NetworkTemplate,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.facts.acls.acls import (  # noqa:E501
+    AclsFacts,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.rm_templates.acl_interfaces import (  # noqa:E501
+    Acl_interfacesTemplate,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.rm_templates.acls import (  # noqa:E501
+    AclsTemplate,
+    render_access_list_entries,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.rm_templates.hostname import (  # noqa:E501
+    HostnameTemplate,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.config_index import (  # noqa:E501
+    ConfigIndex,
+    get_config_index,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.base import (  # noqa:E501
+    load_fixture,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.helpers import (  # noqa:E501
+    legacy_tmplt_access_list_entries,
+    synthetic_aces,
+)
+
+SHOW_ACCESS_LIST = """\
+ip access-list extended BYPASS-LIST
+  10 permit tcp 10.0.0.0 0.0.0.255 any eq 80 (12 matches)
+  20 permit udp host 10.0.0.1 any range 1000 2000
+  30 deny ip any any (3 matches)
+ip access-list standard NAT_ACL
+  permit 192.168.1.0 0.0.0.255
+interface gigabitethernet 0/0
+ipv6 access-list V6-LIST
+  permit ipv6 any any
+ip-remark access-list extended BYPASS-LIST
+ remark bypass web traffic
+ip-remark access-list standard NAT_ACL
+ remark customer lan
+"""
+
+
+class TestOneosConfigIndex(unittest.TestCase):
+    def test_blocks(self):
+        index = ConfigIndex(load_fixture("command_show_running-config", 5))
+        blocks = index.get_blocks("interface dot11radio")
+        self.assertEqual(
+            blocks,
+            [
+                [
+                    "interface dot11radio 0/0.1",
+                    " ssid test4",
+                    "  wps enable",
+                    "  wps method pbc",
+                    " shutdown",
+                ],
+                ["interface dot11radio 0/0", " dot11 qos wmm"],
+            ],
+        )
+        self.assertEqual(index.get_lines("hostname"), ["hostname home-lbb320"])
+        self.assertEqual(index.get_blocks("unknown"), [])
+
+    def test_blocks_case_insensitive_in_config_order(self):
+        index = ConfigIndex(["IP access list A", "ip route x", "ip access B"])
+        self.assertEqual(
+            index.get_lines("ip route", "ip access"),
+            ["IP access list A", "ip route x", "ip access B"],
+        )
+
+    def test_index_reused(self):
+        config = load_fixture("command_show_running-config", 6)
+        index = get_config_index(config.splitlines())
+        self.assertIs(get_config_index(config.splitlines()), index)
+
+
+class TestOneosTemplateParity(unittest.TestCase):
+    """The section based parse returns the same as NetworkTemplate"""
+
+    def assertParity(self, template_class, data):
+        template = template_class(lines=data.splitlines())
+        expected = NetworkTemplate.parse(template)
+        self.assertTrue(expected)
+        self.assertEqual(template.parse(), expected)
+
+    def test_hostname(self):
+        for oneos_version in (5, 6):
+            self.assertParity(
+                HostnameTemplate,
+                load_fixture("command_show_running-config", oneos_version),
+            )
+
+    def test_acl_interfaces(self):
+        for oneos_version in (5, 6):
+            self.assertParity(
+                Acl_interfacesTemplate,
+                load_fixture("command_show_running-config", oneos_version),
+            )
+
+    def test_acls(self):
+        data = AclsFacts(None).sanitize_data(SHOW_ACCESS_LIST)
+        self.assertParity(AclsTemplate, data)
+
+
+class TestOneosAceRenderer(unittest.TestCase):
+    def test_parity(self):
+        aces = synthetic_aces()
+        self.assertEqual(
+            render_access_list_entries(aces),
+            [legacy_tmplt_access_list_entries(ace) for ace in aces],
+        )
+
+    def test_parity_template(self):
+        template = AclsTemplate()
+        for ace in synthetic_aces()[::37]:
+            for negate in (False, True):
+                self.assertEqual(
+                    template.render(ace, "aces", negate),
+                    render_access_list_entries([ace], negate)[0],
+                )
+
+    def test_port_operator(self):
+        # the legacy renderer raised an IndexError for eq ports
+        ace = {
+            "grant": "permit",
+            "protocol_options": {"protocol": "tcp"},
+            "source": {"any": True},
+            "destination": {"host": "10.0.0.1", "port_protocol": {"eq": "80"}},
+            "log": True,
+        }
+        self.assertEqual(
+            render_access_list_entries([ace]),
+            [" permit tcp 0.0.0.0 255.255.255.255 10.0.0.1 0.0.0.0 eq 80 log"],
+        )
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import time
+import unittest
+
+from ansible.module_utils._text import to_bytes, to_text
+from ansible_collections.mwallraf.ekinops.plugins.terminal.oneos import (
+    TerminalModule,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.ssh_server import (  # noqa:E501
+    HAS_PARAMIKO,
+    MORE_PROMPT,
+    FakeOneosSshServer,
+    get_inventory,
+    start_fleet,
+    stop_fleet,
+)
+
+if HAS_PARAMIKO:
+    import paramiko
+
+
+class FakeOneosShell:
+    """Interactive shell on a fake device"""
+
+    def __init__(self, server):
+        self.client = paramiko.SSHClient()
+        self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        self.client.connect(
+            "127.0.0.1",
+            port=server.port,
+            username="admin",
+            password="admin",
+            look_for_keys=False,
+            allow_agent=False,
+            timeout=10,
+        )
+        self.channel = self.client.invoke_shell()
+        self.channel.settimeout(10)
+
+    def read_until(self, *endings):
+        data = b""
+        while not data.endswith(tuple(to_bytes(e) for e in endings)):
+            data += self.channel.recv(4096)
+        return to_text(data)
+
+    def send(self, command, *endings):
+        self.channel.send(to_bytes(command + "\r"))
+        return self.read_until(*endings)
+
+    def close(self):
+        self.client.close()
+
+
+@unittest.skipUnless(HAS_PARAMIKO, "paramiko is required")
+class TestFakeOneosSshServer(unittest.TestCase):
+    def setUp(self):
+        self.servers = list()
+        self.shells = list()
+
+    def tearDown(self):
+        for shell in self.shells:
+            shell.close()
+        stop_fleet(self.servers)
+
+    def open_shell(self, **kwargs):
+        server = FakeOneosSshServer(**kwargs).start()
+        self.servers.append(server)
+        shell = FakeOneosShell(server)
+        self.shells.append(shell)
+        return server, shell
+
+    def test_setup_commands(self):
+        for version, accepted, rejected in (
+            (5, "stty columns 255", "screen-width 512"),
+            (6, "screen-width 512", "stty columns 255"),
+        ):
+            server, shell = self.open_shell(oneos_version=version)
+            shell.read_until("#")
+            self.assertNotIn("error", shell.send(accepted, "#"))
+            self.assertIn("Syntax error", shell.send(rejected, "#"))
+
+    def test_device_info_outputs(self):
+        first = FakeOneosSshServer(hostname="cpe1")
+        second = FakeOneosSshServer(hostname="cpe2")
+        self.assertEqual(first.output("hostname"), "cpe1")
+        self.assertIn(
+            first.serial_number, first.output("show product-info-area")
+        )
+        self.assertNotEqual(first.serial_number, second.serial_number)
+
+    def test_user_prompt_and_banner(self):
+        server, shell = self.open_shell(
+            hostname="cpe1", prompt_style="user", banner="motd"
+        )
+        self.assertIn("Authorized access only", shell.read_until("cpe1>"))
+        self.assertTrue(shell.send("enable", "#").endswith("cpe1#"))
+
+    def test_version_banner_matches_terminal(self):
+        for version in (5, 6):
+            server, shell = self.open_shell(
+                oneos_version=version, banner="version"
+            )
+            banner = to_bytes(shell.read_until("#"))
+            matches = [
+                found
+                for found, regex in TerminalModule.terminal_version_re.items()
+                if regex.search(banner)
+            ]
+            self.assertEqual(matches, [version])
+
+    def test_paging(self):
+        server, shell = self.open_shell(paging=True, page_length=10)
+        shell.read_until("#")
+        output = shell.send("show running-config", MORE_PROMPT)
+        self.assertEqual(output.count("\r\n"), 11)
+        shell.channel.send(b" ")
+        shell.read_until(MORE_PROMPT)
+        shell.channel.send(b"q")
+        shell.read_until("#")
+
+        shell.send("term len 0", "#")
+        output = shell.send("show running-config", "#")
+        self.assertNotIn(MORE_PROMPT, output)
+
+    def test_latency_and_chunks(self):
+        server, shell = self.open_shell(latency=0.2, chunk_size=64)
+        shell.read_until("#")
+        start = time.time()
+        output = shell.send("show version", "#")
+        self.assertGreaterEqual(time.time() - start, 0.2)
+        self.assertIn(server.output("show version").splitlines()[-1], output)
+        self.assertEqual(server.commands, ["show version"])
+
+    def test_prompt_styles_match_terminal(self):
+        for style in ("enable", "user", "trailing-space"):
+            server, shell = self.open_shell(banner="motd", prompt_style=style)
+            data = to_bytes(shell.read_until("#", ">", "# "))
+            self.assertTrue(
+                any(r.search(data) for r in TerminalModule.terminal_stdout_re),
+                style,
+            )
+
+    def test_fleet(self):
+        self.servers = start_fleet(20, oneos_versions=(5, 6))
+        self.assertEqual(len(set(s.port for s in self.servers)), 20)
+        self.assertEqual(
+            [s.oneos_version for s in self.servers[:3]], [5, 6, 5]
+        )
+        inventory = get_inventory(self.servers)
+        self.assertIn(
+            "fake-oneos-002 ansible_host=127.0.0.1 ansible_port=%s"
+            " ansible_oneos_version=6" % self.servers[1].port,
+            inventory,
+        )
+        shell = FakeOneosShell(self.servers[-1])
+        self.shells.append(shell)
+        self.assertTrue(shell.read_until("#").endswith("fake-oneos-020#"))
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2022 - 2NMS bv
+# GNU General Public License v3.0
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import re
+import unittest
+
+from ansible.errors import AnsibleConnectionFailure
+from ansible.module_utils._text import to_bytes, to_text
+from ansible_collections.mwallraf.ekinops.plugins.cliconf.oneos import (
+    Cliconf,
+)
+from ansible_collections.mwallraf.ekinops.plugins.module_utils.network.oneos.utils.utils import (  # noqa:E501
+    count_prompts,
+    is_terminal_error,
+)
+from ansible_collections.mwallraf.ekinops.plugins.terminal.oneos import (
+    TailRegex,
+    TerminalModule,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.compat.mock import (
+    MagicMock,
+)
+from ansible_collections.mwallraf.ekinops.tests.unit.modules.network.ekinops.ssh_server import (  # noqa:E501
+    SETUP_COMMANDS,
+)
+
+
+class FakeConnection:
+    """network_cli connection to a device of a OneOS version, the setup
+    commands of the other version are rejected
+    """
+
+    def __init__(self, oneos_version, banner=b"", cliconf_version=None):
+        self.oneos_version = oneos_version
+        self.commands = list()
+        self.writes = 0
+        self._last_response = banner
+        self.cliconf = MagicMock()
+        self.cliconf.get_known_oneos_version.return_value = cliconf_version
+        self.cliconf.batch_commands = False
+        real = Cliconf.__new__(Cliconf)
+        self.cliconf.split_batch_output = real.split_batch_output
+
+    def get_prompt(self):
+        return b"lab-lbb150#"
+
+    def output(self, command):
+        if command in SETUP_COMMANDS[self.oneos_version]:
+            return ""
+        return "Syntax error: Illegal command line"
+
+    def exec_command(self, command):
+        self.writes += 1
+        self.commands.append(to_text(command))
+        output = self.output(to_text(command))
+        if output:
+            raise AnsibleConnectionFailure(output)
+        return output
+
+    def send(self, command, strip_prompt=True):
+        self.writes += 1
+        commands = to_text(command).split("\r")
+        self.commands.extend(commands)
+        lines = [commands[0]]
+        for idx, cmd in enumerate(commands):
+            lines.append(self.output(cmd))
+            if idx + 1 < len(commands):
+                lines.append("lab-lbb150#" + commands[idx + 1])
+        lines.append("lab-lbb150#")
+        return to_bytes("\n".join(lines))
+
+    def receive(self, strip_prompt=True):
+        return b"lab-lbb150#"
+
+
+def open_shell(connection, terminal=None):
+    connection.commands = list()
+    connection.writes = 0
+    terminal = terminal or TerminalModule(connection)
+    terminal._connection = connection
+    terminal.on_open_shell()
+    return terminal
+
+
+class TestOneosTerminal(unittest.TestCase):
+    def test_version_from_cliconf(self):
+        for version in (5, 6):
+            connection = FakeConnection(version, cliconf_version=version)
+            open_shell(connection)
+            self.assertEqual(
+                connection.commands, list(SETUP_COMMANDS[version])
+            )
+
+    def test_version_from_banner(self):
+        banners = {
+            5: b"Software version : ONEOS92-DUAL_FT-V5.2R2E7_HA8\r\n#",
+            6: b"Software version : OneOS-pCPE-ARM_pi1-6.2.2\r\n#",
+        }
+        for version, banner in banners.items():
+            connection = FakeConnection(version, banner=banner)
+            open_shell(connection)
+            self.assertEqual(
+                connection.commands, list(SETUP_COMMANDS[version])
+            )
+
+    def test_probe_is_remembered(self):
+        connection = FakeConnection(5, banner=b"Welcome to OneOS\r\n#")
+        terminal = open_shell(connection)
+        self.assertEqual(
+            connection.commands,
+            ["term len 0", "screen-width 512", "stty columns 255"],
+        )
+        self.assertEqual(terminal.get_oneos_version(), 5)
+        open_shell(connection, terminal)
+        self.assertEqual(connection.commands, list(SETUP_COMMANDS[5]))
+
+    def test_wrong_version_falls_back_to_probe(self):
+        connection = FakeConnection(5, cliconf_version=6)
+        terminal = open_shell(connection)
+        self.assertEqual(
+            connection.commands,
+            ["term len 0", "screen-width 512", "screen-width 512"]
+            + ["stty columns 255"],
+        )
+        self.assertEqual(terminal._oneos_version, 5)
+
+    def test_batch_setup(self):
+        for version in (5, 6):
+            connection = FakeConnection(version, cliconf_version=version)
+            connection.cliconf.batch_commands = True
+            open_shell(connection)
+            self.assertEqual(connection.writes, 1)
+            self.assertEqual(
+                connection.commands, list(SETUP_COMMANDS[version])
+            )
+
+    def test_batch_setup_failure_retries(self):
+        connection = FakeConnection(5, cliconf_version=6)
+        connection.cliconf.batch_commands = True
+        open_shell(connection)
+        self.assertEqual(connection.commands[-1], "stty columns 255")
+
+    def test_unknown_cliconf_version(self):
+        connection = FakeConnection(6, cliconf_version="unknown")
+        open_shell(connection)
+        self.assertEqual(
+            connection.commands[:2], ["term len 0", "screen-width 512"]
+        )
+
+    def test_helpers(self):
+        output = "show version\nlab-lbb150#show sntp\nlab-lbb150#"
+        self.assertEqual(count_prompts(output, b"lab-lbb150#"), 2)
+        self.assertEqual(count_prompts(output, b""), 0)
+        regexes = TerminalModule.terminal_stderr_re
+        self.assertTrue(is_terminal_error("% Syntax error: x", regexes))
+        self.assertFalse(is_terminal_error("hostname lab", regexes))
+
+    def test_term_len_failure(self):
+        connection = FakeConnection(6)
+        connection.output = lambda command: "Syntax error"
+        with self.assertRaises(AnsibleConnectionFailure):
+            open_shell(connection)
+
+
+class TestOneosTerminalRegex(unittest.TestCase):
+    def setUp(self):
+        self.output = b"".join(
+            b"interface gigabitethernet 0/%d\r\n description port %d\r\n"
+            % (idx, idx)
+            for idx in range(2000)
+        )
+
+    def search(self, regexes, data):
+        for regex in regexes:
+            match = regex.search(data)
+            if match:
+                return match.group()
+        return None
+
+    def test_prompt_matches_like_full_search(self):
+        full = [
+            re.compile(regex.pattern)
+            for regex in TerminalModule.terminal_stdout_re
+        ]
+        for prompt in (
+            b"lab-lbb150#",
+            b"\r\nlab-lbb150#",
+            b"lab-lbb150(config-if)# ",
+            b"lab-lbb150>\n",
+            b"",
+            b" description x",
+        ):
+            for data in (prompt, self.output + prompt):
+                self.assertEqual(
+                    self.search(TerminalModule.terminal_stdout_re, data),
+                    self.search(full, data),
+                    data[-40:],
+                )
+
+    def test_errors_in_response(self):
+        errors = TerminalModule.terminal_stderr_re
+        self.assertIsNone(self.search(errors, self.output + b"lab#"))
+        self.assertTrue(
+            self.search(
+                errors, self.output + b"% Syntax error: Illegal\r\nlab#"
+            )
+        )
+        line = b"% Error: Invalid command " + b"x" * 1000 + b"\r\n"
+        self.assertTrue(self.search(errors, self.output + line))
+        # an error followed by more than 1 KB of output in the same chunk
+        self.assertTrue(
+            self.search(errors, b"Syntax error:\r\n" + self.output)
+        )
+        self.assertTrue(
+            self.search(
+                errors,
+                self.output
+                + b"% Error: Invalid command\r\n"
+                + b"x" * 2048
+                + b"\r\nlab#",
+            )
+        )
+
+    def test_tail_regex(self):
+        regex = TailRegex(rb"#$")
+        self.assertEqual(regex.pattern, b"#$")
+        self.assertTrue(regex.search(b"host#\n"))
+        self.assertIsNone(regex.search(b"host#\nx"))
+        self.assertIsNone(regex.search(b""))
+        # only the last line within the window is searched
+        self.assertIsNone(TailRegex(rb"host#$", window=3).search(b"host#"))
+        self.assertTrue(TailRegex(rb"host#$", window=8).search(b"host#"))
+        self.assertIsNone(TailRegex(rb"x\n").search(b"x\nhost#"))